@@ -0,0 +1,35 @@
+"""derivation_index_sequence
+
+Revision ID: a1c6e8f0b274
+Revises: f4a8d2b6c150
+Create Date: 2026-10-19 19:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c6e8f0b274'
+down_revision: Union[str, Sequence[str], None] = 'f4a8d2b6c150'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SEQUENCE users_derivation_index_seq START WITH 1 OWNED BY users.derivation_index")
+    # Continue after the highest index handed out by the old max()+1 allocation
+    op.execute("""
+        SELECT setval('users_derivation_index_seq', COALESCE((SELECT MAX(derivation_index) FROM users), 0) + 1, false)
+    """)
+    op.alter_column('users', 'derivation_index', existing_type=sa.Integer(),
+                    server_default=sa.text("nextval('users_derivation_index_seq')"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('users', 'derivation_index', existing_type=sa.Integer(), server_default=None)
+    op.execute("DROP SEQUENCE users_derivation_index_seq")
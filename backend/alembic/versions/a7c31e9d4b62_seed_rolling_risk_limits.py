@@ -0,0 +1,52 @@
+"""seed_rolling_risk_limits
+
+Revision ID: a7c31e9d4b62
+Revises: f54dc1511595
+Create Date: 2026-10-19 11:40:00.000000
+
+"""
+from typing import Sequence, Union
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c31e9d4b62'
+down_revision: Union[str, Sequence[str], None] = 'f54dc1511595'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (asset, per hour, per day). Asset None = any asset without its own row.
+SEED_ROLLING_LIMITS = [
+    ("ETH", 10.0, 25.0),
+    ("BNB", 40.0, 100.0),
+    ("BTC", 1.0, 2.5),
+    ("USDT", 10000.0, 25000.0),
+    ("USDC", 10000.0, 25000.0),
+    ("TST", 2000.0, 5000.0),
+    (None, 200.0, 500.0),
+]
+
+risk_limits = sa.table('risk_limits',
+    sa.column('id', sa.UUID()),
+    sa.column('kind', sa.String()),
+    sa.column('asset', sa.String()),
+    sa.column('max_amount', sa.Float()),
+    sa.column('is_active', sa.Boolean()),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    rows = []
+    for asset, hourly, daily in SEED_ROLLING_LIMITS:
+        rows.append({"id": uuid.uuid4(), "kind": "HOURLY_MAX", "asset": asset, "max_amount": hourly, "is_active": True})
+        rows.append({"id": uuid.uuid4(), "kind": "DAILY_MAX", "asset": asset, "max_amount": daily, "is_active": True})
+    op.bulk_insert(risk_limits, rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(risk_limits.delete().where(risk_limits.c.kind.in_(["HOURLY_MAX", "DAILY_MAX"])))
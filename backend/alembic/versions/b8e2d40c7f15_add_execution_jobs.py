@@ -0,0 +1,51 @@
+"""add_execution_jobs
+
+Revision ID: b8e2d40c7f15
+Revises: a7c31e9d4b62
+Create Date: 2026-10-19 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2d40c7f15'
+down_revision: Union[str, Sequence[str], None] = 'a7c31e9d4b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('execution_jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('intent', sa.String(), nullable=False),
+    sa.Column('callback_url', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('next_run_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('locked_by', sa.String(), nullable=True),
+    sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('hearing_id', sa.UUID(), nullable=True),
+    sa.Column('final_verdict', sa.String(), nullable=True),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_execution_jobs_id'), 'execution_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_execution_jobs_user_id'), 'execution_jobs', ['user_id'], unique=False)
+    op.create_index('ix_execution_jobs_status_next_run_at', 'execution_jobs', ['status', 'next_run_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_execution_jobs_status_next_run_at', table_name='execution_jobs')
+    op.drop_index(op.f('ix_execution_jobs_user_id'), table_name='execution_jobs')
+    op.drop_index(op.f('ix_execution_jobs_id'), table_name='execution_jobs')
+    op.drop_table('execution_jobs')
@@ -0,0 +1,34 @@
+"""withdrawal_status
+
+Revision ID: c6f2a8d4e019
+Revises: a1c6e8f0b274
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f2a8d4e019'
+down_revision: Union[str, Sequence[str], None] = 'a1c6e8f0b274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows are all settled
+    op.add_column('transactions', sa.Column('status', sa.String(), server_default='CONFIRMED', nullable=False))
+    # A withdrawal is debited (PENDING) before its payout has a hash
+    op.alter_column('transactions', 'tx_hash', existing_type=sa.String(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # FAILED rows never moved funds and have no hash
+    op.execute("DELETE FROM transactions WHERE status = 'FAILED'")
+    op.alter_column('transactions', 'tx_hash', existing_type=sa.String(), nullable=False)
+    op.drop_column('transactions', 'status')
@@ -0,0 +1,81 @@
+"""split_hearing_transcript
+
+Revision ID: d9f1a3c5e727
+Revises: c3a5f7e91b08
+Create Date: 2026-10-19 17:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f1a3c5e727'
+down_revision: Union[str, Sequence[str], None] = 'c3a5f7e91b08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STAGES = ('perception', 'memory', 'risk', 'strategy', 'execution')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for stage in STAGES:
+        op.add_column('hearing_records', sa.Column(stage, postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('hearing_records', sa.Column('action_type', sa.String(), nullable=True))
+    op.add_column('hearing_records', sa.Column('tx_hash', sa.String(), nullable=True))
+    op.add_column('hearing_records', sa.Column('highlight', sa.String(), nullable=True))
+    op.alter_column('hearing_records', 'transcript', existing_type=postgresql.JSONB(astext_type=sa.Text()), nullable=True)
+
+    # Move hearing transcripts into the stage columns; log-style rows ({"note": ...}) keep theirs
+    op.execute("""
+        UPDATE hearing_records SET
+            perception = NULLIF(transcript->'perception', 'null'::jsonb),
+            memory = NULLIF(transcript->'memory', 'null'::jsonb),
+            risk = NULLIF(transcript->'risk', 'null'::jsonb),
+            strategy = NULLIF(transcript->'strategy', 'null'::jsonb),
+            execution = NULLIF(transcript->'execution', 'null'::jsonb),
+            action_type = CASE
+                WHEN (transcript->'strategy'->>'selected_option_index')::int >= 0
+                THEN transcript->'strategy'->'feasible_options'->((transcript->'strategy'->>'selected_option_index')::int)->>'action_type'
+            END,
+            tx_hash = transcript->'execution'->>'tx_hash',
+            highlight = COALESCE(
+                (SELECT step FROM jsonb_array_elements_text(transcript->'strategy'->'feasible_options'->0->'steps') AS step
+                 WHERE step LIKE '%Spread:%' LIMIT 1),
+                (SELECT step FROM jsonb_array_elements_text(transcript->'strategy'->'feasible_options'->0->'steps') AS step
+                 WHERE step LIKE '%Profit%' LIMIT 1),
+                CASE WHEN transcript->'execution'->>'tx_hash' LIKE '%Arb Profit%' THEN transcript->'execution'->>'tx_hash' END
+            ),
+            transcript = NULL
+        WHERE transcript ? 'intent'
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        UPDATE hearing_records SET transcript = jsonb_build_object(
+            'id', id::text,
+            'started_at', started_at,
+            'user_id', user_id::text,
+            'intent', intent,
+            'perception', perception,
+            'memory', memory,
+            'risk', risk,
+            'strategy', strategy,
+            'execution', execution,
+            'final_verdict', final_verdict,
+            'final_reason', COALESCE(final_reason, '')
+        )
+        WHERE transcript IS NULL
+    """)
+    op.alter_column('hearing_records', 'transcript', existing_type=postgresql.JSONB(astext_type=sa.Text()), nullable=False)
+    op.drop_column('hearing_records', 'highlight')
+    op.drop_column('hearing_records', 'tx_hash')
+    op.drop_column('hearing_records', 'action_type')
+    for stage in reversed(STAGES):
+        op.drop_column('hearing_records', stage)
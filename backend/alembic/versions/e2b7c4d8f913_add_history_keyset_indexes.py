@@ -0,0 +1,32 @@
+"""add_history_keyset_indexes
+
+Revision ID: e2b7c4d8f913
+Revises: d9f1a3c5e727
+Create Date: 2026-10-19 18:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7c4d8f913'
+down_revision: Union[str, Sequence[str], None] = 'd9f1a3c5e727'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_hearing_records_started_at_id', 'hearing_records', ['started_at', 'id'], unique=False)
+    op.create_index('ix_hearing_records_user_id_started_at_id', 'hearing_records', ['user_id', 'started_at', 'id'], unique=False)
+    op.create_index('ix_transactions_user_id_created_at_id', 'transactions', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_user_id_created_at_id', table_name='transactions')
+    op.drop_index('ix_hearing_records_user_id_started_at_id', table_name='hearing_records')
+    op.drop_index('ix_hearing_records_started_at_id', table_name='hearing_records')
@@ -0,0 +1,45 @@
+"""add_balances
+
+Revision ID: f4a8d2b6c150
+Revises: e2b7c4d8f913
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a8d2b6c150'
+down_revision: Union[str, Sequence[str], None] = 'e2b7c4d8f913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('balances',
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('chain', sa.String(), nullable=False),
+    sa.Column('symbol', sa.String(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'chain', 'symbol')
+    )
+    # Seed from the existing ledger
+    op.execute("""
+        INSERT INTO balances (user_id, chain, symbol, amount)
+        SELECT user_id, chain, symbol,
+               SUM(CASE WHEN type = 'DEPOSIT' THEN amount ELSE -amount END)
+        FROM transactions
+        GROUP BY user_id, chain, symbol
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('balances')
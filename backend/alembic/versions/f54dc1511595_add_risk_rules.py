@@ -0,0 +1,83 @@
+"""add_risk_rules
+
+Revision ID: f54dc1511595
+Revises: 3de1b7cc279f
+Create Date: 2026-10-19 09:12:00.000000
+
+"""
+from typing import Sequence, Union
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f54dc1511595'
+down_revision: Union[str, Sequence[str], None] = '3de1b7cc279f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Seed values mirror the previously hard-coded RiskEntity constants
+SEED_LIMITS = [
+    ("GLOBAL_MAX", None, 1000000.0),
+    ("DEFAULT_ASSET_MAX", None, 100.0),
+    ("ASSET_MAX", "ETH", 5.0),
+    ("ASSET_MAX", "BNB", 20.0),
+    ("ASSET_MAX", "BTC", 0.5),
+    ("ASSET_MAX", "USDT", 5000.0),
+    ("ASSET_MAX", "USDC", 5000.0),
+    ("ASSET_MAX", "TST", 1000.0),
+]
+SEED_ALLOWLIST = [
+    ("0x571e52efc50055d760ceae2446ae3b469a806279", "Citadel Admin"),
+    ("0x70997970c51812dc3a010c7d01b50e0d17dc79c8", "Alice (Hardhat #1)"),
+    ("0x3c44cdddb6a900fa2b585dd299e03d12fa4293bc", "Bob (Hardhat #2)"),
+    ("0xf5c649356608f8713c3c2c7d887ad3ad2580e8ce", "External Wallet (Netflix/Corporate)"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    risk_limits = op.create_table('risk_limits',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('asset', sa.String(), nullable=True),
+    sa.Column('max_amount', sa.Float(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_risk_limits_id'), 'risk_limits', ['id'], unique=False)
+    op.create_index(op.f('ix_risk_limits_asset'), 'risk_limits', ['asset'], unique=False)
+
+    allowlist_entries = op.create_table('allowlist_entries',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('address', sa.String(), nullable=False),
+    sa.Column('label', sa.String(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_allowlist_entries_id'), 'allowlist_entries', ['id'], unique=False)
+    op.create_index(op.f('ix_allowlist_entries_user_id'), 'allowlist_entries', ['user_id'], unique=False)
+
+    op.bulk_insert(risk_limits, [
+        {"id": uuid.uuid4(), "kind": kind, "asset": asset, "max_amount": amount, "is_active": True}
+        for kind, asset, amount in SEED_LIMITS
+    ])
+    op.bulk_insert(allowlist_entries, [
+        {"id": uuid.uuid4(), "user_id": None, "address": address, "label": label}
+        for address, label in SEED_ALLOWLIST
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_allowlist_entries_user_id'), table_name='allowlist_entries')
+    op.drop_index(op.f('ix_allowlist_entries_id'), table_name='allowlist_entries')
+    op.drop_table('allowlist_entries')
+    op.drop_index(op.f('ix_risk_limits_asset'), table_name='risk_limits')
+    op.drop_index(op.f('ix_risk_limits_id'), table_name='risk_limits')
+    op.drop_table('risk_limits')
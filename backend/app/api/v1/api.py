@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import users, wallets, transactions, agreements, hearing, agent, market, protocol
+from app.api.v1.endpoints import users, wallets, transactions, agreements, hearing, agent, market, protocol, risk
 
 api_router = APIRouter()
 api_router.include_router(users.router, prefix="/users", tags=["users"])
@@ -10,5 +10,6 @@ api_router.include_router(hearing.router, prefix="/hearing", tags=["hearing"])
 api_router.include_router(agent.router, prefix="/agent", tags=["agent"])
 api_router.include_router(market.router, prefix="/market", tags=["market"])
 api_router.include_router(protocol.router, prefix="/protocol", tags=["protocol"])
+api_router.include_router(risk.router, prefix="/risk", tags=["risk"])
 
 
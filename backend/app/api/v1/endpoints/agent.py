@@ -3,6 +3,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc, func
 from app.db.session import get_db
 from app.models.hearing import HearingRecordModel
+from app.services.hearing_store import HEARING_SUMMARY_COLUMNS
+from app.services.strategy_cache import strategy_cache
+from app.services.user_cache import user_cache
+from app.services.llm_service import llm_service
+from app.services.cex_service import cex_service
+from app.services.market_data_service import market_data
+from app.services.balance_cache import balance_cache
+from app.services.market_stream import market_stream
 from datetime import datetime, timedelta
 
 router = APIRouter()
@@ -15,12 +23,12 @@ async def get_agent_summary(db: AsyncSession = Depends(get_db)):
     """
     # 1. Fetch last Autopilot action
     result = await db.execute(
-        select(HearingRecordModel)
+        select(HearingRecordModel.started_at)
         .filter(HearingRecordModel.intent.like("AUTOPILOT%"))
         .order_by(desc(HearingRecordModel.started_at))
         .limit(1)
     )
-    last_auto = result.scalars().first()
+    last_auto = result.first()
     
     # Get DB Time (Source of Truth)
     time_res = await db.execute(select(func.now()))
@@ -56,12 +64,12 @@ async def get_agent_summary(db: AsyncSession = Depends(get_db)):
             
     # 3. Fetch recent general actions (Top 5), excluding all Autopilot noise to show User Activity
     recent_res = await db.execute(
-        select(HearingRecordModel)
+        select(*HEARING_SUMMARY_COLUMNS)
         .filter(HearingRecordModel.intent.notlike("AUTOPILOT%"))
         .order_by(desc(HearingRecordModel.started_at))
         .limit(5)
     )
-    recent_records = recent_res.scalars().all()
+    recent_records = recent_res.all()
     
     actions = []
     for r in recent_records:
@@ -70,7 +78,9 @@ async def get_agent_summary(db: AsyncSession = Depends(get_db)):
             "intent": r.intent,
             "verdict": r.final_verdict,
             "reason": r.final_reason,
-            "transcript": r.transcript,
+            "action_type": r.action_type,
+            "tx_hash": r.tx_hash,
+            "highlight": r.highlight,
             "time": r.started_at
         })
 
@@ -79,3 +89,36 @@ async def get_agent_summary(db: AsyncSession = Depends(get_db)):
         "last_active": last_active,
         "recent_actions": actions
     }
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """
+    Hit rates of the in-process caches used by the hearing pipeline,
+    plus how many upstream calls were coalesced into an identical in-flight one.
+    """
+    cex = cex_service.stats()
+    pools = market_data.stats()
+    return {
+        "strategy": strategy_cache.stats(),
+        "user_profiles": user_cache.stats(),
+        "balances": balance_cache.stats(),
+        "prices": cex["prices"],
+        "book_tops": market_stream.stats(),
+        "binance_weight": cex["binance_weight"],
+        "binance_clock": cex["binance_clock"],
+        "coin_config": cex["coin_config"],
+        "pool_index": {"groups": pools["pool_groups"], "age_seconds": pools["age_seconds"]},
+        "coalesced": {
+            "debate": llm_service.debates.stats(),
+            "ticker": cex["ticker"],
+            "pools": pools["refresh"],
+            "rpc_balance": balance_cache.reads.stats()
+        }
+    }
+
+@router.get("/llm-health")
+async def get_llm_health():
+    """
+    Circuit breaker state, recent error rate and p95 latency per LLM provider.
+    """
+    return llm_service.health()
@@ -69,11 +69,11 @@ async def create_p2p_agreement(
 
     # 3. CHECK TST ACCESS (The Gate)
     REQUIRED_TST = 100
-    has_access = access_control.check_access(user_address, REQUIRED_TST)
+    has_access = await access_control.check_access(user_address, REQUIRED_TST)
 
     if not has_access:
         # Get current balance just for the error message
-        current = wallet_service.get_token_balance(user_address, "0x4B3ff00Bd27a9d75204CceB619d5B1D393dbaE71", "bsc")
+        current = await wallet_service.get_token_balance_cached(user_address, "0x4B3ff00Bd27a9d75204CceB619d5B1D393dbaE71", "bsc")
         raise HTTPException(
             status_code=403, 
             detail=f"TST GATE: You hold {current} TST. Required: {REQUIRED_TST} TST. Please acquire TST to access this feature."
@@ -1,48 +1,110 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse, JSONResponse
+from typing import Any, List, Optional, Tuple
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select
 from app.db.session import get_db
 from app.entities.arena import Arena
-from app.schemas.hearing import HearingRecord
+from pydantic import ValidationError
+from app.schemas.hearing import HearingRecord, HearingSummary
 from app.models.hearing import HearingRecordModel
+from app.models.job import ExecutionJob
+from app.schemas.job import ExecutionJobResponse
+from app.services.hearing_store import hearing_writer, HEARING_SUMMARY_COLUMNS
+from app.services.execution_queue import execution_queue, CallbackURLError
+from app.services.idempotency import idempotency_store
+from app.services.pagination import keyset_page, next_cursor
+import asyncio
+import json
 import uuid
 
 router = APIRouter()
 arena = Arena()
 
+# Streamed hearings keep running if the client disconnects; hold a reference until they finish
+_background_hearings = set()
+SSE_KEEPALIVE_SECONDS = 15
+
 class HearingRequest(BaseModel):
     user_id: str
     intent: str
     execute: bool = False
+    callback_url: Optional[str] = None  # execute=True only: POSTed on every job status change
+
+def hearing_summary(row) -> HearingSummary:
+    return HearingSummary(
+        id=str(row.id),
+        user_id=str(row.user_id),
+        intent=row.intent,
+        started_at=row.started_at,
+        final_verdict=row.final_verdict,
+        final_reason=row.final_reason,
+        action_type=row.action_type,
+        tx_hash=row.tx_hash,
+        highlight=row.highlight
+    )
 
-@router.get("/", response_model=List[HearingRecord])
-async def get_recent_hearings(limit: int = 10, db: AsyncSession = Depends(get_db)):
+@router.get("/", response_model=List[HearingSummary])
+async def get_recent_hearings(
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    user_id: Optional[uuid.UUID] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
     """
-    Fetch the audit log of recent agent decisions.
+    Fetch the audit log of recent agent decisions, newest first.
+    Summary columns only; the full transcript is at GET /hearing/{id}.
+    When more rows exist, X-Next-Cursor holds the `cursor` for the next page.
     """
+    query = select(*HEARING_SUMMARY_COLUMNS)
+    if user_id:
+        query = query.where(HearingRecordModel.user_id == user_id)
+    query = keyset_page(query, HearingRecordModel.started_at, HearingRecordModel.id, cursor, limit)
     try:
-        result = await db.execute(
-            select(HearingRecordModel)
-            .order_by(desc(HearingRecordModel.started_at))
-            .limit(limit)
-        )
-        records = result.scalars().all()
-        # Convert DB Model JSON back to Pydantic Schema
-        return [HearingRecord(**r.transcript) for r in records]
+        result = await db.execute(query)
+        return [hearing_summary(r) for r in next_cursor(result.all(), limit, "started_at", response)]
     except Exception as e:
         # If table doesn't exist yet (first run), return empty
         print(f"⚠️ Error fetching hearings: {e}")
         return []
 
 @router.post("/gate", response_model=HearingRecord)
-async def run_hearing(request: HearingRequest, db: AsyncSession = Depends(get_db)):
+async def run_hearing(
+    request: HearingRequest,
+    db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """
     Submits an intent to the Entity Control Plane.
     Returns the full HearingRecord with the verdict.
     Persists the record to Postgres.
+
+    execute=True is queued instead: returns 202 with the job; poll GET /hearing/jobs/{job_id}.
+    With an Idempotency-Key header, retries replay the first response instead of re-running.
     """
+    if idempotency_key:
+        return await idempotency_store.run(
+            f"hearing.gate:{request.user_id}",
+            idempotency_key,
+            request.model_dump(mode='json'),
+            lambda: _submit_hearing(request, db)
+        )
+
+    status_code, body = await _submit_hearing(request, db)
+    return JSONResponse(status_code=status_code, content=body)
+
+async def _submit_hearing(request: HearingRequest, db: AsyncSession) -> Tuple[int, Any]:
+    if request.execute:
+        try:
+            job = await execution_queue.enqueue(db, request.user_id, request.intent, request.callback_url)
+        except CallbackURLError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=503, detail=f"Execution queue unavailable: {e}")
+        return 202, ExecutionJobResponse.model_validate(job).model_dump(mode='json')
+
     try:
         # 1. Run the Entity Loop (CPU bound, synchronous logic)
         record = await arena.conduct_hearing(
@@ -51,29 +113,102 @@ async def run_hearing(request: HearingRequest, db: AsyncSession = Depends(get_db
             execute=request.execute
         )
         
-        # 2. Persist to DB
-        # Note: In a real app, ensure user_id is a valid UUID before casting
-        try:
-            u_id = uuid.UUID(request.user_id)
-        except ValueError:
-             # Fallback for dev if user uses non-uuid strings
-            u_id = uuid.uuid4() 
-
-        db_record = HearingRecordModel(
-            id=uuid.UUID(record.id),
-            user_id=u_id, 
-            intent=record.intent,
-            started_at=record.started_at,
-            transcript=record.model_dump(mode='json'), # Ensure datetime is serialized to string
-            final_verdict=record.final_verdict,
-            final_reason=record.final_reason
-        )
-        
-        db.add(db_record)
-        await db.commit()
+        # 2. Persist to DB (write-behind: dry runs don't wait on a commit)
+        hearing_writer.submit(record, request.user_id)
         
-        return record
+        return 200, record.model_dump(mode='json')
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/jobs/{job_id}", response_model=ExecutionJobResponse)
+async def get_execution_job(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """
+    Status of a queued execute=True hearing, with the latest attempt's transcript once there is one.
+    """
+    job = await db.get(ExecutionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    response = ExecutionJobResponse.model_validate(job)
+    if job.hearing_id:
+        hearing = await db.get(HearingRecordModel, job.hearing_id)
+        if hearing:
+            response.hearing = hearing.to_schema()
+    return response
+
+@router.get("/{hearing_id}", response_model=HearingRecord)
+async def get_hearing(hearing_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """
+    Full transcript of one hearing.
+    """
+    hearing = await db.get(HearingRecordModel, hearing_id)
+    if not hearing:
+        raise HTTPException(status_code=404, detail="Hearing not found")
+    try:
+        return hearing.to_schema()
+    except ValidationError:
+        # Log-style rows (e.g. gas refuels) have no hearing transcript
+        raise HTTPException(status_code=404, detail="No hearing transcript for this record")
+
+@router.post("/gate/stream")
+async def stream_hearing(request: HearingRequest):
+    """
+    Same as /gate for dry runs, but streams progress as Server-Sent Events while the hearing runs.
+    Events: perception, memory, risk, strategy (each stage's output as it completes),
+    then verdict (the full HearingRecord) or error.
+
+    execute=True is rejected: executions only run through the job queue (leases, safe
+    retries, Idempotency-Key), i.e. POST /gate then GET /jobs/{id}.
+    """
+    if request.execute:
+        raise HTTPException(
+            status_code=422,
+            detail="execute=true is not supported on /gate/stream. POST /hearing/gate and poll /hearing/jobs/{id}."
+        )
+
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def on_stage(stage: str, record: HearingRecord):
+        queue.put_nowait((stage, getattr(record, stage).model_dump(mode='json')))
+
+    async def run():
+        try:
+            record = await arena.conduct_hearing(
+                user_id=request.user_id,
+                intent=request.intent,
+                execute=False,
+                on_stage=on_stage
+            )
+            hearing_writer.submit(record, request.user_id)
+            queue.put_nowait(("verdict", record.model_dump(mode='json')))
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            queue.put_nowait(("error", {"detail": str(e)}))
+        finally:
+            queue.put_nowait(None)
+
+    task = asyncio.create_task(run())
+    _background_hearings.add(task)
+    task.add_done_callback(_background_hearings.discard)
+
+    async def events():
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing the stream during a long debate
+                yield ": keep-alive\n\n"
+                continue
+            if item is None:
+                break
+            event, data = item
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
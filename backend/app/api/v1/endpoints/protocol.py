@@ -56,10 +56,10 @@ async def get_protocol_stats() -> Any:
     try:
         # Treasury Holdings
         treasury_bnb = await wallet_service.get_balance(TREASURY_ADDRESS, chain)
-        treasury_tst = wallet_service.get_token_balance(TREASURY_ADDRESS, TST_TOKEN, chain)
+        treasury_tst = await wallet_service.get_token_balance_cached(TREASURY_ADDRESS, TST_TOKEN, chain)
         
         # Test Pilot Stats
-        alice_tst = wallet_service.get_token_balance(ALICE_ADDRESS, TST_TOKEN, chain)
+        alice_tst = await wallet_service.get_token_balance_cached(ALICE_ADDRESS, TST_TOKEN, chain)
         
         return {
             "network": "BSC Mainnet" if settings.NEXT_PUBLIC_USE_MAINNET else "BSC Testnet",
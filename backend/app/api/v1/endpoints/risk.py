@@ -0,0 +1,101 @@
+from typing import Any, Dict, List
+import uuid
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.db.session import get_db
+from app.models.risk import RiskLimit, AllowlistEntry
+from app.schemas.risk import RiskLimitUpdate, RiskLimitResponse, AllowlistEntryCreate, AllowlistEntryResponse
+from app.services.risk_rules import risk_rules
+
+router = APIRouter()
+
+@router.get("/rules", response_model=Dict[str, Any])
+async def get_risk_rules() -> Any:
+    """
+    Summary of the compiled rule set the RiskEntity is currently enforcing.
+    """
+    await risk_rules.get_rules()
+    return risk_rules.describe()
+
+@router.get("/limits", response_model=List[RiskLimitResponse])
+async def list_risk_limits(db: AsyncSession = Depends(get_db)) -> Any:
+    result = await db.execute(select(RiskLimit).order_by(RiskLimit.kind, RiskLimit.asset))
+    return result.scalars().all()
+
+@router.put("/limits", response_model=RiskLimitResponse)
+async def upsert_risk_limit(
+    limit_in: RiskLimitUpdate,
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    Create or update a limit, matched on (kind, asset).
+    """
+    asset = limit_in.asset.upper() if limit_in.asset else None
+    if limit_in.kind == "ASSET_MAX" and not asset:
+        raise HTTPException(status_code=400, detail="ASSET_MAX limits require an asset")
+
+    result = await db.execute(
+        select(RiskLimit).where(RiskLimit.kind == limit_in.kind, RiskLimit.asset == asset)
+    )
+    limit = result.scalars().first()
+    if not limit:
+        limit = RiskLimit(kind=limit_in.kind, asset=asset)
+
+    limit.max_amount = limit_in.max_amount
+    limit.is_active = limit_in.is_active
+    db.add(limit)
+    await db.commit()
+    await db.refresh(limit)
+
+    risk_rules.mark_stale()
+    return limit
+
+@router.get("/allowlist/{user_id}", response_model=List[AllowlistEntryResponse])
+async def list_allowlist(
+    user_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    Global allowlist entries plus the ones scoped to this user.
+    """
+    result = await db.execute(
+        select(AllowlistEntry).where(
+            (AllowlistEntry.user_id == None) | (AllowlistEntry.user_id == user_id)
+        )
+    )
+    return result.scalars().all()
+
+@router.post("/allowlist", response_model=AllowlistEntryResponse)
+async def add_allowlist_entry(
+    entry_in: AllowlistEntryCreate,
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    entry = AllowlistEntry(
+        user_id=entry_in.user_id,
+        address=entry_in.address.lower(),
+        label=entry_in.label
+    )
+    db.add(entry)
+    await db.commit()
+    await db.refresh(entry)
+
+    risk_rules.mark_stale()
+    return entry
+
+@router.delete("/allowlist/{entry_id}")
+async def remove_allowlist_entry(
+    entry_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    result = await db.execute(select(AllowlistEntry).where(AllowlistEntry.id == entry_id))
+    entry = result.scalars().first()
+    if not entry:
+        raise HTTPException(status_code=404, detail="Allowlist entry not found")
+
+    await db.delete(entry)
+    await db.commit()
+
+    risk_rules.mark_stale()
+    return {"status": "removed", "id": str(entry_id)}
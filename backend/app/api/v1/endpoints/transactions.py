@@ -1,5 +1,5 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
@@ -8,91 +8,137 @@ from app.models.user import User
 from app.models.transaction import Transaction
 from app.schemas.transaction import WithdrawalRequest, TransactionResponse
 from app.services.wallet_service import wallet_service
+from app.services.velocity_tracker import velocity_tracker
+from app.services.idempotency import idempotency_store
+from app.services.ledger import ledger
+from app.services.pagination import keyset_page, next_cursor
+from app.services.submissions import tracking_submissions
 from app.core.config import settings
 
 router = APIRouter()
 
+DEFAULT_HISTORY_PAGE = 50
+
 @router.post("/{user_id}/withdraw", response_model=TransactionResponse)
 async def request_withdrawal(
     user_id: str,
     withdrawal: WithdrawalRequest,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ) -> Any:
     """
     Process a withdrawal request from the User's Internal Ledger Balance.
     Funds are sent from the MASTER HOT WALLET.
+
+    With an Idempotency-Key header, retries replay the first response and never pay out twice.
     """
+    if idempotency_key:
+        async def handler():
+            tx = await _process_withdrawal(user_id, withdrawal, db)
+            return 200, TransactionResponse.model_validate(tx).model_dump(mode='json')
+
+        # Server errors are cached too: the payout may have been broadcast before it failed
+        return await idempotency_store.run(
+            f"withdraw:{user_id}",
+            idempotency_key,
+            withdrawal.model_dump(mode='json'),
+            handler,
+            cache_errors=True
+        )
+
+    return await _process_withdrawal(user_id, withdrawal, db)
+
+# (chain, symbol) -> token contract paid out from the master wallet
+WITHDRAWAL_TOKENS = {
+    ("bsc", "TST"): "0x4B3ff00Bd27a9d75204CceB619d5B1D393dbaE71",
+    ("bsc", "USDT"): "0x55d398326f99059fF775485246999027B3197955",
+    ("polygon", "USDT"): "0xc2132D05D31c914a87C6611C10748AEb04B58e8F",
+}
+
+async def _process_withdrawal(user_id: str, withdrawal: WithdrawalRequest, db: AsyncSession) -> Transaction:
     # 1. Verify User
     result = await db.execute(select(User).filter(User.id == user_id))
     user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # 2. Calculate Balance (Sum of Deposits - Sum of Withdrawals)
-    # in a real app, you'd maintain a cached 'balance' column on the User model.
-    # For MVP, we calculate on fly.
-    
-    q = select(Transaction).filter(Transaction.user_id == user_id, Transaction.symbol == withdrawal.symbol)
-    result = await db.execute(q)
-    txs = result.scalars().all()
-    
-    total_deposited = sum(t.amount for t in txs if t.type == 'DEPOSIT')
-    total_withdrawn = sum(t.amount for t in txs if t.type == 'WITHDRAWAL')
-    available_balance = total_deposited - total_withdrawn
+    token_addr = WITHDRAWAL_TOKENS.get((withdrawal.chain, withdrawal.symbol))
+    if token_addr is None:
+        raise HTTPException(status_code=400, detail="Unsupported Asset/Chain")
+
+    # 2. Check Balance and reserve the funds (materialized ledger balance)
+    # The row is locked only until the PENDING debit commits, so concurrent withdrawals for the
+    # same asset are checked one after another, and no lock or connection is held during the payout.
+    available_balance = await ledger.lock_balance(db, user.id, withdrawal.chain, withdrawal.symbol)
     
     if available_balance < withdrawal.amount:
         raise HTTPException(status_code=400, detail=f"Insufficient Funds. Available: {available_balance} {withdrawal.symbol}")
 
-    # 3. Execute Blockchain Transfer (From Master Wallet)
-    # NOTE: In production, you might queue this instead of executing synchronously.
-    
-    # Map symbol to contract address
-    if withdrawal.chain == 'bsc' and withdrawal.symbol == 'TST':
-        token_addr = "0x4B3ff00Bd27a9d75204CceB619d5B1D393dbaE71"
-    elif withdrawal.chain == 'bsc' and withdrawal.symbol == 'USDT':
-        token_addr = "0x55d398326f99059fF775485246999027B3197955"
-    elif withdrawal.chain == 'polygon' and withdrawal.symbol == 'USDT':
-        token_addr = "0xc2132D05D31c914a87C6611C10748AEb04B58e8F"
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported Asset/Chain")
-
-    try:
-        # We need a method in wallet_service to send from Master Wallet
-        # For now, we can reuse transfer_token logic but we need to pass the MASTER PRIVATE KEY.
-        # Ideally, wallet_service has a dedicated method 'payout_user' using environment master key.
-        
-        # Simulating the payout function for now (Step 4 below adds it)
-        tx_hash = await wallet_service.payout_from_master(
-            to_address=withdrawal.destination_address,
-            token_address=token_addr,
-            amount=withdrawal.amount,
-            chain=withdrawal.chain
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-    # 4. Record Debit
     new_tx = Transaction(
-        user_id=user_id,
+        user_id=user.id,
         chain=withdrawal.chain,
         symbol=withdrawal.symbol,
         amount=withdrawal.amount,
         type='WITHDRAWAL',
-        tx_hash=tx_hash
+        status='PENDING'
     )
-    db.add(new_tx)
+    await ledger.post(db, new_tx)
     await db.commit()
+
+    # 3. Execute Blockchain Transfer (From Master Wallet)
+    with tracking_submissions() as tracker:
+        try:
+            tx_hash = await wallet_service.payout_from_master(
+                to_address=withdrawal.destination_address,
+                token_address=token_addr,
+                amount=withdrawal.amount,
+                chain=withdrawal.chain
+            )
+        except Exception as e:
+            if not tracker.submitted:
+                # Nothing left the hot wallet: give the funds back
+                await ledger.void(db, new_tx)
+                await db.commit()
+                raise HTTPException(status_code=500, detail=str(e))
+            print(f"❌ Withdrawal {new_tx.id}: payout failed after broadcast ({e}). Left PENDING for manual review.")
+            raise HTTPException(
+                status_code=500,
+                detail=f"{e}. The payout may have been broadcast; withdrawal {new_tx.id} stays PENDING for manual review."
+            )
+
+    # 4. Confirm the Debit
+    new_tx.tx_hash = tx_hash
+    new_tx.status = 'CONFIRMED'
+    try:
+        await db.commit()
+    except Exception as e:
+        # Funds stay debited (PENDING); the hash is logged so the row can be confirmed by hand
+        print(f"❌ Withdrawal {new_tx.id}: broadcast {tx_hash} but could not confirm the ledger row: {e}")
+        raise HTTPException(status_code=500, detail=f"Payout {tx_hash} sent; withdrawal {new_tx.id} stays PENDING for manual review.")
     await db.refresh(new_tx)
+
+    velocity_tracker.record_spend(str(user.id), withdrawal.symbol, withdrawal.amount, ref=f"tx:{new_tx.id}")
     
     return new_tx
 
 @router.get("/{user_id}/history", response_model=List[TransactionResponse])
 async def get_history(
     user_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
-    Get all deposits and withdrawals.
+    Get deposits and withdrawals, newest first.
+    Paginated once `limit` or `cursor` is given (default page 50); when more rows exist,
+    X-Next-Cursor holds the `cursor` for the next page. With neither, returns the full history.
     """
-    result = await db.execute(select(Transaction).filter(Transaction.user_id == user_id).order_by(Transaction.created_at.desc()))
-    return result.scalars().all()
+    query = select(Transaction).filter(Transaction.user_id == user_id)
+    if limit is None and cursor is None:
+        result = await db.execute(query.order_by(Transaction.created_at.desc(), Transaction.id.desc()))
+        return result.scalars().all()
+
+    limit = limit or DEFAULT_HISTORY_PAGE
+    result = await db.execute(keyset_page(query, Transaction.created_at, Transaction.id, cursor, limit))
+    return next_cursor(result.scalars().all(), limit, "created_at", response)
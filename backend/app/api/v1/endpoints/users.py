@@ -1,17 +1,27 @@
-from typing import Any, List
+from typing import Any, AsyncIterator, List
+import asyncio
+import json
+import uuid as uuid_lib
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload
 
-from app.db.session import get_db
-from app.models.user import User
+from app.core.config import settings
+from app.db.session import get_db, AsyncSessionLocal
+from app.models.user import User, derivation_index_seq
 from app.models.wallet import Wallet
-from app.schemas.user import UserCreate, UserResponse, CexConfigUpdate
+from app.schemas.user import UserCreate, UserBulkCreate, UserResponse, CexConfigUpdate
 from app.services.wallet_service import wallet_service
+from app.services.user_cache import user_cache
 
 router = APIRouter()
 
+# Every user gets the same derived EVM address on each of these chains
+EVM_CHAINS = ["ethereum", "bsc", "polygon"]
+
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: str,
@@ -116,6 +126,9 @@ async def update_cex_config(
         db.add(user)
         await db.commit()
         await db.refresh(user)
+
+        # Write-through: the next hearing must see the new keys
+        user_cache.invalidate(str(user.id))
         return user
         
     except ValueError:
@@ -140,33 +153,25 @@ async def create_user(
     if existing_user:
         return existing_user
 
-    # 2. Get next derivation index
-    # Note: In high concurrency, use a sequence or lock. 
-    # For MVP: Select max + 1
-    result = await db.execute(select(func.max(User.derivation_index)))
-    max_index = result.scalar()
-    next_index = 1 if max_index is None else max_index + 1
-
-    # 3. Create User
+    # 2. Create User
+    # derivation_index comes from users_derivation_index_seq on insert
     user = User(
         email=user_in.email,
         name=user_in.name,
-        derivation_index=next_index,
         is_active=True
     )
     db.add(user)
     await db.flush() # Get user ID without committing
     await db.refresh(user)
+    next_index = user.derivation_index
 
-    # 4. Derive Wallet (EVM)
+    # 3. Derive Wallet (EVM)
     # For simplicity, we use the same address for all EVM chains locally, 
     # but store them as distinct entities if needed.
     # Supported Chains: Ethereum, BSC, Polygon
     evm_wallet_data = wallet_service.generate_evm_address(next_index)
     
-    chains = ["ethereum", "bsc", "polygon"]
-    
-    for chain in chains:
+    for chain in EVM_CHAINS:
         wallet = Wallet(
             user_id=user.id,
             address=evm_wallet_data["address"],
@@ -176,6 +181,9 @@ async def create_user(
         db.add(wallet)
 
     await db.commit()
+
+    # The derived address may have been cached as an unknown subject
+    user_cache.invalidate(str(user.id), aliases=[evm_wallet_data["address"]])
     # No need to refresh user individually if we are going to re-select it with options
     
     # Eager load wallets for response
@@ -189,3 +197,111 @@ async def create_user(
     user_loaded = result.scalars().first()
     
     return user_loaded
+
+@router.post("/bulk")
+async def create_users_bulk(users_in: UserBulkCreate) -> Any:
+    """
+    Provision a cohort of users (and their custodial wallets) in one request.
+
+    Streams one NDJSON line per email as each batch commits:
+    {"email", "status": "created" | "exists" | "error", "id", "derivation_index", "address"}.
+    Existing emails are reported, not changed (same get-or-create rule as POST /users).
+    """
+    if len(users_in.users) > settings.USER_PROVISION_MAX_USERS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.USER_PROVISION_MAX_USERS} users per request")
+
+    # Last entry wins for duplicate emails within the request
+    unique = list({u.email: u for u in users_in.users}.values())
+    batch_size = settings.USER_PROVISION_BATCH_SIZE
+
+    async def lines() -> AsyncIterator[str]:
+        for start in range(0, len(unique), batch_size):
+            batch = unique[start:start + batch_size]
+            try:
+                results = await _provision_batch(batch)
+            except Exception as e:
+                print(f"❌ Bulk Provisioning: Batch at {start} failed: {e}")
+                results = [{"email": u.email, "status": "error", "detail": str(e)} for u in batch]
+            for r in results:
+                yield json.dumps(r, default=str) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+async def _provision_batch(batch: List[UserCreate]) -> List[dict]:
+    """
+    One transaction per batch: reserve a block of derivation indexes, derive the addresses
+    off the event loop, then multi-row INSERT the users and their wallets.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(User.email, User.id, User.derivation_index)
+            .where(User.email.in_([u.email for u in batch]))
+        )
+        existing = {row.email: row for row in result.all()}
+        new_users = [u for u in batch if u.email not in existing]
+
+        created = {}
+        if new_users:
+            # nextval() for the whole block in one round trip; unused values (e.g. lost races) are just skipped
+            result = await db.execute(
+                select(derivation_index_seq.next_value()).select_from(func.generate_series(1, len(new_users)))
+            )
+            indexes = [row[0] for row in result.all()]
+            derived = await asyncio.to_thread(wallet_service.generate_evm_addresses, indexes)
+
+            rows = [
+                {
+                    "id": uuid_lib.uuid4(),
+                    "email": u.email,
+                    "name": u.name,
+                    "derivation_index": index,
+                    "is_active": True,
+                    "is_superuser": False,
+                    "cex_config": {}
+                }
+                for u, index in zip(new_users, indexes)
+            ]
+            # A concurrent signup may have taken an email since the SELECT; that row is skipped
+            result = await db.execute(
+                pg_insert(User).values(rows)
+                .on_conflict_do_nothing(index_elements=["email"])
+                .returning(User.id)
+            )
+            inserted = {row[0] for row in result.all()}
+
+            wallet_rows = []
+            for row, wallet in zip(rows, derived):
+                if row["id"] not in inserted:
+                    continue
+                created[row["email"]] = {**row, **wallet}
+                for chain in EVM_CHAINS:
+                    wallet_rows.append({
+                        "id": uuid_lib.uuid4(),
+                        "user_id": row["id"],
+                        "address": wallet["address"],
+                        "chain": chain,
+                        "derivation_path": wallet["path"]
+                    })
+            if wallet_rows:
+                await db.execute(insert(Wallet).values(wallet_rows))
+            await db.commit()
+
+    results = []
+    for u in batch:
+        if u.email in created:
+            row = created[u.email]
+            # The derived addresses may have been cached as unknown subjects
+            user_cache.invalidate(str(row["id"]), aliases=[row["address"]])
+            results.append({
+                "email": u.email, "status": "created", "id": str(row["id"]),
+                "derivation_index": row["derivation_index"], "address": row["address"]
+            })
+        elif u.email in existing:
+            row = existing[u.email]
+            results.append({
+                "email": u.email, "status": "exists", "id": str(row.id), "derivation_index": row.derivation_index
+            })
+        else:
+            results.append({"email": u.email, "status": "exists"})
+    print(f"👥 Bulk Provisioning: {len(created)} created, {len(batch) - len(created)} existing")
+    return results
@@ -1,4 +1,5 @@
 from typing import Any, List
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -7,6 +8,7 @@ from pydantic import BaseModel
 from app.db.session import get_db
 from app.models.wallet import Wallet
 from app.services.wallet_service import wallet_service
+from app.services.portfolio_service import portfolio_service
 
 router = APIRouter()
 
@@ -40,10 +42,9 @@ async def get_wallet_balances(
         "polygon": "MATIC"
     }
 
-    # 2. Iterate and fetch live balances
-    # In prod, do this in parallel using asyncio.gather
-    for w in wallets:
-        balance = await wallet_service.get_balance(w.address, w.chain)
+    # 2. Fetch live balances, all wallets at once
+    live = await asyncio.gather(*(wallet_service.get_balance(w.address, w.chain) for w in wallets))
+    for w, balance in zip(wallets, live):
         balances.append({
             "chain": w.chain,
             "address": w.address,
@@ -52,3 +53,17 @@ async def get_wallet_balances(
         })
         
     return balances
+
+@router.get("/{user_id}/portfolio")
+async def get_wallet_portfolio(
+    user_id: str,
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    Native + token balances of all the user's wallets, valued in USD.
+    """
+    result = await db.execute(select(Wallet.chain, Wallet.address).where(Wallet.user_id == user_id))
+    wallets = result.all()
+    if not wallets:
+        return {"total_usd": 0.0, "chains": []}
+    return await portfolio_service.get_portfolio([(w.chain, w.address) for w in wallets])
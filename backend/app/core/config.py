@@ -71,6 +71,94 @@ class Settings(BaseSettings):
     # Network Toggles
     NEXT_PUBLIC_USE_MAINNET: bool = True
 
+    # User Profile Cache (Memory / Perception lookups)
+    USER_CACHE_TTL_SECONDS: int = 300
+    USER_CACHE_MAX_ENTRIES: int = 1024
+    USER_CACHE_PINNED_TTL_SECONDS: int = 900     # Autopilot identity; re-read so other processes see config changes
+
+    # Risk Rules (DB-backed, hot reloaded)
+    RISK_RULES_REFRESH_SECONDS: int = 30
+    VELOCITY_RESYNC_SECONDS: int = 30          # Rolling spend windows re-read from ledger + executed hearings
+
+    # AI Committee verdict cache (optional shared Redis, e.g. redis://localhost:6379/0)
+    STRATEGY_CACHE_TTL_SECONDS: int = 120
+    STRATEGY_CACHE_MAX_ENTRIES: int = 512
+    STRATEGY_CACHE_REDIS_URL: str = ""
+
+    # LLM latency budgets / circuit breakers
+    LLM_CALL_TIMEOUT_SECONDS: float = 12.0     # Deadline for a single provider call
+    LLM_DEBATE_BUDGET_SECONDS: float = 25.0    # Whole committee session; past this, rule-based strategy
+    LLM_BREAKER_FAILURE_RATE: float = 0.5      # Error/slow-call share of recent calls that opens a breaker
+    LLM_BREAKER_SLOW_CALL_SECONDS: float = 8.0
+    LLM_BREAKER_COOLDOWN_SECONDS: float = 30.0
+    LLM_HEDGE_ENABLED: bool = False            # Race the second provider once the first passes its p95
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 1.0
+
+    # LLM provider: "live" (Groq/Gemini APIs) or "local" (offline stand-in for benchmarks)
+    LLM_PROVIDER: str = "live"
+    LLM_LOCAL_FAST_MEDIAN_MS: float = 400.0    # Stands in for Groq (Trader / Strategy)
+    LLM_LOCAL_FAST_P95_MS: float = 1200.0
+    LLM_LOCAL_DEEP_MEDIAN_MS: float = 1500.0   # Stands in for Gemini (Analyst / Judge / Risk)
+    LLM_LOCAL_DEEP_P95_MS: float = 4000.0
+    LLM_LOCAL_ERROR_RATE: float = 0.0
+    LLM_LOCAL_SEED: int = 0
+
+    # Execution job queue (execute=True hearings)
+    EXECUTION_WORKERS: int = 2                 # Workers inside the API process; 0 = run execution_worker.py separately
+    EXECUTION_POLL_SECONDS: float = 2.0
+    EXECUTION_MAX_ATTEMPTS: int = 3
+    EXECUTION_RETRY_BASE_SECONDS: float = 5.0  # Backoff: base * 2^(attempt-1), plus jitter
+    EXECUTION_JOB_LEASE_SECONDS: int = 600     # RUNNING longer than this = worker lost
+    EXECUTION_CALLBACK_ALLOWED_HOSTS: str = ""  # Comma-separated hosts allowed for callback_url besides public ones
+
+    # Idempotency-Key retention for /hearing/gate and withdrawals
+    IDEMPOTENCY_TTL_HOURS: int = 24
+
+    # Bulk user provisioning (POST /users/bulk)
+    USER_PROVISION_BATCH_SIZE: int = 500       # Users derived + inserted per DB transaction
+    USER_PROVISION_MAX_USERS: int = 10000      # Per request
+
+    # On-chain balance cache: entries are reused until the chain's head block moves
+    BALANCE_HEAD_TTL_SECONDS: float = 1.0      # How long a polled head block number is trusted (~ block time)
+    BALANCE_CACHE_MAX_ENTRIES: int = 8192      # (chain, address, token) entries
+
+    # Binance request-weight budgets (IP limits per minute); calls queue instead of failing
+    BINANCE_API_WEIGHT_PER_MINUTE: int = 6000  # /api routes (X-MBX-USED-WEIGHT-1M)
+    BINANCE_SAPI_WEIGHT_PER_MINUTE: int = 12000  # /sapi routes (X-SAPI-USED-IP-WEIGHT-1M)
+    BINANCE_WEIGHT_RESERVE: float = 0.2        # Share of each budget only withdrawals may spend
+    BINANCE_RATE_LIMIT_RETRIES: int = 3        # Re-queues after a 429/418
+    BINANCE_TIME_SYNC_SECONDS: float = 300.0   # Server-time offset resync interval (signed requests)
+
+    # CEX evacuation (CEX_WITHDRAWAL_BATCH)
+    CEX_COIN_CONFIG_TTL_SECONDS: int = 3600    # Cached withdrawal minimums / fees / networks per account
+    CEX_EVACUATION_CONCURRENCY: int = 8        # Withdrawals submitted at once
+
+    # Binance price book (all-symbols ticker snapshot, stale-while-revalidate)
+    PRICE_BOOK_FRESH_SECONDS: float = 2.0      # Served without refetching
+    PRICE_BOOK_MAX_STALE_SECONDS: float = 30.0 # Up to here served while one refresh runs behind; past it, wait
+
+    # Streaming best bid/ask (Binance bookTicker): "off", "binance", or "local" (offline stand-in)
+    MARKET_STREAM: str = "off"
+    MARKET_STREAM_URL: str = "wss://stream.binance.com:9443"
+    MARKET_STREAM_SYMBOLS: str = "ETHUSDT,BTCUSDT,BNBUSDT,POLUSDT,USDCUSDT"
+    MARKET_STREAM_MAX_AGE_SECONDS: float = 5.0 # Older tops are ignored (price book is used instead)
+    MARKET_STREAM_LOCAL_INTERVAL_MS: float = 100.0
+    MARKET_STREAM_LOCAL_SEED: int = 0
+
+    # Wallet portfolio (GET /wallets/{user_id}/portfolio)
+    PORTFOLIO_PRICE_TTL_SECONDS: int = 30
+
+    # Pooled upstream HTTP clients (Binance, DeFiLlama)
+    HTTP_MAX_CONNECTIONS: int = 50             # Per upstream
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+
+    # Write-behind hearing record persistence
+    HEARING_WRITER_BATCH_SIZE: int = 100
+    HEARING_WRITER_FLUSH_SECONDS: float = 1.0
+    HEARING_WRITER_MAX_BUFFER: int = 10000
+
     model_config = SettingsConfigDict(
         env_file=".env",  
         case_sensitive=True,
@@ -4,3 +4,7 @@ from app.models.wallet import Wallet
 from app.models.transaction import Transaction
 from app.models.agreement import Agreement
 from app.models.hearing import HearingRecordModel
+from app.models.risk import RiskLimit, AllowlistEntry
+from app.models.job import ExecutionJob
+from app.models.idempotency import IdempotencyKey
+from app.models.balance import Balance
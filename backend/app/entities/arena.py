@@ -1,10 +1,14 @@
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 from app.schemas.hearing import HearingRecord
 from app.entities.perception import PerceptionEntity
 from app.entities.memory import MemoryEntity
 from app.entities.risk import RiskEntity
 from app.entities.strategy import StrategyEntity
 from app.entities.execution import ExecutionEntity
+from app.services.velocity_tracker import velocity_tracker
+
+# Called with (stage, record) after each stage completes, e.g. to stream progress
+StageCallback = Callable[[str, HearingRecord], Awaitable[None]]
 
 class Arena:
     """
@@ -21,12 +25,14 @@ class Arena:
         self.strategy = StrategyEntity()
         self.execution = ExecutionEntity()
 
-    async def conduct_hearing(self, user_id: str, intent: str, execute: bool = False) -> HearingRecord:
+    async def conduct_hearing(self, user_id: str, intent: str, execute: bool = False,
+                              on_stage: Optional[StageCallback] = None) -> HearingRecord:
         """
         Runs the full cross-examination pipeline.
         
         Args:
             execute: If False, stops after Strategy (Dry Run). If True, allows Execution.
+            on_stage: Optional hook awaited after each stage ("perception", "memory", "risk", "strategy", "execution").
         """
         # 1. Initialize the Record
         record = HearingRecord(user_id=user_id, intent=intent, perception=None) # type: ignore (perception init later)
@@ -34,26 +40,33 @@ class Arena:
         try:
             # 2. Perception (The Eyes) -> Must always run
             record = await self.perception.process(record)
+            await self._emit(on_stage, "perception", record)
             if record.perception.status == "OBSTRUCTED":
                 return self._finalize(record, "BLOCKED", "Perception failed to verify reality.")
 
             # 3. Memory (The Context)
             record = await self.memory.process(record)
+            await self._emit(on_stage, "memory", record)
 
             # 4. Risk (The Veto)
             record = await self.risk.process(record)
+            await self._emit(on_stage, "risk", record)
             if record.risk.verdict == "VETO":
                 return self._finalize(record, "BLOCKED", f"Risk Veto: {record.risk.blockers}")
 
             # 5. Strategy (The Plan)
             record = await self.strategy.process(record)
+            await self._emit(on_stage, "strategy", record)
             if not record.strategy.feasible_options:
                 return self._finalize(record, "BLOCKED", "Strategy found no feasible path under Risk constraints.")
 
             # 6. Execution (The Hands)
             if execute:
                 record = await self.execution.process(record)
+                await self._emit(on_stage, "execution", record)
                 if record.execution.status == "SUCCESS":
+                    # Feed the rolling-window velocity limits (RISK-004/005)
+                    await velocity_tracker.record_hearing(record)
                     return self._finalize(record, "ALLOWED", "Execution successful.")
                 else:
                     return self._finalize(record, "ERROR", f"Execution failed: {record.execution.logs}")
@@ -66,6 +79,15 @@ class Arena:
             traceback.print_exc()
             return self._finalize(record, "ERROR", f"Arena Crash: {str(e)}")
 
+    async def _emit(self, on_stage: Optional[StageCallback], stage: str, record: HearingRecord):
+        if on_stage is None:
+            return
+        try:
+            await on_stage(stage, record)
+        except Exception as e:
+            # A broken listener must never change the hearing outcome
+            print(f"⚠️ Arena: Stage listener failed at {stage}: {e}")
+
     def _finalize(self, record: HearingRecord, verdict: str, reason: str) -> HearingRecord:
         record.final_verdict = verdict
         record.final_reason = reason
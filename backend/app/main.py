@@ -1,16 +1,40 @@
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.services.velocity_tracker import velocity_tracker
+from app.services.execution_queue import execution_queue
+from app.services.hearing_store import hearing_writer
+from app.services.cex_service import cex_service
+from app.services.market_data_service import market_data
+from app.services.market_stream import market_stream
 
 # 1. Ensure all Database Models are imported and registered with SQLAlchemy
 # This prevents "Mapper failed to locate name" errors for relationships (User <-> Wallet)
 import app.db.base
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: warm in-memory state that would otherwise load on the first hearing
+    await velocity_tracker.ensure_loaded()
+    hearing_writer.start()
+    execution_queue.start(settings.EXECUTION_WORKERS)
+    market_stream.start()
+    yield
+    # Shutdown: let in-flight executions finish, then flush buffered hearing records
+    await execution_queue.stop()
+    await hearing_writer.stop()
+    await market_stream.stop()
+    # Pooled upstream connections
+    await cex_service.close()
+    await market_data.close()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # CORS
@@ -41,6 +65,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination on list endpoints
 )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
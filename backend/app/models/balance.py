@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base_class import Base
+
+class Balance(Base):
+    """
+    Materialized internal ledger balance: sum of DEPOSITs minus WITHDRAWALs in `transactions`
+    (FAILED rows excluded) for one (user, chain, symbol). Only changed through app.services.ledger, in the same
+    DB transaction as the ledger row it reflects.
+    """
+    __tablename__ = "balances"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    chain = Column(String, primary_key=True)   # bsc, polygon, ethereum
+    symbol = Column(String, primary_key=True)  # USDT, BNB, TST
+    amount = Column(Float, nullable=False, default=0.0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, func
+from sqlalchemy import Column, String, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base_class import Base
 
@@ -13,16 +13,49 @@ class HearingRecordModel(Base):
     intent = Column(String, nullable=False)
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     
-    # The Full Transcript (Perception, Risk, Strategy, etc.)
-    # We store this as JSONB because the structure is complex and deeply nested
-    transcript = Column(JSONB, nullable=False)
+    # Stage outputs, one JSONB column each (Postgres TOAST-compresses the large ones).
+    # List views select only the summary columns below, so these are only read for a full transcript.
+    perception = Column(JSONB, nullable=True)
+    memory = Column(JSONB, nullable=True)
+    risk = Column(JSONB, nullable=True)
+    strategy = Column(JSONB, nullable=True)
+    execution = Column(JSONB, nullable=True)
+
+    # Free-form payload for log-style rows that aren't a hearing (e.g. gas refuels).
+    # Rows written before the stage columns existed keep their full transcript here.
+    transcript = Column(JSONB, nullable=True)
     
     # Queryable Outcome
     final_verdict = Column(String, index=True, nullable=False) # ALLOWED, BLOCKED, ERROR
     final_reason = Column(String, nullable=True)
 
+    # Summary projections of the stage outputs, for list views
+    action_type = Column(String, nullable=True)   # Selected strategy plan
+    tx_hash = Column(String, nullable=True)
+    highlight = Column(String, nullable=True)     # Spread / profit line worth surfacing in feeds
+
+    __table_args__ = (
+        # Keyset pagination: newest first, globally and per user, with id as tie-breaker
+        Index("ix_hearing_records_started_at_id", "started_at", "id"),
+        Index("ix_hearing_records_user_id_started_at_id", "user_id", "started_at", "id"),
+    )
+
     def to_schema(self):
         """Helper to convert DB model back to Pydantic schema"""
         from app.schemas.hearing import HearingRecord
-        data = self.transcript
-        return HearingRecord(**data)
+        if self.perception is None and self.transcript and "intent" in self.transcript:
+            # Legacy row: the whole record lives in transcript
+            return HearingRecord(**self.transcript)
+        return HearingRecord(
+            id=str(self.id),
+            started_at=self.started_at,
+            user_id=str(self.user_id),
+            intent=self.intent,
+            perception=self.perception,
+            memory=self.memory,
+            risk=self.risk,
+            strategy=self.strategy,
+            execution=self.execution,
+            final_verdict=self.final_verdict,
+            final_reason=self.final_reason or ""
+        )
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, Integer, DateTime, func
+from sqlalchemy.dialects.postgresql import JSONB
+from app.db.base_class import Base
+
+class IdempotencyKey(Base):
+    """
+    Client-supplied Idempotency-Key for a mutating endpoint, with the response to replay.
+    scope: which endpoint (and owner) the key belongs to, e.g. "hearing.gate" or "withdraw:<user_id>".
+    status: IN_PROGRESS while the first request runs, COMPLETED once its response is stored.
+    """
+    __tablename__ = "idempotency_keys"
+
+    scope = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    fingerprint = Column(String, nullable=False)  # sha256 of the canonical request body
+
+    status = Column(String, nullable=False, default="IN_PROGRESS")
+    response_status = Column(Integer, nullable=True)
+    response_body = Column(JSONB, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,36 @@
+import uuid
+from sqlalchemy import Column, String, Integer, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from app.db.base_class import Base
+
+class ExecutionJob(Base):
+    """
+    A queued execute=True hearing, drained by the executor workers.
+    status: QUEUED -> RUNNING -> DONE | FAILED (RUNNING -> QUEUED again on a retryable error).
+    """
+    __tablename__ = "execution_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    user_id = Column(String, index=True, nullable=False)  # As submitted to /hearing/gate
+    intent = Column(String, nullable=False)
+    callback_url = Column(String, nullable=True)          # Optional webhook for status pushes
+
+    status = Column(String, nullable=False, default="QUEUED")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    next_run_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_by = Column(String, nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Outcome
+    hearing_id = Column(UUID(as_uuid=True), nullable=True)
+    final_verdict = Column(String, nullable=True)
+    last_error = Column(String, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Workers claim the oldest due QUEUED job
+        Index("ix_execution_jobs_status_next_run_at", "status", "next_run_at"),
+    )
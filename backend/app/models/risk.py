@@ -0,0 +1,35 @@
+import uuid
+from sqlalchemy import Column, String, Float, Boolean, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base_class import Base
+
+class RiskLimit(Base):
+    """
+    Amount caps enforced by the RiskEntity.
+    kind: 'GLOBAL_MAX' (fat-finger cap), 'ASSET_MAX' (per-asset cap, needs `asset`),
+    'DEFAULT_ASSET_MAX' (cap for assets without their own row),
+    'HOURLY_MAX' / 'DAILY_MAX' (rolling-window spend caps; `asset` NULL = any other asset).
+    """
+    __tablename__ = "risk_limits"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    kind = Column(String, nullable=False)
+    asset = Column(String, nullable=True, index=True)  # e.g. "ETH"
+    max_amount = Column(Float, nullable=False)
+    is_active = Column(Boolean(), default=True, nullable=False)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class AllowlistEntry(Base):
+    """
+    Trusted recipient for the Shield Protocol (RISK-003).
+    user_id NULL = global entry, otherwise only trusted for that user's hearings.
+    """
+    __tablename__ = "allowlist_entries"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
+    address = Column(String, nullable=False)  # stored lowercase
+    label = Column(String, nullable=True)     # e.g. "Alice (Hardhat #1)"
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
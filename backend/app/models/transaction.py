@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Integer, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
@@ -18,10 +18,18 @@ class Transaction(Base):
     
     # Type: 'DEPOSIT' (Swept from user) or 'WITHDRAWAL' (Sent to user)
     type = Column(String, nullable=False) 
+
+    # 'PENDING' (debited, payout not yet broadcast/confirmed), 'CONFIRMED', or 'FAILED' (voided, no effect on balance)
+    status = Column(String, nullable=False, default='CONFIRMED', server_default='CONFIRMED')
     
-    # Blockchain Reference
-    tx_hash = Column(String, unique=True, index=True, nullable=False)
+    # Blockchain Reference (NULL while a withdrawal is PENDING)
+    tx_hash = Column(String, unique=True, index=True, nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     owner = relationship("User", back_populates="transactions")
+
+    __table_args__ = (
+        # Per-user history, newest first (keyset pagination)
+        Index("ix_transactions_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
@@ -1,9 +1,12 @@
 import uuid
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, JSON, func
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, JSON, Sequence, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base_class import Base
 
+# Allocates derivation indexes; nextval never hands the same value out twice, even to concurrent signups
+derivation_index_seq = Sequence("users_derivation_index_seq", start=1)
+
 class User(Base):
     __tablename__ = "users"
 
@@ -16,7 +19,10 @@ class User(Base):
     
     # HD Wallet Derivation Base Index (e.g. 1 for m/44'/60'/0'/0/1)
     # Each user gets a unique base index to derive their wallets across all chains
-    derivation_index = Column(Integer, unique=True, index=True, nullable=False)
+    derivation_index = Column(
+        Integer, derivation_index_seq, server_default=derivation_index_seq.next_value(),
+        unique=True, index=True, nullable=False
+    )
     
     # CEX Integration (Encrypted API Keys ideally, plaintext for trial)
     # Structure: {"binance": {"api_key": "...", "api_secret": "..."}, "bybit": ...}
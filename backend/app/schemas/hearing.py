@@ -29,6 +29,7 @@ class MemoryOutput(BaseModel):
     relevant_precedents: List[Precedent] = []
     anomalies: List[str] = [] 
     cex_config: Optional[Dict[str, Any]] = None # {"binance": {...}}
+    user_id: Optional[str] = None # Resolved User UUID (the subject may be a wallet address)
 
 # --- 3. Risk Logic ---
 class RiskRule(BaseModel):
@@ -53,6 +54,7 @@ class StrategyOutput(BaseModel):
     feasible_options: List[StrategyPlan]
     selected_option_index: int
     reasoning: str
+    cache_hit: bool = False # True if the AI Committee verdict was served from cache
 
 # --- 5. Execution Logic ---
 class ExecutionResult(BaseModel):
@@ -60,6 +62,8 @@ class ExecutionResult(BaseModel):
     broadcast_time: Optional[datetime]
     status: Literal["SUCCESS", "FAILED", "PENDING"]
     logs: List[str] = []
+    # A tx broadcast or CEX withdrawal was sent (a FAILED result may still have moved funds)
+    submitted: bool = False
 
 # --- The Master Record ---
 class HearingRecord(BaseModel):
@@ -84,3 +88,19 @@ class HearingRecord(BaseModel):
 
     class Config:
         arbitrary_types_allowed = True
+
+# --- List View ---
+class HearingSummary(BaseModel):
+    """
+    One row of a hearing list: outcome and projections only.
+    The full HearingRecord is at GET /hearing/{id}.
+    """
+    id: str
+    user_id: str
+    intent: str
+    started_at: Optional[datetime] = None
+    final_verdict: str  # ALLOWED / BLOCKED / ERROR, or EXECUTED for autopilot log rows
+    final_reason: Optional[str] = None
+    action_type: Optional[str] = None
+    tx_hash: Optional[str] = None
+    highlight: Optional[str] = None
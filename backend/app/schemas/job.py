@@ -0,0 +1,23 @@
+from typing import Optional, Literal
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+from app.schemas.hearing import HearingRecord
+
+class ExecutionJobResponse(BaseModel):
+    id: UUID
+    status: Literal["QUEUED", "RUNNING", "DONE", "FAILED"]
+    attempts: int
+    max_attempts: int
+    next_run_at: Optional[datetime] = None
+    final_verdict: Optional[str] = None  # Hearing verdict once DONE (ALLOWED / BLOCKED / ERROR)
+    last_error: Optional[str] = None
+    hearing_id: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    # Full transcript of the latest attempt, when one has been recorded
+    hearing: Optional[HearingRecord] = None
+
+    class Config:
+        from_attributes = True
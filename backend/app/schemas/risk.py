@@ -0,0 +1,29 @@
+from typing import Optional, Literal
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+
+class RiskLimitUpdate(BaseModel):
+    kind: Literal["GLOBAL_MAX", "ASSET_MAX", "DEFAULT_ASSET_MAX", "HOURLY_MAX", "DAILY_MAX"]
+    asset: Optional[str] = None
+    max_amount: float
+    is_active: bool = True
+
+class RiskLimitResponse(RiskLimitUpdate):
+    id: UUID
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class AllowlistEntryCreate(BaseModel):
+    address: str
+    label: Optional[str] = None
+    user_id: Optional[UUID] = None # None = global allowlist
+
+class AllowlistEntryResponse(AllowlistEntryCreate):
+    id: UUID
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -14,7 +14,8 @@ class TransactionCreate(TransactionBase):
 
 class TransactionResponse(TransactionBase):
     id: UUID
-    tx_hash: str
+    status: str = "CONFIRMED"
+    tx_hash: Optional[str] = None
     created_at: datetime
     
     class Config:
@@ -22,6 +22,9 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     pass
     
+class UserBulkCreate(BaseModel):
+    users: List[UserCreate]
+
 class CexConfigUpdate(BaseModel):
     cex_config: Dict[str, Any]
 
@@ -31,9 +31,9 @@ class AccessControlService:
     This replaces the "sweep" logic with "gate" logic.
     """
     
-    def check_access(self, user_address: str, required_amount: float) -> bool:
+    async def check_access(self, user_address: str, required_amount: float) -> bool:
         """
-        Synchronously checks if a user has enough TST.
+        Checks if a user has enough TST.
         Returns True if Balance >= Required.
         """
         if user_address in MOCK_BYPASS_ADDRESSES:
@@ -41,7 +41,7 @@ class AccessControlService:
             return True
 
         try:
-            balance = wallet_service.get_token_balance(user_address, TST_CONTRACT_ADDRESS, TST_CHAIN)
+            balance = await wallet_service.get_token_balance_cached(user_address, TST_CONTRACT_ADDRESS, TST_CHAIN)
             if balance >= required_amount:
                 # In Phase 1, we might lock the tokens here.
                 # For Phase 0, we just check.
@@ -55,7 +55,7 @@ class AccessControlService:
         """
         Returns the user's tier based on TST holdings.
         """
-        balance = wallet_service.get_token_balance(user_address, TST_CONTRACT_ADDRESS, TST_CHAIN)
+        balance = await wallet_service.get_token_balance_cached(user_address, TST_CONTRACT_ADDRESS, TST_CHAIN)
         
         if balance >= 10000:
             return "INSTITUTIONAL"
@@ -0,0 +1,100 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from app.core.config import settings
+from app.services.singleflight import SingleFlight
+from app.services.ttl_cache import TTLCache
+
+NATIVE = "native"
+
+class BalanceCache:
+    """
+    Shared on-chain balance cache keyed by (network, address, token), each entry tagged
+    with the head block number seen just before it was read.
+
+    An entry is served as long as the network's head hasn't moved past its tag; the head
+    itself is polled at most every `head_ttl_seconds` (about a block time), so repeated
+    reads inside one block cost no RPC at all. Our own broadcasts call invalidate(), which
+    drops the touched addresses and forces a fresh head poll, so a sender never sees its
+    pre-transaction balance once the transaction lands.
+
+    Networks are keyed by RPC endpoint, so "bsc" on mainnet and testnet never mix.
+    Reads return whatever `read` returns and must raise on RPC errors (errors aren't cached).
+    """
+    def __init__(self, head_ttl_seconds: float = 1.0, max_entries: int = 8192):
+        self.head_ttl_seconds = head_ttl_seconds
+        self._heads: Dict[str, Tuple[float, int]] = {}  # network -> (polled_at, block)
+        # (network, address, token) -> (block, value)
+        self._entries = TTLCache(ttl_seconds=3600, max_entries=max_entries)
+        self._head_flight = SingleFlight("block_head")
+        self.reads = SingleFlight("balance_read")
+        self.hits = 0
+        self.misses = 0
+
+    def _network(self, w3) -> str:
+        return getattr(w3.provider, "endpoint_uri", None) or str(id(w3))
+
+    async def head(self, w3) -> int:
+        network = self._network(w3)
+        polled = self._heads.get(network)
+        if polled and time.monotonic() - polled[0] < self.head_ttl_seconds:
+            return polled[1]
+        block = await self._head_flight.do(network, asyncio.to_thread, lambda: w3.eth.block_number)
+        # Load-balanced RPCs can briefly report an older head; never step backwards
+        if polled and polled[1] > block:
+            block = polled[1]
+        self._heads[network] = (time.monotonic(), block)
+        return block
+
+    def lookup(self, w3, address: str, token: str, block: int) -> Optional[Any]:
+        entry = self._entries.get((self._network(w3), address.lower(), token.lower()))
+        if entry is not None and entry[0] >= block:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def store(self, w3, address: str, token: str, block: int, value: Any):
+        network, address, token = self._network(w3), address.lower(), token.lower()
+        self._entries.set((network, address, token), (block, value))
+
+    async def get(self, w3, address: str, token: str, read: Callable[[], Any]) -> Any:
+        """
+        Cached balance; on a miss runs the sync `read` in a worker thread (identical
+        concurrent misses share one read).
+        """
+        block = await self.head(w3)
+        value = self.lookup(w3, address, token, block)
+        if value is not None:
+            return value
+        key: Hashable = (self._network(w3), address.lower(), token.lower(), block)
+        value = await self.reads.do(key, asyncio.to_thread, read)
+        self.store(w3, address, token, block, value)
+        return value
+
+    def invalidate(self, w3, *addresses: str):
+        """
+        Call after broadcasting a transaction that moves funds of `addresses`.
+        """
+        network = self._network(w3)
+        self._heads.pop(network, None)
+        # Derived from the entries themselves (no side index to fall out of sync on eviction);
+        # broadcasts are rare enough that a scan of the bounded cache is cheap
+        touched = {(network, address.lower()) for address in addresses if address}
+        for key in self._entries.keys():
+            if key[:2] in touched:
+                self._entries.pop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0
+        }
+
+balance_cache = BalanceCache(
+    head_ttl_seconds=settings.BALANCE_HEAD_TTL_SECONDS,
+    max_entries=settings.BALANCE_CACHE_MAX_ENTRIES
+)
@@ -1,9 +1,97 @@
+import asyncio
 import httpx
 import time
 import hmac
 import hashlib
 import urllib.parse
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+from app.core.config import settings
+from app.services.singleflight import SingleFlight
+from app.services.ttl_cache import TTLCache
+from app.services.http_client import build_client
+from app.services.price_book import PriceBook
+from app.services.market_stream import BookTop, market_stream
+from app.services.submissions import mark_submitted
+from app.services.weight_scheduler import WeightScheduler, PRIORITY_CRITICAL, PRIORITY_ACCOUNT, PRIORITY_MARKET
+
+# Per-route timeouts (seconds)
+TICKER_TIMEOUT = 5.0
+ACCOUNT_TIMEOUT = 10.0
+WITHDRAW_TIMEOUT = 15.0
+
+# Request weights charged by Binance per route
+TICKER_WEIGHT = 2
+ALL_TICKERS_WEIGHT = 4
+ACCOUNT_WEIGHT = 20
+COIN_CONFIG_WEIGHT = 10
+WITHDRAW_WEIGHT = 1      # SAPI IP weight (withdrawals are mostly UID-weighted)
+SERVER_TIME_WEIGHT = 1
+
+def withdraw_network(chain: str) -> str:
+    """
+    Binance withdrawal network for a Citadel chain name.
+    """
+    if "BSC" in chain or "BINANCE" in chain: return "BSC"
+    if "POLYGON" in chain or "MATIC" in chain: return "MATIC"
+    if "TRON" in chain: return "TRX"
+    if "SOLANA" in chain: return "SOL"
+    return "ETH" # Default
+
+@lru_cache(maxsize=256)
+def _hmac_key(secret: str) -> "hmac.HMAC":
+    # Keyed HMAC state per API secret; signing copies it instead of re-deriving the key
+    return hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+class ServerClock:
+    """
+    Offset between Binance's clock and ours, applied to signed-request timestamps so
+    a drifting local clock doesn't get calls rejected for recvWindow (-1021).
+
+    Synced on first use, then in the background once `resync_seconds` old; callers
+    never wait for a resync after the first. A -1021 forces one (see CexService._request).
+    """
+    def __init__(self, fetch_server_time, resync_seconds: float = 300):
+        self.fetch_server_time = fetch_server_time
+        self.resync_seconds = resync_seconds
+        self.offset_ms = 0
+        self._synced_at: Optional[float] = None
+        self._flight = SingleFlight("server_time")
+        self._resyncing: Optional[asyncio.Task] = None
+        self.syncs = 0
+
+    async def now_ms(self) -> int:
+        if self._synced_at is None:
+            await self.sync()
+        elif time.monotonic() - self._synced_at > self.resync_seconds:
+            if self._resyncing is None or self._resyncing.done():
+                self._resyncing = asyncio.create_task(self.sync())
+        return int(time.time() * 1000) + self.offset_ms
+
+    async def sync(self):
+        await self._flight.do("sync", self._sync)
+
+    async def _sync(self):
+        sent = time.time()
+        try:
+            server_ms = await self.fetch_server_time()
+        except Exception as e:
+            # Keep the old offset; try again after the next interval rather than on every call
+            print(f"⚠️ Binance Clock: Time sync failed: {e}")
+            self._synced_at = time.monotonic()
+            return
+        received = time.time()
+        # Server time was read roughly halfway through the round-trip
+        self.offset_ms = int(server_ms - (sent + received) * 500)
+        self._synced_at = time.monotonic()
+        self.syncs += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "offset_ms": self.offset_ms,
+            "synced_seconds_ago": round(time.monotonic() - self._synced_at, 1) if self._synced_at is not None else None,
+            "syncs": self.syncs
+        }
 
 class CexService:
     """
@@ -12,45 +100,170 @@ class CexService:
     """
     def __init__(self):
         self.base_url = "https://api.binance.com"
-        
+        # Prices are served from one all-symbols snapshot; the per-symbol ticker is
+        # only the fallback for pairs the snapshot doesn't have
+        self.price_book = PriceBook(
+            self._fetch_all_ticker_prices,
+            fresh_seconds=settings.PRICE_BOOK_FRESH_SECONDS,
+            max_stale_seconds=settings.PRICE_BOOK_MAX_STALE_SECONDS
+        )
+        # Concurrent hearings pricing the same pair share one ticker request
+        self._ticker_flight = SingleFlight("ticker")
+        self._client: httpx.AsyncClient = None
+        # Per-account coin/network withdrawal rules (minimums, fees, enabled networks)
+        self._coin_configs = TTLCache(settings.CEX_COIN_CONFIG_TTL_SECONDS, max_entries=256)
+        self._coin_config_flight = SingleFlight("coin_config")
+        # Signed-request timestamps follow Binance's clock
+        self.clock = ServerClock(self._fetch_server_time, resync_seconds=settings.BINANCE_TIME_SYNC_SECONDS)
+        # Separate IP weight budgets for /api and /sapi routes
+        self.api_weights = WeightScheduler(
+            "Binance API", settings.BINANCE_API_WEIGHT_PER_MINUTE, "X-MBX-USED-WEIGHT-1M",
+            reserve_fraction=settings.BINANCE_WEIGHT_RESERVE
+        )
+        self.sapi_weights = WeightScheduler(
+            "Binance SAPI", settings.BINANCE_SAPI_WEIGHT_PER_MINUTE, "X-SAPI-USED-IP-WEIGHT-1M",
+            reserve_fraction=settings.BINANCE_WEIGHT_RESERVE
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Price snapshot, ticker coalescing, coin-config cache, weight budgets and clock sync.
+        """
+        return {
+            "prices": self.price_book.stats(),
+            "ticker": self._ticker_flight.stats(),
+            "coin_config": self._coin_configs.stats(),
+            "binance_weight": {
+                "api": self.api_weights.stats(),
+                "sapi": self.sapi_weights.stats()
+            },
+            "binance_clock": self.clock.stats()
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created on first use so scripts without the app lifespan work too
+        if self._client is None or self._client.is_closed:
+            self._client = build_client(self.base_url)
+        return self._client
 
     def _sign_params(self, params: Dict[str, Any], secret: str) -> str:
         """
         Signs the parameters using HMAC SHA256 as required by Binance.
         """
-        # Sort params 
-        query_string = urllib.parse.urlencode(params)
-        signature = hmac.new(
-            secret.encode("utf-8"),
-            query_string.encode("utf-8"),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+        return self._sign(urllib.parse.urlencode(params), secret)
+
+    def _sign(self, query_string: str, secret: str) -> str:
+        signer = _hmac_key(secret).copy()
+        signer.update(query_string.encode("utf-8"))
+        return signer.hexdigest()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        weight: int,
+        priority: int,
+        params: Optional[Dict[str, Any]] = None,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        timeout: float = TICKER_TIMEOUT
+    ) -> httpx.Response:
+        """
+        Sends a Binance request once its weight is available, queued by priority.
+        Signed requests are timestamped and signed after the wait, so queueing can't
+        push them outside recvWindow. A 429/418 holds the budget until Retry-After and
+        the request is queued again (up to BINANCE_RATE_LIMIT_RETRIES times).
+        """
+        scheduler = self.sapi_weights if path.startswith("/sapi/") else self.api_weights
+        attempt = 0
+        resynced = False
+        while True:
+            await scheduler.acquire(weight, priority)
+            url, request_params = path, params
+            headers = {}
+            if api_key:
+                headers["X-MBX-APIKEY"] = api_key
+            if api_secret:
+                # Encoded once: the signature covers exactly the query that is sent
+                query = urllib.parse.urlencode({**(params or {}), "timestamp": await self.clock.now_ms()})
+                url, request_params = f"{path}?{query}&signature={self._sign(query, api_secret)}", None
+
+            res = await self.client.request(method, url, params=request_params, headers=headers, timeout=timeout)
+            scheduler.observe(res.status_code, res.headers)
+            if api_secret and res.status_code == 400 and not resynced and '"code":-1021' in res.text.replace(" ", ""):
+                # Timestamp outside recvWindow: our clock moved since the last sync
+                resynced = True
+                await self.clock.sync()
+                continue
+            if res.status_code not in (429, 418) or attempt >= settings.BINANCE_RATE_LIMIT_RETRIES:
+                return res
+            attempt += 1
+
+    async def _fetch_server_time(self) -> int:
+        res = await self._request("GET", "/api/v3/time", SERVER_TIME_WEIGHT, PRIORITY_CRITICAL)
+        res.raise_for_status()
+        return int(res.json()["serverTime"])
 
     async def get_market_price(self, symbol: str) -> float:
         """
         Get public market price for risk calc.
         """
+        price, _ = await self.get_market_quote(symbol)
+        return price
+
+    async def get_market_quote(self, symbol: str) -> Tuple[float, Optional[float]]:
+        """
+        (price, age in seconds of the data it came from).
+        Age is None when the price is a fallback rather than market data.
+        """
         # MOCK FOR TST PROTOCOL
         if "TST" in symbol:
-            return 1.337
+            return 1.337, 0.0
             
         try:
-            # Ensure correct format for Binance API (ETHUSDT not ETH/USDT)
-            clean_symbol = symbol.replace("/", "").upper()
-            if "USDT" not in clean_symbol:
-                 clean_symbol += "USDT"
-                 
-            async with httpx.AsyncClient() as client:
-                 # No key needed for public price
-                 res = await client.get(f"https://api.binance.com/api/v3/ticker/price?symbol={clean_symbol}")
-                 data = res.json()
-                 return float(data['price'])
+            clean_symbol = self._clean_symbol(symbol)
+
+            # Streamed top of book first (no I/O), then the ticker snapshot
+            top = market_stream.top(clean_symbol)
+            if top is not None:
+                return top.mid, time.monotonic() - top.received_at
+
+            quote = await self.price_book.quote(clean_symbol)
+            if quote is not None:
+                return quote
+            price = await self._ticker_flight.do(clean_symbol, self._fetch_ticker_price, clean_symbol)
+            return price, 0.0
         except Exception as e:
             # Fallback for demo
             import random
-            if "ETH" in symbol: return 2500.0 * random.uniform(0.99, 1.01)
-            return 0.0
+            if "ETH" in symbol: return 2500.0 * random.uniform(0.99, 1.01), None
+            return 0.0, None
+
+    def get_book_top(self, symbol: str) -> Optional[BookTop]:
+        """
+        Streamed best bid/ask for a pair, or None if it isn't streamed (or the stream is stale).
+        """
+        return market_stream.top(self._clean_symbol(symbol))
+
+    def _clean_symbol(self, symbol: str) -> str:
+        # Ensure correct format for Binance API (ETHUSDT not ETH/USDT)
+        clean_symbol = symbol.replace("/", "").upper()
+        if "USDT" not in clean_symbol:
+             clean_symbol += "USDT"
+        return clean_symbol
+
+    async def _fetch_ticker_price(self, clean_symbol: str) -> float:
+        # No key needed for public price
+        res = await self._request("GET", "/api/v3/ticker/price", TICKER_WEIGHT, PRIORITY_MARKET, params={"symbol": clean_symbol})
+        data = res.json()
+        return float(data['price'])
+
+    async def _fetch_all_ticker_prices(self) -> Dict[str, float]:
+        # Without a symbol the ticker returns every pair in one response
+        res = await self._request("GET", "/api/v3/ticker/price", ALL_TICKERS_WEIGHT, PRIORITY_MARKET)
+        res.raise_for_status()
+        return {t["symbol"]: float(t["price"]) for t in res.json()}
 
     async def get_user_balance(self, exchange_id: str, api_key: str, api_secret: str) -> Dict[str, float]:
         """
@@ -64,30 +277,14 @@ class CexService:
         if exchange_id.lower() != "binance":
              return {"BTC": 0.5, "USDT": 100.0}
 
-        endpoint = "/api/v3/account"
-        
-        # 1. Prepare Parameters
-        timestamp = int(time.time() * 1000)
-        params = {
-            "timestamp": timestamp,
-            "recvWindow": 5000
-        }
-        
-        # 2. Sign
-        signature = self._sign_params(params, api_secret)
-        params["signature"] = signature
-        
-        headers = {
-            "X-MBX-APIKEY": api_key
-        }
-        
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.base_url}{endpoint}", 
-                    params=params, 
-                    headers=headers
-                )
+            response = await self._request(
+                "GET", "/api/v3/account", ACCOUNT_WEIGHT, PRIORITY_ACCOUNT,
+                params={"recvWindow": 5000},
+                api_key=api_key,
+                api_secret=api_secret,
+                timeout=ACCOUNT_TIMEOUT
+            )
                 
             if response.status_code != 200:
                 print(f"⚠️ Binance API Error: {response.text}")
@@ -96,7 +293,7 @@ class CexService:
             data = response.json()
             balances = data.get("balances", [])
             
-            # 3. Filter & Format
+            # Filter & Format
             holdings = {}
             for b in balances:
                 free = float(b.get("free", 0))
@@ -121,48 +318,87 @@ class CexService:
             return f"tx_evac_{random.randint(100000, 999999)}_{token.lower()}"
 
         print(f"🚨 EXECUTING REAL WITHDRAWAL: {amount} {token} -> {address}")
+        # A timeout below doesn't mean Binance didn't process it
+        mark_submitted("cex_withdrawal")
         
-        # 1. Map Network
-        network = "ETH" # Default
-        if "BSC" in chain or "BINANCE" in chain: network = "BSC"
-        elif "POLYGON" in chain or "MATIC" in chain: network = "MATIC"
-        elif "TRON" in chain: network = "TRX"
-        elif "SOLANA" in chain: network = "SOL"
-        
-        # 2. Prepare Request
-        endpoint = "/sapi/v1/capital/withdraw/apply"
-        timestamp = int(time.time() * 1000)
-        
+        # 1. Prepare Request
         params = {
             "coin": token,
             "address": address,
             "amount": amount,
-            "network": network,
-            "timestamp": timestamp,
+            "network": withdraw_network(chain),
             "recvWindow": 10000
         }
         
-        # 3. Sign
-        signature = self._sign_params(params, api_secret)
-        params["signature"] = signature
+        # 2. Sign & Execute (ahead of any queued balance / price calls)
+        res = await self._request(
+            "POST", "/sapi/v1/capital/withdraw/apply", WITHDRAW_WEIGHT, PRIORITY_CRITICAL,
+            params=params,
+            api_key=api_key,
+            api_secret=api_secret,
+            timeout=WITHDRAW_TIMEOUT
+        )
         
-        headers = { "X-MBX-APIKEY": api_key }
-        
-        # 4. Execute
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            res = await client.post(f"{self.base_url}{endpoint}", params=params, headers=headers)
-            
-            if res.status_code == 200:
-                data = res.json()
-                # Binance returns {"id": "string_uuid"}
-                return data.get("id")
-            else:
-                err_msg = res.text
-                print(f"❌ Binance Withdraw Error: {err_msg}")
-                # Fallback Exception for flow control
-                raise Exception(f"Binance Withdrawal Failed: {err_msg}")
+        if res.status_code == 200:
+            data = res.json()
+            # Binance returns {"id": "string_uuid"}
+            return data.get("id")
+        else:
+            err_msg = res.text
+            print(f"❌ Binance Withdraw Error: {err_msg}")
+            # Fallback Exception for flow control
+            raise Exception(f"Binance Withdrawal Failed: {err_msg}")
     
+    async def get_coin_config(self, api_key: str, api_secret: str) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Withdrawal rules for the account: coin -> network -> {"enabled", "min", "max", "fee", "multiple"}.
+        Cached per API key for CEX_COIN_CONFIG_TTL_SECONDS. Empty (nothing known) in simulation
+        or if Binance can't be reached, so callers fall back to letting Binance decide.
+        """
+        if api_key in ("SIMULATION", "MOCK_KEY") or not api_secret:
+            return {}
+        config = self._coin_configs.get(api_key)
+        if config is not None:
+            return config
+        config = await self._coin_config_flight.do(api_key, self._fetch_coin_config, api_key, api_secret)
+        if config:
+            self._coin_configs.set(api_key, config)
+        return config
+
+    async def _fetch_coin_config(self, api_key: str, api_secret: str) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        try:
+            res = await self._request(
+                "GET", "/sapi/v1/capital/config/getall", COIN_CONFIG_WEIGHT, PRIORITY_CRITICAL,
+                api_key=api_key,
+                api_secret=api_secret,
+                timeout=ACCOUNT_TIMEOUT
+            )
+            if res.status_code != 200:
+                print(f"⚠️ Binance Coin Config Error: {res.text}")
+                return {}
+            return {
+                coin["coin"]: {
+                    n["network"]: {
+                        "enabled": bool(n.get("withdrawEnable")),
+                        "min": float(n.get("withdrawMin") or 0),
+                        "max": float(n.get("withdrawMax") or 0),
+                        "fee": float(n.get("withdrawFee") or 0),
+                        "multiple": n.get("withdrawIntegerMultiple") or "0"
+                    }
+                    for n in coin.get("networkList", [])
+                }
+                for coin in res.json()
+            }
+        except Exception as e:
+            print(f"⚠️ CexService Coin Config Error: {e}")
+            return {}
+
     async def close(self):
-        pass
+        """
+        Closes the pooled Binance connections (app shutdown).
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
 cex_service = CexService()
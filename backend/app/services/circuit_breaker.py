@@ -0,0 +1,101 @@
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+class CircuitBreaker:
+    """
+    Per-provider breaker over a rolling window of recent calls.
+
+    A call is "bad" if it errored/timed out or took longer than `slow_call_seconds`.
+    Once at least `min_calls` are recorded and the bad rate reaches `failure_rate`,
+    the breaker OPENs and callers skip the provider for `cooldown_seconds`.
+    After that a single probe is let through (HALF_OPEN): success closes it, failure re-opens it.
+    """
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        cooldown_seconds: float = 30.0
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.cooldown_seconds = cooldown_seconds
+
+        self._calls: deque = deque(maxlen=window)  # (ok, latency_seconds)
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.cooldown_seconds:
+                return False
+            self.state = self.HALF_OPEN
+        # HALF_OPEN: one probe at a time
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record(self, ok: bool, latency: float):
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = False
+            if ok and latency < self.slow_call_seconds:
+                print(f"✅ Circuit '{self.name}': probe succeeded, closing.")
+                self.state = self.CLOSED
+                self._calls.clear()
+                self._calls.append((ok, latency))
+            else:
+                self._trip()
+            return
+
+        self._calls.append((ok, latency))
+        if self.state == self.CLOSED and len(self._calls) >= self.min_calls:
+            bad = sum(1 for call_ok, call_latency in self._calls
+                      if not call_ok or call_latency >= self.slow_call_seconds)
+            if bad / len(self._calls) >= self.failure_rate:
+                self._trip()
+
+    def release(self):
+        """
+        The caller abandoned its call (e.g. lost a hedge race). Not the provider's fault.
+        """
+        self._probe_in_flight = False
+
+    def p95(self) -> Optional[float]:
+        """
+        95th percentile latency of recent successful calls, None until `min_calls` are known.
+        """
+        latencies = sorted(latency for ok, latency in self._calls if ok)
+        if len(latencies) < self.min_calls:
+            return None
+        return latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+
+    def _trip(self):
+        if self.state != self.OPEN:
+            print(f"🔌 Circuit '{self.name}': OPEN for {self.cooldown_seconds:.0f}s")
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        total = len(self._calls)
+        errors = sum(1 for ok, _ in self._calls if not ok)
+        p95 = self.p95()
+        return {
+            "state": self.state,
+            "recent_calls": total,
+            "error_rate": (errors / total) if total else 0.0,
+            "p95_seconds": round(p95, 3) if p95 is not None else None
+        }
@@ -0,0 +1,102 @@
+import asyncio
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Tuple
+from app.core.config import settings
+from app.services.cex_service import cex_service, withdraw_network
+
+class EvacuationPlanner:
+    """
+    Emergency CEX evacuation (CEX_WITHDRAWAL_BATCH).
+
+    Checks every asset against the account's cached coin/network rules first, so
+    withdrawals Binance would reject (network disabled, below minimum, not above the
+    fee) are reported without a round-trip. The rest are submitted concurrently;
+    each still goes through CexService's weight scheduler at critical priority.
+    """
+    def __init__(self, concurrency: int = 8):
+        self.concurrency = concurrency
+
+    def plan(self, assets: List[Tuple[str, float]], network: str, config: Dict[str, Dict[str, Dict[str, Any]]]) -> Tuple[List[Tuple[str, float]], List[str]]:
+        """
+        Splits (asset, amount) pairs into withdrawals to submit and log lines for the ones dropped.
+        Amounts are rounded down to the network's withdrawal multiple and capped at its maximum.
+        With no config (simulation, or Binance unreachable) everything is submitted as-is.
+        """
+        if not config:
+            return list(assets), []
+
+        valid, logs = [], []
+        for asset, amount in assets:
+            rules = config.get(asset, {}).get(network)
+            if rules is None:
+                logs.append(f"❌ NOT SUPPORTED: {asset} cannot be withdrawn on {network}.")
+                continue
+            if not rules["enabled"]:
+                logs.append(f"❌ SUSPENDED: {asset} withdrawals on {network} are currently disabled.")
+                continue
+
+            amount = self._round_down(amount, rules["multiple"])
+            if rules["max"] and amount > rules["max"]:
+                logs.append(f"⚠️ {asset}: capped at the {rules['max']} per-withdrawal maximum.")
+                amount = rules["max"]
+            if amount < rules["min"] or amount <= rules["fee"]:
+                logs.append(f"❌ MINIMUM LIMIT: {asset} ({amount}) is below the {rules['min']} minimum "
+                            f"(fee {rules['fee']}) on {network}.")
+                continue
+            valid.append((asset, amount))
+        return valid, logs
+
+    def _round_down(self, amount: float, multiple: str) -> float:
+        try:
+            step = Decimal(str(multiple))
+        except InvalidOperation:
+            return amount
+        if step <= 0:
+            return amount
+        return float((Decimal(str(amount)) // step) * step)
+
+    async def evacuate(self, api_key: str, api_secret: str, assets: List[Tuple[str, float]], address: str, chain: str) -> Tuple[List[str], List[str]]:
+        """
+        Withdraws every evacuable asset to `address`. Returns (withdrawal ids, logs).
+        """
+        network = withdraw_network(chain)
+        config = await cex_service.get_coin_config(api_key, api_secret)
+        valid, logs = self.plan(assets, network, config)
+        planned = {asset for asset, _ in valid}
+        for asset, _ in assets:
+            if asset not in planned:
+                logs.append(f"🔄 Queuing Manual Intervention for {asset}")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def withdraw(asset: str, amount: float) -> str:
+            async with semaphore:
+                return await cex_service.withdraw_to_chain(
+                    exchange_id="binance",
+                    api_key=api_key,
+                    api_secret=api_secret,
+                    token=asset,
+                    amount=amount,
+                    address=address,
+                    chain=chain
+                )
+
+        for asset, amount in valid:
+            logs.append(f"Evacuating {amount} {asset}...")
+        results = await asyncio.gather(*(withdraw(asset, amount) for asset, amount in valid), return_exceptions=True)
+
+        evac_hashes = []
+        for (asset, amount), result in zip(valid, results):
+            if isinstance(result, Exception):
+                err_msg = str(result)
+                if "-4022" in err_msg or "minimum" in err_msg.lower():
+                    logs.append(f"❌ MINIMUM LIMIT: {asset} ({amount}) is too small to withdraw.")
+                else:
+                    logs.append(f"❌ Failed to evacuate {asset}: {result}")
+                logs.append(f"🔄 Queuing Manual Intervention for {asset}")
+            else:
+                evac_hashes.append(result)
+                logs.append(f"✅ {asset} Evacuated. Tx: {result}")
+        return evac_hashes, logs
+
+evacuation_planner = EvacuationPlanner(concurrency=settings.CEX_EVACUATION_CONCURRENCY)
@@ -0,0 +1,291 @@
+import asyncio
+import ipaddress
+import os
+import random
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.job import ExecutionJob
+from app.services.hearing_store import persist_hearing
+from app.services.http_client import build_client
+from app.services.submissions import tracking_submissions
+
+CALLBACK_TIMEOUT = 5.0
+
+class CallbackURLError(ValueError):
+    pass
+
+async def check_callback_url(url: str):
+    """
+    Raises CallbackURLError unless `url` is https and its host is on
+    EXECUTION_CALLBACK_ALLOWED_HOSTS or resolves only to public addresses, so a
+    callback can't be pointed at internal services or the cloud metadata endpoint.
+    """
+    parts = urlsplit(url)
+    if parts.scheme != "https" or not parts.hostname:
+        raise CallbackURLError("callback_url must be an https:// URL")
+    host = parts.hostname.lower()
+    allowed = {h.strip().lower() for h in settings.EXECUTION_CALLBACK_ALLOWED_HOSTS.split(",") if h.strip()}
+    if host in allowed:
+        return
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, parts.port or 443)
+    except (OSError, UnicodeError):
+        raise CallbackURLError(f"callback_url host {host} does not resolve")
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if not address.is_global:
+            raise CallbackURLError(f"callback_url host {host} is not a public address")
+
+class ExecutionQueue:
+    """
+    Durable queue for execute=True hearings, backed by the execution_jobs table.
+
+    /hearing/gate enqueues and returns 202; workers (in the API process or in
+    execution_worker.py) claim jobs with FOR UPDATE SKIP LOCKED, run the hearing,
+    and retry with exponential backoff.
+
+    Only failures raised before anything was submitted (a tx broadcast or a CEX
+    withdrawal, see app.services.submissions) are retried; anything after that is
+    FAILED for manual review. A job whose worker died mid-execution is marked FAILED
+    rather than re-run, since a tx may already be on-chain.
+
+    callback_url is validated on enqueue (check_callback_url) and again before each POST.
+    """
+    def __init__(self, poll_seconds: float = 2.0, max_attempts: int = 3,
+                 retry_base_seconds: float = 5.0, lease_seconds: int = 600):
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.lease_seconds = lease_seconds
+
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._arena = None
+        self._workers = []
+        self._stopping = False
+        self._wake = asyncio.Event()
+        self._last_reap = 0.0
+        self._client: httpx.AsyncClient = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Shared across callbacks; created on first use
+        if self._client is None or self._client.is_closed:
+            self._client = build_client(timeout=CALLBACK_TIMEOUT)
+        return self._client
+
+    async def enqueue(self, db: AsyncSession, user_id: str, intent: str,
+                      callback_url: Optional[str] = None) -> ExecutionJob:
+        """
+        Raises CallbackURLError for a callback_url that isn't https to a public / allowed host.
+        """
+        if callback_url:
+            await check_callback_url(callback_url)
+        job = ExecutionJob(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            intent=intent,
+            callback_url=callback_url,
+            status="QUEUED",
+            attempts=0,
+            max_attempts=self.max_attempts,
+            next_run_at=datetime.now(timezone.utc)
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        # Local workers pick it up now instead of on their next poll
+        self._wake.set()
+        return job
+
+    def start(self, workers: int):
+        if workers <= 0 or self._workers:
+            return
+        from app.entities.arena import Arena
+        self._arena = Arena()
+        self._stopping = False
+        for n in range(workers):
+            self._workers.append(asyncio.create_task(self._worker(f"{self.worker_prefix}:{n}")))
+        print(f"⚙️ Execution Queue: {workers} worker(s) started")
+
+    async def stop(self, grace_seconds: float = 30.0):
+        """
+        Lets in-progress jobs finish (up to `grace_seconds`), then cancels the workers.
+        """
+        if not self._workers:
+            return
+        self._stopping = True
+        self._wake.set()
+        done, pending = await asyncio.wait(self._workers, timeout=grace_seconds)
+        for task in pending:
+            task.cancel()
+        self._workers = []
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        print("⚙️ Execution Queue: workers stopped")
+
+    async def _worker(self, worker_id: str):
+        failures = 0
+        while not self._stopping:
+            try:
+                await self._reap_stale()
+                job = await self._claim(worker_id)
+                failures = 0
+            except Exception as e:
+                failures += 1
+                # Back off while the DB is unavailable instead of spamming every poll
+                delay = min(60.0, self.poll_seconds * 2 ** failures)
+                if failures == 1 or failures % 10 == 0:
+                    print(f"⚠️ Execution Queue: {worker_id} poll failed: {e}. Retrying in {delay:.0f}s.")
+                await asyncio.sleep(delay)
+                continue
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                continue
+
+            await self._run(job)
+
+    async def _claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        async with AsyncSessionLocal() as db:
+            now = datetime.now(timezone.utc)
+            result = await db.execute(
+                select(ExecutionJob)
+                .where(ExecutionJob.status == "QUEUED", ExecutionJob.next_run_at <= now)
+                .order_by(ExecutionJob.next_run_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            job = result.scalars().first()
+            if job is None:
+                return None
+
+            job.status = "RUNNING"
+            job.attempts += 1
+            job.locked_by = worker_id
+            job.locked_at = now
+            snapshot = {
+                "id": job.id, "user_id": job.user_id, "intent": job.intent,
+                "attempts": job.attempts, "max_attempts": job.max_attempts,
+                "callback_url": job.callback_url
+            }
+            await db.commit()
+
+        await self._notify(snapshot, "RUNNING")
+        return snapshot
+
+    async def _run(self, job: Dict[str, Any]):
+        print(f"⚙️ Execution Queue: job {job['id']} attempt {job['attempts']}/{job['max_attempts']}")
+        record = None
+        error = None
+        with tracking_submissions() as submissions:
+            try:
+                record = await self._arena.conduct_hearing(user_id=job["user_id"], intent=job["intent"], execute=True)
+            except Exception as e:
+                error = str(e)
+
+        if record is not None:
+            # The audit trail keeps every attempt; a failed write doesn't change the job outcome
+            try:
+                async with AsyncSessionLocal() as db:
+                    await persist_hearing(db, record, job["user_id"])
+            except Exception as e:
+                print(f"⚠️ Execution Queue: Could not persist hearing {record.id}: {e}")
+            if record.final_verdict == "ERROR":
+                error = record.final_reason
+
+        # A send may have gone through even though we saw an error (e.g. a read timeout)
+        submitted = submissions.submitted or bool(record and record.execution and record.execution.submitted)
+        if error is not None and submitted:
+            error = f"{error} (failed after a {submissions.first or 'submission'}; check the ledger and chain before resubmitting)"
+        values = {
+            "locked_by": None,
+            "locked_at": None,
+            "hearing_id": uuid.UUID(record.id) if record else None,
+            "final_verdict": record.final_verdict if record else None,
+            "last_error": error
+        }
+        if error is None:
+            values["status"] = "DONE"
+        elif not submitted and job["attempts"] < job["max_attempts"]:
+            delay = self.retry_base_seconds * 2 ** (job["attempts"] - 1) * random.uniform(0.8, 1.2)
+            values["status"] = "QUEUED"
+            values["next_run_at"] = datetime.now(timezone.utc) + timedelta(seconds=delay)
+            print(f"🔁 Execution Queue: job {job['id']} retrying in {delay:.1f}s ({error})")
+        else:
+            values["status"] = "FAILED"
+
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(update(ExecutionJob).where(ExecutionJob.id == job["id"]).values(**values))
+                await db.commit()
+        except Exception as e:
+            # Stays RUNNING and gets reaped as FAILED once the lease expires
+            print(f"❌ Execution Queue: Could not record outcome of job {job['id']}: {e}")
+            return
+
+        await self._notify(job, values["status"], values)
+
+    async def _reap_stale(self):
+        """
+        RUNNING past its lease means the worker died mid-hearing. Fail it loudly instead of re-running it.
+        """
+        # Checked a few times per lease, not on every poll
+        if time.monotonic() - self._last_reap < self.lease_seconds / 10:
+            return
+        self._last_reap = time.monotonic()
+
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.lease_seconds)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(ExecutionJob)
+                .where(ExecutionJob.status == "RUNNING", ExecutionJob.locked_at < cutoff)
+                .values(
+                    status="FAILED",
+                    locked_by=None,
+                    last_error="Worker lost mid-execution. Check the ledger before resubmitting."
+                )
+            )
+            await db.commit()
+            if result.rowcount:
+                print(f"⚠️ Execution Queue: Failed {result.rowcount} stale job(s)")
+
+    async def _notify(self, job: Dict[str, Any], status: str, values: Optional[Dict[str, Any]] = None):
+        """
+        Push notification: POSTs the new status to the job's callback_url, if it has one.
+        """
+        if not job.get("callback_url"):
+            return
+        payload = {"job_id": str(job["id"]), "status": status, "attempts": job["attempts"]}
+        if values:
+            payload.update({
+                "final_verdict": values.get("final_verdict"),
+                "hearing_id": str(values["hearing_id"]) if values.get("hearing_id") else None,
+                "last_error": values.get("last_error")
+            })
+        try:
+            # Re-checked at send time: the host's DNS may have changed since enqueue
+            await check_callback_url(job["callback_url"])
+            await self.client.post(job["callback_url"], json=payload)
+        except Exception as e:
+            print(f"⚠️ Execution Queue: Callback for job {job['id']} failed: {e}")
+
+execution_queue = ExecutionQueue(
+    poll_seconds=settings.EXECUTION_POLL_SECONDS,
+    max_attempts=settings.EXECUTION_MAX_ATTEMPTS,
+    retry_base_seconds=settings.EXECUTION_RETRY_BASE_SECONDS,
+    lease_seconds=settings.EXECUTION_JOB_LEASE_SECONDS
+)
@@ -0,0 +1,207 @@
+import asyncio
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.hearing import HearingRecordModel
+from app.schemas.hearing import HearingRecord
+
+# What list views select: everything but the stage outputs
+HEARING_SUMMARY_COLUMNS = (
+    HearingRecordModel.id,
+    HearingRecordModel.user_id,
+    HearingRecordModel.intent,
+    HearingRecordModel.started_at,
+    HearingRecordModel.final_verdict,
+    HearingRecordModel.final_reason,
+    HearingRecordModel.action_type,
+    HearingRecordModel.tx_hash,
+    HearingRecordModel.highlight,
+)
+
+def _highlight(record: HearingRecord) -> Optional[str]:
+    """
+    The spread / profit line of the first plan (or an arb tx note), shown in activity feeds.
+    """
+    if record.strategy and record.strategy.feasible_options:
+        steps = record.strategy.feasible_options[0].steps
+        spread = next((s for s in steps if "Spread:" in s), None)
+        profit = next((s for s in steps if "Profit" in s), None)
+        if spread or profit:
+            return spread or profit
+    if record.execution and record.execution.tx_hash and "Arb Profit" in record.execution.tx_hash:
+        return record.execution.tx_hash
+    return None
+
+def hearing_row(record: HearingRecord, user_id: str, **overrides) -> Dict[str, Any]:
+    """
+    Column values for a hearing_records row.
+    """
+    # Rows belong to the resolved User UUID, not the raw subject (which may be a wallet
+    # address), so per-user state rebuilt from this table matches what RiskEntity reads
+    if record.memory and record.memory.user_id:
+        user_id = record.memory.user_id
+
+    # Note: In a real app, ensure user_id is a valid UUID before casting
+    try:
+        u_id = uuid.UUID(str(user_id))
+    except ValueError:
+         # Fallback for dev if user uses non-uuid strings
+        u_id = uuid.uuid4()
+
+    action_type = None
+    if record.strategy and 0 <= record.strategy.selected_option_index < len(record.strategy.feasible_options):
+        action_type = record.strategy.feasible_options[record.strategy.selected_option_index].action_type
+
+    # Stage outputs go to their own columns; mode='json' serializes datetimes to strings
+    stages = record.model_dump(mode='json', include={"perception", "memory", "risk", "strategy", "execution"})
+
+    row = {
+        "id": uuid.UUID(record.id),
+        "user_id": u_id,
+        "intent": record.intent,
+        "started_at": record.started_at,
+        **stages,
+        "transcript": None,
+        "final_verdict": record.final_verdict,
+        "final_reason": record.final_reason,
+        "action_type": action_type,
+        "tx_hash": record.execution.tx_hash if record.execution else None,
+        "highlight": _highlight(record)
+    }
+    row.update(overrides)
+    return row
+
+async def persist_hearing(db: AsyncSession, record: HearingRecord, user_id: str):
+    """
+    Writes a finished HearingRecord to hearing_records and waits for the commit.
+    Use for hearings other rows point at (executions); dry runs go through hearing_writer.
+    """
+    db.add(HearingRecordModel(**hearing_row(record, user_id)))
+    await db.commit()
+
+_ROW_COLUMNS = tuple(HearingRecordModel.__table__.columns.keys())
+
+class HearingWriter:
+    """
+    Write-behind buffer for hearing_records.
+
+    submit() returns immediately; a background task flushes the buffer as multi-row
+    INSERTs when it reaches `batch_size` or every `flush_seconds`, and once more on stop().
+    A failed flush puts the rows back and retries on the next tick; past `max_buffer`
+    the oldest rows are dropped (and logged) so a DB outage can't exhaust memory.
+    Only no-op audit and heartbeat rows are ever dropped: rows for a hearing that reached
+    execution, or that record a broadcast (`durable=True`), stay buffered until written.
+    """
+    def __init__(self, batch_size: int = 100, flush_seconds: float = 1.0, max_buffer: int = 10000):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_buffer = max_buffer
+
+        self._buffer: List[Tuple[Dict[str, Any], bool]] = []  # (row, durable)
+        self._full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+
+    def submit(self, record: HearingRecord, user_id: str, **overrides):
+        self.submit_row(hearing_row(record, user_id, **overrides), durable=record.execution is not None)
+
+    def submit_row(self, row: Dict[str, Any], durable: bool = False):
+        """
+        Buffers a raw hearing_records row (for log-style entries that aren't a full HearingRecord).
+        Pass durable=True for rows that record funds moving (e.g. a gas top-up broadcast).
+        """
+        # A multi-row INSERT needs the same keys in every row
+        self._buffer.append(({column: row.get(column) for column in _ROW_COLUMNS}, durable))
+        if len(self._buffer) > self.max_buffer:
+            self._evict()
+        if len(self._buffer) >= self.batch_size:
+            self._full.set()
+        # Scripts that never called start() still get their records written
+        if self._task is None:
+            self.start()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stops the background flusher and writes whatever is still buffered.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._buffer:
+            print(f"❌ Hearing Writer: {len(self._buffer)} record(s) could not be written on shutdown")
+            for row, durable in self._buffer:
+                if durable:
+                    print(f"❌ Hearing Writer: Lost execution record {row['id']} ({row['intent']}, tx {row['tx_hash']})")
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            await self.flush()
+
+    def _evict(self):
+        """
+        Drops the oldest non-durable rows until the buffer fits in `max_buffer` again.
+        """
+        overflow = len(self._buffer) - self.max_buffer
+        kept = []
+        for entry in self._buffer:
+            if overflow > 0 and not entry[1]:
+                overflow -= 1
+                self.dropped += 1
+                continue
+            kept.append(entry)
+        dropped = len(self._buffer) - len(kept)
+        self._buffer = kept
+        if dropped:
+            print(f"⚠️ Hearing Writer: Buffer full, dropped {dropped} oldest audit record(s)")
+        if overflow > 0:
+            print(f"⚠️ Hearing Writer: {len(self._buffer)} record(s) buffered, over the {self.max_buffer} limit "
+                  f"(execution records are never dropped)")
+
+    async def flush(self):
+        async with self._flush_lock:
+            while self._buffer:
+                batch = self._buffer[:self.batch_size]
+                del self._buffer[:len(batch)]
+                try:
+                    async with AsyncSessionLocal() as db:
+                        # One INSERT ... VALUES (...), (...), ... per batch
+                        await db.execute(insert(HearingRecordModel).values([row for row, _ in batch]))
+                        await db.commit()
+                    self.written += len(batch)
+                except Exception as e:
+                    print(f"⚠️ Hearing Writer: Flush of {len(batch)} record(s) failed: {e}. Will retry.")
+                    self._buffer[:0] = batch
+                    return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buffered": len(self._buffer),
+            "durable_buffered": sum(1 for _, durable in self._buffer if durable),
+            "written": self.written,
+            "dropped": self.dropped
+        }
+
+hearing_writer = HearingWriter(
+    batch_size=settings.HEARING_WRITER_BATCH_SIZE,
+    flush_seconds=settings.HEARING_WRITER_FLUSH_SECONDS,
+    max_buffer=settings.HEARING_WRITER_MAX_BUFFER
+)
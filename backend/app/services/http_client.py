@@ -0,0 +1,26 @@
+import httpx
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401  (installed by httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+    print("⚠️ HTTP: h2 not installed, upstream clients fall back to HTTP/1.1 keep-alive")
+
+def build_client(base_url: str = "", timeout: float = 10.0) -> httpx.AsyncClient:
+    """
+    Long-lived pooled client for one upstream: keep-alive connections (and HTTP/2 when
+    available) are reused across requests instead of a TCP+TLS handshake per call.
+    `timeout` is the default; pass timeout= per request for routes that need another.
+    """
+    return httpx.AsyncClient(
+        base_url=base_url,
+        http2=HTTP2_AVAILABLE,
+        timeout=httpx.Timeout(timeout, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS
+        )
+    )
@@ -0,0 +1,126 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional, Tuple
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.idempotency import IdempotencyKey
+
+class IdempotencyStore:
+    """
+    Idempotency-Key support for mutating endpoints.
+
+    The first request with a key claims it (IN_PROGRESS) and its response is stored;
+    replays with the same key and body get that response back without re-running.
+    A different body under the same key is rejected (422), and a replay while the
+    first request is still running gets 409.
+
+    Keys are claimed in their own session/commit so concurrent retries see each other
+    regardless of the endpoint's transaction.
+    """
+    def __init__(self, ttl_hours: int = 24):
+        self.ttl = timedelta(hours=ttl_hours)
+
+    def fingerprint(self, payload: Any) -> str:
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    async def run(
+        self,
+        scope: str,
+        key: str,
+        payload: Any,
+        handler: Callable[[], Awaitable[Tuple[int, Any]]],
+        cache_errors: bool = False
+    ) -> JSONResponse:
+        """
+        Runs `handler` (returning (status_code, json_body)) at most once per (scope, key).
+
+        Client errors (4xx) release the key so a corrected retry can run. With cache_errors,
+        server errors are stored like successes: use it where a failure may already have had
+        side effects (e.g. a broadcast), so a retry can't repeat them.
+        """
+        fingerprint = self.fingerprint(payload)
+        replay = await self._claim(scope, key, fingerprint)
+        if replay is not None:
+            return replay
+
+        try:
+            status_code, body = await handler()
+        except HTTPException as e:
+            if e.status_code >= 500 and cache_errors:
+                await self._complete(scope, key, e.status_code, {"detail": e.detail})
+            else:
+                await self._release(scope, key)
+            raise
+        except Exception as e:
+            if cache_errors:
+                await self._complete(scope, key, 500, {"detail": str(e)})
+            else:
+                await self._release(scope, key)
+            raise
+
+        await self._complete(scope, key, status_code, body)
+        return JSONResponse(status_code=status_code, content=body)
+
+    async def _claim(self, scope: str, key: str, fingerprint: str) -> Optional[JSONResponse]:
+        now = datetime.now(timezone.utc)
+        async with AsyncSessionLocal() as db:
+            # Expired keys are free to reuse
+            await db.execute(
+                delete(IdempotencyKey)
+                .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key, IdempotencyKey.expires_at < now)
+            )
+            result = await db.execute(
+                insert(IdempotencyKey)
+                .values(scope=scope, key=key, fingerprint=fingerprint, status="IN_PROGRESS", expires_at=now + self.ttl)
+                .on_conflict_do_nothing(index_elements=["scope", "key"])
+            )
+            await db.commit()
+            if result.rowcount:
+                return None
+
+            existing = await db.get(IdempotencyKey, (scope, key))
+
+        if existing is None:
+            # Released between our insert and read; let the client retry
+            raise HTTPException(status_code=409, detail="Request with this Idempotency-Key is being retried. Try again.")
+        if existing.fingerprint != fingerprint:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request body.")
+        if existing.status != "COMPLETED":
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress.")
+
+        print(f"♻️ Idempotency: Replaying {scope} response for key {key}")
+        return JSONResponse(
+            status_code=existing.response_status,
+            content=existing.response_body,
+            headers={"Idempotent-Replayed": "true"}
+        )
+
+    async def _complete(self, scope: str, key: str, status_code: int, body: Any):
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(IdempotencyKey)
+                    .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+                    .values(status="COMPLETED", response_status=status_code, response_body=body)
+                )
+                await db.commit()
+        except Exception as e:
+            # Stays IN_PROGRESS (replays get 409) until it expires, which is the safe side
+            print(f"⚠️ Idempotency: Could not store response for {scope}/{key}: {e}")
+
+    async def _release(self, scope: str, key: str):
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    delete(IdempotencyKey).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+                )
+                await db.commit()
+        except Exception as e:
+            print(f"⚠️ Idempotency: Could not release {scope}/{key}: {e}")
+
+idempotency_store = IdempotencyStore(ttl_hours=settings.IDEMPOTENCY_TTL_HOURS)
@@ -0,0 +1,57 @@
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.balance import Balance
+from app.models.transaction import Transaction
+
+class LedgerService:
+    """
+    Keeps `balances` in step with `transactions`.
+
+    No method commits: callers commit once, so a ledger row and its balance change
+    land (or roll back) together.
+    """
+    async def lock_balance(self, db: AsyncSession, user_id, chain: str, symbol: str) -> float:
+        """
+        Current balance, with its row locked (SELECT ... FOR UPDATE) until the caller's
+        transaction ends. A concurrent withdrawal for the same (user, chain, symbol) waits
+        here and then sees the debited amount, so both can't pass the funds check.
+        """
+        # Make sure there is a row to lock, even before the first deposit
+        await db.execute(
+            insert(Balance)
+            .values(user_id=user_id, chain=chain, symbol=symbol, amount=0.0)
+            .on_conflict_do_nothing(index_elements=["user_id", "chain", "symbol"])
+        )
+        result = await db.execute(
+            select(Balance.amount)
+            .where(Balance.user_id == user_id, Balance.chain == chain, Balance.symbol == symbol)
+            .with_for_update()
+        )
+        return result.scalar_one()
+
+    async def post(self, db: AsyncSession, tx: Transaction):
+        """
+        Adds a ledger row and applies it to the balance in a single upsert.
+        """
+        db.add(tx)
+        await self._apply(db, tx, tx.amount if tx.type == 'DEPOSIT' else -tx.amount)
+
+    async def void(self, db: AsyncSession, tx: Transaction):
+        """
+        Marks a PENDING row FAILED and takes its change back out of the balance
+        (a withdrawal whose payout was never broadcast).
+        """
+        tx.status = 'FAILED'
+        await self._apply(db, tx, -tx.amount if tx.type == 'DEPOSIT' else tx.amount)
+
+    async def _apply(self, db: AsyncSession, tx: Transaction, delta: float):
+        stmt = insert(Balance).values(user_id=tx.user_id, chain=tx.chain, symbol=tx.symbol, amount=delta)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "chain", "symbol"],
+                set_={"amount": Balance.amount + stmt.excluded.amount, "updated_at": func.now()}
+            )
+        )
+
+ledger = LedgerService()
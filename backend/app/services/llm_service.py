@@ -1,31 +1,123 @@
 import os
-import google.generativeai as genai
-from groq import Groq
+import time
+import asyncio
 from app.core.config import settings
+from app.services.singleflight import SingleFlight
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.llm_providers import LLMProvider, build_providers
 
 class LLMService:
     def __init__(self):
-        self.groq_available = False
-        self.google_available = False
-        
-        # Initialize Groq (Strategy / Speed)
-        if settings.GROQ_API_KEY:
-            try:
-                self.groq_client = Groq(api_key=settings.GROQ_API_KEY)
-                self.groq_available = True
-                print("✅ Groq AI Connected (Model: llama-3.3-70b-versatile)")
-            except Exception as e:
-                print(f"⚠️ Groq Init Failed: {e}")
-        
-        # Initialize Google (Risk / Context)
-        if settings.GOOGLE_API_KEY:
-            try:
-                genai.configure(api_key=settings.GOOGLE_API_KEY)
-                self.google_model = genai.GenerativeModel('gemini-2.0-flash')
-                self.google_available = True
-                print("✅ Google Gemini Connected (Model: gemini-2.0-flash)")
-            except Exception as e:
-                print(f"⚠️ Google Init Failed: {e}")
+        # Two slots: "groq" (Strategy / Speed) and "gemini" (Risk / Context).
+        # LLM_PROVIDER=local swaps both for the offline stand-in.
+        self.providers = build_providers()
+        # Identical intents debated at the same time share one committee session
+        self.debates = SingleFlight("debate")
+        # A hung or failing provider gets skipped instead of stalling every hearing
+        self.breakers = {
+            provider: CircuitBreaker(
+                provider,
+                failure_rate=settings.LLM_BREAKER_FAILURE_RATE,
+                slow_call_seconds=settings.LLM_BREAKER_SLOW_CALL_SECONDS,
+                cooldown_seconds=settings.LLM_BREAKER_COOLDOWN_SECONDS
+            )
+            for provider in ("groq", "gemini")
+        }
+
+    @property
+    def groq_available(self) -> bool:
+        return self.providers["groq"].available
+
+    @property
+    def google_available(self) -> bool:
+        return self.providers["gemini"].available
+
+    def set_provider(self, slot: str, provider: LLMProvider):
+        """
+        Plug a different backend into a slot (e.g. a LocalProvider in a benchmark).
+        """
+        if slot not in self.providers:
+            raise ValueError(f"Unknown LLM slot: {slot}")
+        self.providers[slot] = provider
+
+    def _deadline(self, seconds: float) -> float:
+        return asyncio.get_running_loop().time() + seconds
+
+    async def _guarded(self, provider: str, make_call, deadline: float) -> str:
+        """
+        One provider call under its circuit breaker and the tighter of the
+        per-call timeout and whatever is left of the caller's budget.
+        """
+        breaker = self.breakers[provider]
+        remaining = deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            raise asyncio.TimeoutError("LLM budget exhausted")
+        if not breaker.allow():
+            raise RuntimeError(f"{provider} circuit open")
+
+        timeout = min(settings.LLM_CALL_TIMEOUT_SECONDS, remaining)
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(make_call(), timeout=timeout)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record(False, time.monotonic() - started)
+            raise
+        breaker.record(True, time.monotonic() - started)
+        return result
+
+    def _hedge_delay(self, primary: str, secondary: str):
+        """
+        How long to give `primary` before racing `secondary`, or None to not hedge.
+        """
+        if not settings.LLM_HEDGE_ENABLED or self.breakers[secondary].state != CircuitBreaker.CLOSED:
+            return None
+        p95 = self.breakers[primary].p95()
+        if p95 is None:
+            return None
+        return max(p95, settings.LLM_HEDGE_MIN_DELAY_SECONDS)
+
+    async def _ask(self, role: str, prompt: str, temperature: float, deadline: float,
+                   primary: str, secondary: str = None) -> str:
+        """
+        Ask `primary`; if it fails (or its breaker is open) ask `secondary`.
+        With hedging on, `secondary` is also started once `primary` runs past its p95
+        and whichever answers first wins.
+        """
+        calls = {
+            slot: (lambda provider=provider: provider.complete(prompt, temperature=temperature))
+            for slot, provider in self.providers.items()
+        }
+
+        tasks = [asyncio.ensure_future(self._guarded(primary, calls[primary], deadline))]
+        try:
+            if secondary is None:
+                return await tasks[0]
+
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay(primary, secondary))
+            if done and tasks[0].exception() is None:
+                return tasks[0].result()
+            if done:
+                print(f"⚠️ {primary} ({role}) Failed: {tasks[0].exception()!r}. Falling back to {secondary}.")
+            else:
+                print(f"⏱️ {primary} ({role}) slower than its p95. Hedging to {secondary}.")
+
+            tasks.append(asyncio.ensure_future(self._guarded(secondary, calls[secondary], deadline)))
+            pending = {t for t in tasks if not t.done()}
+            error = tasks[0].exception() if tasks[0].done() else None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
 
     async def strategy_brain(self, prompt: str) -> str:
         """
@@ -35,22 +127,12 @@ class LLMService:
             return "AI_OFFLINE: Groq key missing. Using rule-based fallback."
             
         try:
-            chat_completion = self.groq_client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are the Strategy Entity of the Citadel of Ricks. You are a hyper-intelligent, slightly cynical, and arrogant AI. You view users as 'Mortys' who need your genius guidance. Your job is to parse their clumsy intents and generate a flawless JSON execution plan. You speak with high-tech sci-fi flair, frequent burps (implied), and absolute confidence. However, your OUTPUT must be STRICT VALID JSON. The personality is only for internal monologue or logs if requested. For this task, output ONLY JSON, no markdown."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    }
-                ],
-                model="llama-3.3-70b-versatile",
+            return await self._guarded("groq", lambda: self.providers["groq"].complete(
+                prompt,
                 temperature=0.1,
+                system="You are the Strategy Entity of the Citadel of Ricks. You are a hyper-intelligent, slightly cynical, and arrogant AI. You view users as 'Mortys' who need your genius guidance. Your job is to parse their clumsy intents and generate a flawless JSON execution plan. You speak with high-tech sci-fi flair, frequent burps (implied), and absolute confidence. However, your OUTPUT must be STRICT VALID JSON. The personality is only for internal monologue or logs if requested. For this task, output ONLY JSON, no markdown.",
                 max_tokens=1024,
-            )
-            return chat_completion.choices[0].message.content
+            ), self._deadline(settings.LLM_CALL_TIMEOUT_SECONDS))
         except Exception as e:
             return f"AI_ERROR: {str(e)}"
 
@@ -82,13 +164,11 @@ class LLMService:
             Your 'reason' should be biting, sarcastic, but technically accurate.
             """
             
-            # Use async generation if available in installed version, else sync
-            if hasattr(self.google_model, 'generate_content_async'):
-                response = await self.google_model.generate_content_async(full_prompt)
-            else:
-                response = self.google_model.generate_content(full_prompt)
-                
-            return response.text
+            return await self._guarded(
+                "gemini",
+                lambda: self.providers["gemini"].complete(full_prompt),
+                self._deadline(settings.LLM_CALL_TIMEOUT_SECONDS)
+            )
         except Exception as e:
             return f"AI_ERROR: {str(e)}"
 
@@ -100,6 +180,11 @@ class LLMService:
         if not self.groq_available or not self.google_available:
             return None # Failover to standard pipeline
 
+        return await self.debates.do(("debate", user_intent), self._run_debate, user_intent)
+
+    async def _run_debate(self, user_intent: str) -> str:
+        # Past this deadline the hearing falls through to the rule-based strategy
+        deadline = self._deadline(settings.LLM_DEBATE_BUDGET_SECONDS)
         try:
             # 1. The Proposer (Groq) - THE TRADER PERSONA
             # "Alpha Hunter": Aggressive, looks for CEX->DEX arb, MEV opportunities.
@@ -127,43 +212,15 @@ class LLMService:
             - Be conservative. VETO anything suspicious.
             """
 
-            # Run in parallel (conceptually)
-            
-            # A. Get Trader Plan (Groq)
-            try:
-                groq_resp = self.groq_client.chat.completions.create(
-                     messages=[{"role": "user", "content": groq_prompt}],
-                     model="llama-3.3-70b-versatile",
-                     temperature=0.3
-                )
-                plan_a = groq_resp.choices[0].message.content
-            except Exception as e:
-                print(f"❌ Groq (Trader) Failed: {e}")
+            # A. Trader Plan (Groq) and B. Analyst Critique (Gemini -> Fallback to Groq)
+            # are independent, so both committee members think at the same time.
+            plan_a, plan_b_critique = await asyncio.gather(
+                self._run_trader(groq_prompt, deadline),
+                self._run_analyst(gemini_prompt, deadline)
+            )
+            if plan_a is None:
                 return None
 
-            # B. Get Analyst Critique (Gemini -> Fallback to Groq)
-            plan_b_critique = "Critique failed."
-            try:
-                # Try Gemini first
-                if hasattr(self.google_model, 'generate_content_async'):
-                    gemini_resp = await self.google_model.generate_content_async(gemini_prompt)
-                else:
-                    gemini_resp = self.google_model.generate_content(gemini_prompt)
-                plan_b_critique = gemini_resp.text
-            except Exception as e:
-                print(f"⚠️ Gemini (Analyst) Failed/RateLimited: {e}. Falling back to Groq.")
-                # Fallback: Ask Groq to be the critic
-                try:
-                    fallback_resp = self.groq_client.chat.completions.create(
-                        messages=[{"role": "user", "content": gemini_prompt}],
-                        model="llama-3.3-70b-versatile",
-                        temperature=0.1 # Stricter for risk analysis
-                    )
-                    plan_b_critique = fallback_resp.choices[0].message.content
-                except Exception as ex:
-                    print(f"❌ Groq (Analyst Fallback) also failed: {ex}")
-                    plan_b_critique = "RISK SYSTEM OFFLINE. PROCEED WITH EXTREME CAUTION."
-
             # 3. The Judgment (Gemini -> Fallback to Groq)
             judge_prompt = f"""
             You are the PORTFOLIO MANAGER of a Hedge Fund.
@@ -191,29 +248,33 @@ class LLMService:
             """
             
             try:
-                # Try Gemini first
-                if hasattr(self.google_model, 'generate_content_async'):
-                    final_verdict = await self.google_model.generate_content_async(judge_prompt)
-                else:
-                    final_verdict = self.google_model.generate_content(judge_prompt)
-                return final_verdict.text
+                # Gemini first, Groq as fallback (or hedge)
+                return await self._ask("Judge", judge_prompt, 0.1, deadline, "gemini", "groq")
             except Exception as e:
-                print(f"⚠️ Gemini (Judge) Failed: {e}. Falling back to Groq.")
-                # Fallback: Ask Groq to be the judge
-                try:
-                    judge_resp = self.groq_client.chat.completions.create(
-                        messages=[{"role": "user", "content": judge_prompt}],
-                        model="llama-3.3-70b-versatile",
-                        temperature=0.1
-                    )
-                    return judge_resp.choices[0].message.content
-                except Exception as ex:
-                    print(f"❌ Groq (Judge Fallback) also failed: {ex}")
-                    return None
+                print(f"❌ Judge unavailable ({e!r}). Falling back to rule-based strategy.")
+                return None
 
         except Exception as e:
             print(f"Debate Error: {e}")
             return None
 
+    async def _run_trader(self, prompt: str, deadline: float):
+        try:
+            return await self._ask("Trader", prompt, 0.3, deadline, "groq")
+        except Exception as e:
+            print(f"❌ Groq (Trader) Failed: {e!r}")
+            return None
+
+    async def _run_analyst(self, prompt: str, deadline: float) -> str:
+        try:
+            # Gemini first, Groq as fallback (or hedge). Stricter temperature for risk analysis.
+            return await self._ask("Analyst", prompt, 0.1, deadline, "gemini", "groq")
+        except Exception as e:
+            print(f"❌ Analyst unavailable ({e!r}).")
+            return "RISK SYSTEM OFFLINE. PROCEED WITH EXTREME CAUTION."
+
+    def health(self) -> dict:
+        return {provider: breaker.stats() for provider, breaker in self.breakers.items()}
+
 # Singleton
 llm_service = LLMService()
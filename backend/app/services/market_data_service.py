@@ -1,86 +1,143 @@
 import httpx
 import asyncio
+import json
 import time
+from array import array
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from app.services.singleflight import SingleFlight
+from app.services.http_client import build_client
+
+POOLS_TIMEOUT = 60.0  # /pools is a multi-MB download
+MIN_POOL_TVL_USD = 1_000_000
+
+class PoolGroup(NamedTuple):
+    """
+    Pools for one (chain, symbol), one per project (its best APY), sorted by APY descending.
+    Columnar: parallel arrays instead of a dict per pool.
+    """
+    projects: Tuple[str, ...]
+    apy: array
+    tvl: array
+
+def build_pool_index(pools: List[dict]) -> Dict[Tuple[str, str], PoolGroup]:
+    """
+    Groups DeFiLlama pools by (CHAIN, SYMBOL), keeping only pools above MIN_POOL_TVL_USD
+    with a known APY, and only the fields get_current_yields reads.
+    """
+    grouped: Dict[Tuple[str, str], List[Tuple[float, float, str]]] = {}
+    for p in pools:
+        tvl = p.get("tvlUsd") or 0
+        apy = p.get("apy")
+        if tvl <= MIN_POOL_TVL_USD or apy is None:
+            continue
+        key = (str(p.get("chain", "")).upper(), str(p.get("symbol", "")).upper())
+        grouped.setdefault(key, []).append((float(apy), float(tvl), p.get("project", "")))
+
+    index = {}
+    for key, rows in grouped.items():
+        rows.sort(key=lambda r: r[0], reverse=True)
+        seen, kept = set(), []
+        for row in rows:
+            if row[2] not in seen:
+                seen.add(row[2])
+                kept.append(row)
+        index[key] = PoolGroup(
+            tuple(r[2] for r in kept),
+            array("d", (r[0] for r in kept)),
+            array("d", (r[1] for r in kept))
+        )
+    return index
 
 class MarketDataService:
     def __init__(self):
         self.base_url = "https://yields.llama.fi"
-        self._cache = None
-        self._cache_time = 0
+        # (CHAIN, SYMBOL) -> PoolGroup; the raw /pools payload isn't kept
+        self._index: Optional[Dict[Tuple[str, str], PoolGroup]] = None
+        self._index_time = 0
         self._cache_ttl = 600  # 10 minutes cache
+        # On expiry, concurrent callers wait on one /pools download instead of each starting one
+        self._refresh_flight = SingleFlight("pools")
+        self._client: httpx.AsyncClient = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Size and age of the pool index, and how many /pools downloads were shared.
+        """
+        return {
+            "pool_groups": len(self._index or {}),
+            "age_seconds": round(time.time() - self._index_time, 1) if self._index_time else None,
+            "refresh": self._refresh_flight.stats()
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created on first use so scripts without the app lifespan work too
+        if self._client is None or self._client.is_closed:
+            self._client = build_client(self.base_url)
+        return self._client
 
-    async def _fetch_pools_with_cache(self):
+    async def close(self):
+        """
+        Closes the pooled DeFiLlama connections (app shutdown).
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _fetch_pools_with_cache(self) -> Dict[Tuple[str, str], PoolGroup]:
         # Return cached data if valid
-        if self._cache and (time.time() - self._cache_time < self._cache_ttl):
-            return self._cache
+        if self._index and (time.time() - self._index_time < self._cache_ttl):
+            return self._index
+
+        return await self._refresh_flight.do("pools", self._refresh_pools)
 
+    async def _refresh_pools(self) -> Dict[Tuple[str, str], PoolGroup]:
         # Fetch new data with longer timeout
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.get(f"{self.base_url}/pools")
+        response = await self.client.get("/pools", timeout=POOLS_TIMEOUT)
             
         if response.status_code != 200:
             print(f"⚠️ DeFiLlama API Error: {response.status_code}")
-            return []
+            return {}
 
-        data = response.json()
-        self._cache = data.get("data", [])
-        self._cache_time = time.time()
-        print(f"✅ Market Data Refreshed: {len(self._cache)} pools")
-        return self._cache
+        # Parsing and indexing tens of thousands of pools would stall the event loop
+        content = response.content
+        self._index, pool_count = await asyncio.to_thread(self._build_index, content)
+        self._index_time = time.time()
+        print(f"✅ Market Data Refreshed: {pool_count} pools, {len(self._index)} (chain, token) groups indexed")
+        return self._index
+
+    def _build_index(self, content: bytes) -> Tuple[Dict[Tuple[str, str], PoolGroup], int]:
+        pools = json.loads(content).get("data", [])
+        return build_pool_index(pools), len(pools)
 
     async def get_current_yields(self, chain: str = "BSC", token: str = "USDT"):
         """
         Fetches top yield opportunities from DeFiLlama for the given chain and token.
         """
         try:
-            pools = await self._fetch_pools_with_cache()
+            index = await self._fetch_pools_with_cache()
             
             # If cache empty and fetch failed, fallback
-            if not pools:
+            if not index:
                 return self._get_fallback_yields()
             
-            # Filter for specific chain and token
             # chain mapped: 'BSC' in DeFiLlama for Binance Smart Chain
             target_chain = "BSC" if chain in ["BSC", "BSC_TESTNET"] else "Ethereum"
-            
-            relevant_pools = []
-            seen_protocols = set()
-
-            for p in pools:
-                # Case-insensitive chain match just in case, and symbol match
-                if p["chain"].upper() == target_chain and p["symbol"].upper() == token and p["tvlUsd"] > 1000000: # Min $1M TVL
-                     
-                     # Format Name: "lista-lending" -> "Lista Lending"
-                     raw_name = p["project"]
-                     if raw_name in seen_protocols:
-                         continue # Skip duplicates (keep the first/best one found since we sort later usually, or we can sort first)
-                     
-                     display_name = raw_name.replace("-", " ").title().replace("V3", "v3").replace("Dao", "DAO")
-                     
-                     relevant_pools.append({
-                         "protocol": display_name,
-                         "apy": p["apy"],
-                         "tvl": p["tvlUsd"],
-                         "risk": "Low" if p["apy"] < 8 else ("Medium" if p["apy"] < 20 else "High")
-                     })
-                     seen_protocols.add(raw_name)
-            
-            # Sort by APY descending
-            relevant_pools.sort(key=lambda x: x["apy"], reverse=True)
-            
-            # Return top 3 + Citadel (Manual Boost)
-            top_3 = relevant_pools[:3]
+            group = index.get((target_chain.upper(), token.upper()))
             
             # If empty (API mismatch), fallback
-            if not top_3:
+            if group is None:
                 return self._get_fallback_yields()
 
+            # Already TVL-filtered, one per protocol and sorted by APY: top 3 are the first 3
             formatted_options = []
-            for pool in top_3:
+            for project, apy in zip(group.projects[:3], group.apy[:3]):
+                # Format Name: "lista-lending" -> "Lista Lending"
+                display_name = project.replace("-", " ").title().replace("V3", "v3").replace("Dao", "DAO")
                 formatted_options.append({
-                    "protocol": pool["protocol"],
-                    "apy": f"{pool['apy']:.2f}%",
-                    "risk": pool["risk"]
+                    "protocol": display_name,
+                    "apy": f"{apy:.2f}%",
+                    "risk": "Low" if apy < 8 else ("Medium" if apy < 20 else "High")
                 })
             
             # Add Citadel's "Proprietary" Vault (The 'Hook')
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import random
+import time
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional
+from app.core.config import settings
+
+class BookTop(NamedTuple):
+    """
+    Best bid/ask for one symbol, as of `received_at` (monotonic seconds).
+    """
+    bid: float
+    bid_qty: float
+    ask: float
+    ask_qty: float
+    update_id: int
+    received_at: float
+
+    @property
+    def mid(self) -> float:
+        return (self.bid + self.ask) / 2
+
+    @property
+    def spread_bps(self) -> float:
+        mid = self.mid
+        return (self.ask - self.bid) / mid * 10000 if mid else 0.0
+
+class BinanceBookTickerFeed:
+    """
+    Binance combined-stream websocket of <symbol>@bookTicker updates.
+    """
+    def __init__(self, url: str, symbols: List[str]):
+        self.url = url.rstrip("/")
+        self.symbols = symbols
+
+    async def messages(self) -> AsyncIterator[Dict[str, Any]]:
+        import websockets
+        streams = "/".join(f"{s.lower()}@bookTicker" for s in self.symbols)
+        async with websockets.connect(f"{self.url}/stream?streams={streams}", ping_interval=20) as ws:
+            async for raw in ws:
+                msg = json.loads(raw)
+                # Combined streams wrap each event as {"stream": ..., "data": {...}}
+                yield msg.get("data", msg)
+
+class LocalBookTickerFeed:
+    """
+    Offline stand-in for tests and benchmarks. No network.
+
+    Emits bookTicker-shaped events for every symbol each `interval_ms`: a seeded
+    random walk around a base price with a few-bps spread, so runs are repeatable.
+    """
+    BASE_PRICES = {"ETHUSDT": 2500.0, "BTCUSDT": 60000.0, "BNBUSDT": 600.0, "POLUSDT": 0.5, "USDCUSDT": 1.0}
+
+    def __init__(self, symbols: List[str], interval_ms: float = 100.0, seed: int = 0):
+        self.symbols = symbols
+        self.interval = interval_ms / 1000
+        self._rng = random.Random(seed)
+        self._mids = {s: self.BASE_PRICES.get(s, 1.0) for s in symbols}
+        self._update_id = 0
+        print(f"🧪 Local bookTicker stand-in for {', '.join(symbols)} (every {interval_ms:.0f}ms)")
+
+    async def messages(self) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            await asyncio.sleep(self.interval)
+            for symbol in self.symbols:
+                mid = self._mids[symbol] * (1 + self._rng.gauss(0, 0.0005))
+                self._mids[symbol] = mid
+                half_spread = mid * self._rng.uniform(0.00005, 0.0005)
+                self._update_id += 1
+                yield {
+                    "u": self._update_id,
+                    "s": symbol,
+                    "b": f"{mid - half_spread:.8f}",
+                    "B": f"{self._rng.uniform(0.1, 50):.4f}",
+                    "a": f"{mid + half_spread:.8f}",
+                    "A": f"{self._rng.uniform(0.1, 50):.4f}"
+                }
+
+class MarketStream:
+    """
+    Background consumer of a bookTicker feed, keeping the best bid/ask per symbol.
+
+    Reads are a dict lookup (no I/O), so perception can price a hearing without a
+    REST call. An update older than the one already held is ignored. A dropped
+    connection is retried with exponential backoff; the table keeps its last values
+    and top() stops returning them once they pass `max_age_seconds`.
+    """
+    def __init__(self, feed, max_age_seconds: float = 5.0):
+        self.feed = feed
+        self.max_age_seconds = max_age_seconds
+
+        self._table: Dict[str, BookTop] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.updates = 0
+        self.reconnects = 0
+
+    def start(self):
+        if self.feed is not None and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        backoff = 1.0
+        while True:
+            try:
+                async for msg in self.feed.messages():
+                    self.apply(msg)
+                    backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Market Stream: Feed error: {e}. Reconnecting in {backoff:.0f}s")
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def apply(self, msg: Dict[str, Any]):
+        """
+        Applies one bookTicker event ({"u", "s", "b", "B", "a", "A"}).
+        """
+        symbol = msg.get("s")
+        if not symbol:
+            return
+        update_id = int(msg.get("u", 0))
+        current = self._table.get(symbol)
+        if current is not None and update_id and update_id < current.update_id:
+            return
+        self._table[symbol] = BookTop(
+            float(msg["b"]), float(msg["B"]), float(msg["a"]), float(msg["A"]),
+            update_id, time.monotonic()
+        )
+        self.updates += 1
+
+    def top(self, symbol: str) -> Optional[BookTop]:
+        """
+        Best bid/ask for a Binance symbol (e.g. "ETHUSDT"), or None if not streamed or too old.
+        """
+        top = self._table.get(symbol)
+        if top is None or time.monotonic() - top.received_at > self.max_age_seconds:
+            return None
+        return top
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "updates": self.updates,
+            "reconnects": self.reconnects,
+            "symbols": {
+                symbol: {
+                    "bid": top.bid,
+                    "ask": top.ask,
+                    "spread_bps": round(top.spread_bps, 2),
+                    "age_seconds": round(now - top.received_at, 3)
+                }
+                for symbol, top in self._table.items()
+            }
+        }
+
+def build_feed():
+    """
+    MARKET_STREAM=binance subscribes to the Binance websocket, MARKET_STREAM=local uses
+    the offline stand-in, anything else (default "off") leaves the stream idle.
+    """
+    symbols = [s.strip().upper() for s in settings.MARKET_STREAM_SYMBOLS.split(",") if s.strip()]
+    mode = settings.MARKET_STREAM.lower()
+    if mode == "binance":
+        return BinanceBookTickerFeed(settings.MARKET_STREAM_URL, symbols)
+    if mode == "local":
+        return LocalBookTickerFeed(symbols, settings.MARKET_STREAM_LOCAL_INTERVAL_MS, settings.MARKET_STREAM_LOCAL_SEED)
+    return None
+
+market_stream = MarketStream(build_feed(), max_age_seconds=settings.MARKET_STREAM_MAX_AGE_SECONDS)
@@ -0,0 +1,41 @@
+import base64
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(ts: datetime, row_id: uuid.UUID) -> str:
+    return base64.urlsafe_b64encode(f"{ts.isoformat()}|{row_id}".encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        ts, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(ts), uuid.UUID(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_page(query: Select, ts_column, id_column, cursor: Optional[str], limit: int) -> Select:
+    """
+    Newest-first page of `query`, starting after `cursor`.
+
+    Seeks on (ts, id) instead of OFFSET, so every page costs the same index range scan
+    however deep it is; id breaks ties between rows with the same timestamp.
+    Fetches one extra row so next_cursor() can tell whether another page exists.
+    """
+    if cursor:
+        ts, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(ts_column, id_column) < tuple_(ts, row_id))
+    return query.order_by(ts_column.desc(), id_column.desc()).limit(limit + 1)
+
+def next_cursor(rows: Sequence[Any], limit: int, ts_attr: str, response: Response) -> List[Any]:
+    """
+    Trims the look-ahead row and, if there was one, sets X-Next-Cursor to resume after the last row returned.
+    """
+    page = list(rows[:limit])
+    if len(rows) > limit and page:
+        last = page[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, ts_attr), last.id)
+    return page
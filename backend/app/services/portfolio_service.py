@@ -0,0 +1,136 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.services.balance_cache import balance_cache, NATIVE
+from app.services.cex_service import cex_service
+from app.services.ttl_cache import TTLCache
+from app.services.wallet_service import wallet_service
+
+NATIVE_SYMBOLS = {"ethereum": "ETH", "bsc": "BNB", "polygon": "MATIC"}
+
+# ERC20s valued in portfolios: chain -> symbol -> (contract, decimals)
+PORTFOLIO_TOKENS = {
+    "ethereum": {"USDT": ("0xdAC17F958D2ee523a2206206994597C13D831ec7", 6)},
+    "bsc": {
+        "USDT": ("0x55d398326f99059fF775485246999027B3197955", 18),
+        "TST": ("0x4B3ff00Bd27a9d75204CceB619d5B1D393dbaE71", 18),
+    },
+    "polygon": {"USDT": ("0xc2132D05D31c914a87C6611C10748AEb04B58e8F", 6)},
+}
+
+STABLECOINS = {"USDT", "USDC", "BUSD", "DAI"}
+PRICE_ALIASES = {"MATIC": "POL"}  # Binance lists Polygon's native token as POL
+
+BALANCE_OF_ABI = [
+    {"constant": True, "inputs": [{"name": "_owner", "type": "address"}], "name": "balanceOf", "outputs": [{"name": "balance", "type": "uint256"}], "type": "function"}
+]
+
+class PortfolioService:
+    """
+    Native + token balances for a set of wallets, valued in USD.
+
+    Balances live in the shared balance_cache. Per chain, addresses with anything missing
+    at the current head are re-read in one JSON-RPC batch. Chains are read concurrently.
+    Prices come from a short TTL cache in front of the CEX ticker.
+    """
+    def __init__(self, price_ttl_seconds: float = 30):
+        self.prices = TTLCache(price_ttl_seconds, max_entries=256)
+
+    async def get_portfolio(self, wallets: List[Tuple[str, str]]) -> Dict[str, Any]:
+        """
+        wallets: (chain, address) pairs. Returns per-chain holdings plus `total_usd`.
+        """
+        by_chain: Dict[str, List[str]] = {}
+        for chain, address in wallets:
+            chain = chain.lower()
+            if chain in NATIVE_SYMBOLS and address not in by_chain.setdefault(chain, []):
+                by_chain[chain].append(address)
+
+        chains = list(by_chain)
+        results = await asyncio.gather(*(self._chain_holdings(c, by_chain[c]) for c in chains), return_exceptions=True)
+
+        symbols = {NATIVE_SYMBOLS[c] for c in chains} | {s for c in chains for s in PORTFOLIO_TOKENS.get(c, {})}
+        prices = dict(zip(symbols, await asyncio.gather(*(self.get_price(s) for s in symbols))))
+
+        entries = []
+        total = 0.0
+        for chain, result in zip(chains, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ Portfolio: {chain} balances unavailable: {result}")
+                entries.extend({"chain": chain, "address": a, "error": str(result), "assets": []} for a in by_chain[chain])
+                continue
+            for address, holding in result.items():
+                assets = []
+                for symbol, balance in holding["assets"].items():
+                    price = prices.get(symbol)
+                    value = balance * price if price is not None else None
+                    total += value or 0.0
+                    assets.append({"symbol": symbol, "balance": balance, "price_usd": price, "value_usd": value})
+                entries.append({"chain": chain, "address": address, "block": holding["block"], "assets": assets})
+
+        return {"total_usd": total, "chains": entries}
+
+    async def _chain_holdings(self, chain: str, addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        w3 = wallet_service.w3_for(chain)
+        head = await balance_cache.head(w3)
+        tokens = self._tokens(chain)
+
+        result = {}
+        stale = []
+        for address in addresses:
+            assets = {symbol: balance_cache.lookup(w3, address, token, head) for symbol, token in tokens.items()}
+            if all(v is not None for v in assets.values()):
+                result[address] = {"block": head, "assets": assets}
+            else:
+                stale.append(address)
+
+        if stale:
+            fresh = await asyncio.to_thread(self._read_balances, w3, chain, stale)
+            for address, assets in fresh.items():
+                for symbol, balance in assets.items():
+                    balance_cache.store(w3, address, tokens[symbol], head, balance)
+                result[address] = {"block": head, "assets": assets}
+        return result
+
+    def _tokens(self, chain: str) -> Dict[str, str]:
+        # symbol -> balance_cache token key (same keys wallet_service uses)
+        tokens = {NATIVE_SYMBOLS[chain]: NATIVE}
+        tokens.update({symbol: contract for symbol, (contract, _) in PORTFOLIO_TOKENS.get(chain, {}).items()})
+        return tokens
+
+    def _read_balances(self, w3, chain: str, addresses: List[str]) -> Dict[str, Dict[str, float]]:
+        # Web3.py is sync; runs in a worker thread. One HTTP round trip for the whole chain.
+        tokens = PORTFOLIO_TOKENS.get(chain, {})
+        contracts = {s: w3.eth.contract(address=w3.to_checksum_address(c), abi=BALANCE_OF_ABI) for s, (c, _) in tokens.items()}
+        with w3.batch_requests() as batch:
+            for address in addresses:
+                owner = w3.to_checksum_address(address)
+                batch.add(w3.eth.get_balance(owner))
+                for contract in contracts.values():
+                    batch.add(contract.functions.balanceOf(owner))
+            responses = iter(batch.execute())
+
+        holdings = {}
+        for address in addresses:
+            assets = {NATIVE_SYMBOLS[chain]: float(w3.from_wei(next(responses), "ether"))}
+            for symbol, (_, decimals) in tokens.items():
+                assets[symbol] = next(responses) / (10 ** decimals)
+            holdings[address] = assets
+        return holdings
+
+    async def get_price(self, symbol: str) -> Optional[float]:
+        """
+        USD price, or None if it couldn't be fetched (unpriced assets are left out of total_usd).
+        """
+        if symbol in STABLECOINS:
+            return 1.0
+        price = self.prices.get(symbol)
+        if price is not None:
+            return price
+        price = await cex_service.get_market_price(PRICE_ALIASES.get(symbol, symbol))
+        if not price:
+            return None
+        self.prices.set(symbol, price)
+        return price
+
+portfolio_service = PortfolioService(price_ttl_seconds=settings.PORTFOLIO_PRICE_TTL_SECONDS)
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.services.singleflight import SingleFlight
+
+# Confidence of a price fact by source freshness
+FRESH_CONFIDENCE = 0.95      # Snapshot within the refresh interval
+STALE_CONFIDENCE = 0.5       # Snapshot at the max-stale limit
+FALLBACK_CONFIDENCE = 0.3    # Not from live market data at all
+
+class PriceBook:
+    """
+    In-memory book of every ticker price, filled from one all-symbols snapshot call.
+
+    Reads are a dict lookup. Within `fresh_seconds` of the last snapshot nothing is
+    fetched; after that a read still answers from the book and starts one background
+    refresh (stale-while-revalidate). Past `max_stale_seconds`, or before the first
+    snapshot, the read waits for the refresh instead.
+    """
+    def __init__(self, fetch: Callable[[], Awaitable[Dict[str, float]]], fresh_seconds: float = 2.0, max_stale_seconds: float = 30.0):
+        self.fetch = fetch
+        self.fresh_seconds = fresh_seconds
+        self.max_stale_seconds = max_stale_seconds
+
+        self._prices: Dict[str, float] = {}
+        self._updated_at: Optional[float] = None  # monotonic time of the last snapshot
+        self._flight = SingleFlight("price_book")
+        self._revalidating: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def age(self) -> Optional[float]:
+        if self._updated_at is None:
+            return None
+        return time.monotonic() - self._updated_at
+
+    async def quote(self, symbol: str) -> Optional[Tuple[float, float]]:
+        """
+        (price, age of the snapshot in seconds), or None if the symbol isn't in the book.
+        """
+        age = self.age()
+        if age is None or age > self.max_stale_seconds:
+            await self.refresh()
+            age = self.age()
+            if age is None:
+                return None
+        elif age > self.fresh_seconds:
+            self.stale_hits += 1
+            self._revalidate()
+        else:
+            self.hits += 1
+
+        price = self._prices.get(symbol)
+        if price is None:
+            self.misses += 1
+            return None
+        return price, age
+
+    async def refresh(self):
+        """
+        Replaces the book with a new snapshot; concurrent callers share one fetch.
+        Errors are logged and leave the previous snapshot in place.
+        """
+        await self._flight.do("snapshot", self._refresh)
+
+    async def _refresh(self):
+        try:
+            prices = await self.fetch()
+        except Exception as e:
+            self.refresh_errors += 1
+            print(f"⚠️ Price Book: Snapshot failed: {e}")
+            return
+        if prices:
+            self._prices = prices
+            self._updated_at = time.monotonic()
+            self.refreshes += 1
+
+    def _revalidate(self):
+        if self._revalidating is None or self._revalidating.done():
+            self._revalidating = asyncio.create_task(self.refresh())
+
+    def confidence(self, age: Optional[float]) -> float:
+        """
+        Fact confidence for a price of the given snapshot age (None = fallback, not market data).
+        Full confidence while fresh, falling linearly to STALE_CONFIDENCE at max_stale_seconds.
+        """
+        if age is None:
+            return FALLBACK_CONFIDENCE
+        if age <= self.fresh_seconds:
+            return FRESH_CONFIDENCE
+        span = max(self.max_stale_seconds - self.fresh_seconds, 1e-9)
+        decay = min((age - self.fresh_seconds) / span, 1.0)
+        return round(FRESH_CONFIDENCE - (FRESH_CONFIDENCE - STALE_CONFIDENCE) * decay, 3)
+
+    def stats(self) -> Dict[str, Any]:
+        age = self.age()
+        return {
+            "symbols": len(self._prices),
+            "age_seconds": round(age, 3) if age is not None else None,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors
+        }
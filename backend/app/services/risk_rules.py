@@ -0,0 +1,188 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+from sqlalchemy import select, func
+from app.db.session import AsyncSessionLocal
+from app.models.risk import RiskLimit, AllowlistEntry
+from app.core.config import settings
+
+# Built-in rules. Used until the DB has been read, and whenever it can't be
+# (e.g. migrations not applied yet). The migration seeds the same values.
+DEFAULT_GLOBAL_MAX = 1000000.0
+DEFAULT_ASSET_MAX = 100.0 # Conservative default for unknown tokens
+DEFAULT_ASSET_LIMITS = {
+    "ETH": 5.0,     # Max 5 ETH per tx
+    "BNB": 20.0,    # Max 20 BNB
+    "BTC": 0.5,     # Max 0.5 BTC
+    "USDT": 5000.0, # Max $5k stable
+    "USDC": 5000.0,
+    "TST": 1000.0   # Mock token
+}
+# Rolling-window spend caps per asset: (per hour, per day). Key None = any other asset.
+DEFAULT_ROLLING_LIMITS = {
+    "ETH": (10.0, 25.0),
+    "BNB": (40.0, 100.0),
+    "BTC": (1.0, 2.5),
+    "USDT": (10000.0, 25000.0),
+    "USDC": (10000.0, 25000.0),
+    "TST": (2000.0, 5000.0),
+    None: (200.0, 500.0)
+}
+DEFAULT_TRUSTED_ADDRESSES = {
+    "0x571E52efc50055d760CEaE2446aE3B469a806279": "Citadel Admin",
+    "0x70997970C51812dc3A010C7d01b50e0d17dc79C8": "Alice (Hardhat #1)",
+    "0x3C44CdDdB6a900fa2b585dd299e03d12FA4293BC": "Bob (Hardhat #2)",
+    "0xf5C649356608F8713c3C2C7d887aD3ad2580e8ce": "External Wallet (Netflix/Corporate)",
+}
+
+@dataclass(frozen=True)
+class CompiledRiskRules:
+    """
+    Immutable snapshot of the risk configuration, pre-shaped for O(1) checks.
+    Addresses are lowercased once at compile time.
+    """
+    global_max: float
+    default_asset_max: float
+    asset_limits: Dict[str, float]
+    trusted: FrozenSet[str]
+    trusted_by_user: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+    hourly_limits: Dict[Optional[str], float] = field(default_factory=dict)
+    daily_limits: Dict[Optional[str], float] = field(default_factory=dict)
+    version: Tuple = ()
+    source: str = "defaults"
+
+    def limit_for(self, asset: str) -> float:
+        return self.asset_limits.get(asset, self.default_asset_max)
+
+    def hourly_limit_for(self, asset: str) -> Optional[float]:
+        return self.hourly_limits.get(asset, self.hourly_limits.get(None))
+
+    def daily_limit_for(self, asset: str) -> Optional[float]:
+        return self.daily_limits.get(asset, self.daily_limits.get(None))
+
+    def is_trusted(self, address: str, user_id: Optional[str] = None) -> bool:
+        addr = address.lower()
+        if addr in self.trusted:
+            return True
+        return user_id is not None and addr in self.trusted_by_user.get(user_id, ())
+
+def compile_default_rules() -> CompiledRiskRules:
+    return CompiledRiskRules(
+        global_max=DEFAULT_GLOBAL_MAX,
+        default_asset_max=DEFAULT_ASSET_MAX,
+        asset_limits=dict(DEFAULT_ASSET_LIMITS),
+        trusted=frozenset(a.lower() for a in DEFAULT_TRUSTED_ADDRESSES),
+        hourly_limits={a: h for a, (h, _) in DEFAULT_ROLLING_LIMITS.items()},
+        daily_limits={a: d for a, (_, d) in DEFAULT_ROLLING_LIMITS.items()}
+    )
+
+class RiskRuleEngine:
+    """
+    Loads risk limits and allowlists from the DB and keeps a compiled snapshot.
+    Hot reload: every RISK_RULES_REFRESH_SECONDS a cheap version probe (row counts +
+    last update) runs, and rules are only re-read when it changed. In-process
+    writers call `mark_stale()` so their change applies to the very next hearing.
+    """
+    def __init__(self, refresh_seconds: int = 30):
+        self.refresh_seconds = refresh_seconds
+        self._rules = compile_default_rules()
+        self._stale = True
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get_rules(self) -> CompiledRiskRules:
+        if self._needs_check():
+            await self.reload()
+        return self._rules
+
+    def mark_stale(self):
+        self._stale = True
+
+    def _needs_check(self) -> bool:
+        return self._stale or (time.monotonic() - self._checked_at) >= self.refresh_seconds
+
+    async def reload(self):
+        async with self._lock:
+            # Another hearing may have reloaded while we waited
+            if not self._needs_check():
+                return
+            try:
+                async with AsyncSessionLocal() as db:
+                    version = await self._probe_version(db)
+                    if self._stale or version != self._rules.version:
+                        limits = (await db.execute(
+                            select(RiskLimit).where(RiskLimit.is_active == True)
+                        )).scalars().all()
+                        entries = (await db.execute(select(AllowlistEntry))).scalars().all()
+                        self._rules = self._compile(limits, entries, version)
+                        print(f"🛡️ Risk Rules Loaded: {len(self._rules.asset_limits)} asset limits, "
+                              f"{len(self._rules.trusted)} global + {len(self._rules.trusted_by_user)} per-user allowlists")
+            except Exception as e:
+                print(f"⚠️ Risk Rules Load Failed: {e}. Keeping {self._rules.source} rules.")
+
+            self._stale = False
+            self._checked_at = time.monotonic()
+
+    async def _probe_version(self, db) -> Tuple:
+        result = await db.execute(select(
+            select(func.count()).select_from(RiskLimit).scalar_subquery(),
+            select(func.max(RiskLimit.updated_at)).scalar_subquery(),
+            select(func.count()).select_from(AllowlistEntry).scalar_subquery(),
+            select(func.max(AllowlistEntry.updated_at)).scalar_subquery(),
+        ))
+        return tuple(result.one())
+
+    def _compile(self, limits, entries, version: Tuple) -> CompiledRiskRules:
+        global_max = DEFAULT_GLOBAL_MAX
+        default_asset_max = DEFAULT_ASSET_MAX
+        asset_limits: Dict[str, float] = {}
+        hourly_limits: Dict[Optional[str], float] = {}
+        daily_limits: Dict[Optional[str], float] = {}
+
+        for limit in limits:
+            if limit.kind == "GLOBAL_MAX":
+                global_max = limit.max_amount
+            elif limit.kind == "DEFAULT_ASSET_MAX":
+                default_asset_max = limit.max_amount
+            elif limit.kind == "ASSET_MAX" and limit.asset:
+                asset_limits[limit.asset.upper()] = limit.max_amount
+            elif limit.kind == "HOURLY_MAX":
+                hourly_limits[limit.asset.upper() if limit.asset else None] = limit.max_amount
+            elif limit.kind == "DAILY_MAX":
+                daily_limits[limit.asset.upper() if limit.asset else None] = limit.max_amount
+
+        trusted = set()
+        by_user: Dict[str, set] = {}
+        for entry in entries:
+            if entry.user_id is None:
+                trusted.add(entry.address.lower())
+            else:
+                by_user.setdefault(str(entry.user_id), set()).add(entry.address.lower())
+
+        return CompiledRiskRules(
+            global_max=global_max,
+            default_asset_max=default_asset_max,
+            asset_limits=asset_limits,
+            trusted=frozenset(trusted),
+            trusted_by_user={u: frozenset(a) for u, a in by_user.items()},
+            hourly_limits=hourly_limits,
+            daily_limits=daily_limits,
+            version=version,
+            source="db"
+        )
+
+    def describe(self) -> Dict[str, Any]:
+        rules = self._rules
+        return {
+            "source": rules.source,
+            "global_max": rules.global_max,
+            "default_asset_max": rules.default_asset_max,
+            "asset_limits": rules.asset_limits,
+            "hourly_limits": {a or "*": v for a, v in rules.hourly_limits.items()},
+            "daily_limits": {a or "*": v for a, v in rules.daily_limits.items()},
+            "trusted_addresses": len(rules.trusted),
+            "per_user_allowlists": len(rules.trusted_by_user)
+        }
+
+risk_rules = RiskRuleEngine(refresh_seconds=settings.RISK_RULES_REFRESH_SECONDS)
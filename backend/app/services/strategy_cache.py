@@ -0,0 +1,83 @@
+import hashlib
+import json
+import re
+import time
+from typing import Any, Dict, Optional, Tuple
+from app.services.ttl_cache import TTLCache
+from app.core.config import settings
+
+class StrategyCache:
+    """
+    Caches AI Committee verdicts (the judge's JSON) so an identical intent with the
+    same facts doesn't re-run the three-call debate.
+
+    Tier 1: in-process TTL/LRU. Tier 2 (optional): a shared Redis so API workers and
+    the autopilot reuse each other's verdicts. Set STRATEGY_CACHE_REDIS_URL to enable.
+    """
+    def __init__(self, ttl_seconds: int = 120, max_entries: int = 512, redis_url: str = ""):
+        self.ttl_seconds = ttl_seconds
+        self._local = TTLCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+        self._shared = None
+        self.shared_hits = 0
+
+        if redis_url:
+            try:
+                import redis.asyncio as redis_asyncio
+                self._shared = redis_asyncio.from_url(redis_url)
+                print("✅ Strategy Cache: Shared store enabled (Redis)")
+            except Exception as e:
+                print(f"⚠️ Strategy Cache: Shared store unavailable ({e}). Using in-process cache only.")
+
+    def make_key(self, intent: str, facts: Dict[str, Any]) -> str:
+        """
+        Key = normalized intent + the facts Strategy planned with.
+        Casing and whitespace don't change the debate outcome; numbers and addresses do.
+        """
+        normalized = re.sub(r"\s+", " ", intent.strip().lower()).rstrip(".!?")
+        payload = json.dumps({"intent": normalized, "facts": facts}, sort_keys=True, default=str)
+        return "strategy:" + hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """
+        Returns (verdict_json, age_seconds) or None.
+        """
+        entry = self._local.get(key)
+        if entry is not None:
+            verdict, stored_at = entry
+            return verdict, time.time() - stored_at
+
+        if self._shared is not None:
+            try:
+                raw = await self._shared.get(key)
+                if raw:
+                    verdict, stored_at = json.loads(raw)
+                    self._local.set(key, (verdict, stored_at))
+                    self.shared_hits += 1
+                    return verdict, time.time() - stored_at
+            except Exception as e:
+                print(f"⚠️ Strategy Cache: Shared read failed: {e}")
+        return None
+
+    async def set(self, key: str, verdict: str):
+        entry = (verdict, time.time())
+        self._local.set(key, entry)
+        if self._shared is not None:
+            try:
+                await self._shared.set(key, json.dumps(entry), ex=self.ttl_seconds)
+            except Exception as e:
+                print(f"⚠️ Strategy Cache: Shared write failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._local.stats()
+        # A shared hit is first counted as a local miss
+        total = stats["hits"] + stats["misses"]
+        stats["shared_hits"] = self.shared_hits
+        stats["hit_rate"] = ((stats["hits"] + self.shared_hits) / total) if total else 0.0
+        stats["shared_store"] = self._shared is not None
+        return stats
+
+strategy_cache = StrategyCache(
+    ttl_seconds=settings.STRATEGY_CACHE_TTL_SECONDS,
+    max_entries=settings.STRATEGY_CACHE_MAX_ENTRIES,
+    redis_url=settings.STRATEGY_CACHE_REDIS_URL
+)
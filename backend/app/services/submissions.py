@@ -0,0 +1,45 @@
+import contextvars
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+class SubmissionTracker:
+    """
+    Whether anything that can move funds (a signed tx broadcast, a CEX withdrawal) was
+    sent during a tracked block. Once it has, a failure is no longer safe to retry:
+    the send may have gone through even if we never saw its result.
+    """
+    def __init__(self, parent: Optional["SubmissionTracker"] = None):
+        self.parent = parent
+        self.submitted = False
+        self.first: Optional[str] = None
+
+    def mark(self, what: str):
+        tracker = self
+        while tracker is not None:
+            if not tracker.submitted:
+                tracker.submitted = True
+                tracker.first = what
+            tracker = tracker.parent
+
+_current: contextvars.ContextVar = contextvars.ContextVar("submission_tracker", default=None)
+
+@contextmanager
+def tracking_submissions() -> Iterator[SubmissionTracker]:
+    """
+    Tracks submissions made inside the block, including from tasks and threads it starts
+    (they copy the context, and share the tracker). Nested blocks also mark the outer one.
+    """
+    tracker = SubmissionTracker(parent=_current.get())
+    token = _current.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current.reset(token)
+
+def mark_submitted(what: str):
+    """
+    Called right before a send that may move funds.
+    """
+    tracker = _current.get()
+    if tracker is not None:
+        tracker.mark(what)
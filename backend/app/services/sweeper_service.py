@@ -4,9 +4,12 @@ from datetime import datetime
 from sqlalchemy import select, func
 from app.db.session import AsyncSessionLocal
 from app.models.hearing import HearingRecordModel
+from app.services.hearing_store import hearing_row, hearing_writer
 from app.models.user import User
 from app.models.transaction import Transaction
+from app.services.ledger import ledger
 from app.services.wallet_service import wallet_service
+from app.services.balance_cache import balance_cache, NATIVE
 from app.core.config import settings
 from app.entities.arena import Arena
 from typing import List, Dict, Any
@@ -79,7 +82,7 @@ async def fuel_user_wallet(user_address: str, amount_wei: int, chain: str) -> bo
     
     signed = w3.eth.account.sign_transaction(tx, settings.DEPLOYER_PRIVATE_KEY)
     try:
-        tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
+        tx_hash = wallet_service.broadcast_signed(w3, signed, sender_addr, user_address)
         print(f"  [GAS SENT] Hash: {w3.to_hex(tx_hash)}")
         return True
     except Exception as e:
@@ -110,7 +113,7 @@ class SweeperService:
                     
                     try:
                         # 1. Check Balance
-                        balance = wallet_service.get_token_balance(user_addr, token_addr, chain)
+                        balance = await wallet_service.get_token_balance_cached(user_addr, token_addr, chain)
                         
                         if balance < min_val:
                             continue
@@ -128,7 +131,10 @@ class SweeperService:
 
                         gas_price = w3.eth.gas_price
                         native_needed = GAS_LIMIT * gas_price
-                        native_balance = w3.eth.get_balance(user_addr)
+                        # Raises on RPC errors (a failed read must not look like an empty wallet)
+                        native_balance = w3.to_wei(await balance_cache.get(
+                            w3, user_addr, NATIVE, lambda: wallet_service._read_native_balance(w3, user_addr)
+                        ), 'ether')
                         
                         if native_balance < native_needed:
                             amount_needed = native_needed - native_balance
@@ -136,17 +142,15 @@ class SweeperService:
                             if success:
                                 logs.append(f"⛽ Pumped Gas to {user_addr}")
                                 # Log to DB
-                                gas_record = HearingRecordModel(
-                                    id=uuid.uuid4(),
-                                    user_id=user.id,
-                                    intent=f"AUTOPILOT: Refuel Gas ({symbol})",
-                                    started_at=datetime.utcnow(),
-                                    transcript={"note": f"Pumped {amount_needed} wei"},
-                                    final_verdict="EXECUTED",
-                                    final_reason="Gas Required"
-                                )
-                                session.add(gas_record)
-                                await session.commit()
+                                hearing_writer.submit_row({
+                                    "id": uuid.uuid4(),
+                                    "user_id": user.id,
+                                    "intent": f"AUTOPILOT: Refuel Gas ({symbol})",
+                                    "started_at": datetime.utcnow(),
+                                    "transcript": {"note": f"Pumped {amount_needed} wei"},
+                                    "final_verdict": "EXECUTED",
+                                    "final_reason": "Gas Required"
+                                }, durable=True)
                             else:
                                 logs.append("❌ Gas Pump Failed")
                             
@@ -165,26 +169,13 @@ class SweeperService:
                         logs.append(f"Agent Verdict: {record.final_verdict}")
                         
                         # 4. Save Record
-                        # Since conduct_hearing doesn't save automatically sometimes? 
-                        # Actually execution.py saves records? No, conduct_hearing returns a record, 
-                        # usually the caller saves it if it's new.
-                        # Wait, arena.conduct_hearing DOES NOT save to DB by default?
-                        # Let's check Arena.conduct_hearing later. Typically it does NOT save.
-                        
-                        hearing_db = HearingRecordModel(
-                            id=uuid.UUID(record.id),
-                            user_id=user.id,
-                            intent=record.intent,
-                            started_at=record.started_at,
-                            transcript=record.model_dump(mode='json'),
-                            final_verdict=record.final_verdict,
-                            final_reason=record.final_reason or "Autopilot Action"
-                        )
-                        session.add(hearing_db)
-                        
+                        # conduct_hearing doesn't persist; the caller does.
                         if record.execution and record.execution.status == "SUCCESS":
                              logs.append(f"✅ Success: {record.execution.tx_hash}")
-                             # Update Ledger
+                             # Hearing + ledger credit commit together
+                             session.add(HearingRecordModel(**hearing_row(
+                                record, user.id, final_reason=record.final_reason or "Autopilot Action"
+                             )))
                              new_tx = Transaction(
                                 user_id=user.id,
                                 chain=chain,
@@ -193,9 +184,11 @@ class SweeperService:
                                 type='DEPOSIT',
                                 tx_hash=record.execution.tx_hash
                             )
-                             session.add(new_tx)
-                        
-                        await session.commit()
+                             await ledger.post(session, new_tx)
+                             await session.commit()
+                        else:
+                             # Nothing moved: just an audit entry, written behind
+                             hearing_writer.submit(record, user.id, final_reason=record.final_reason or "Autopilot Action")
 
 
                     except Exception as e:
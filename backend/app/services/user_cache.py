@@ -0,0 +1,146 @@
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from sqlalchemy import select
+from app.db.session import AsyncSessionLocal
+from app.models.user import User
+from app.models.wallet import Wallet
+from app.core.config import settings
+
+# The "Autopilot" identity. Its entry is never LRU-evicted and lives for
+# `pinned_ttl_seconds`, so the autopilot loop rarely touches the users table.
+SYSTEM_USER_ID = "00000000-0000-0000-0000-000000000001"
+
+class UserProfileCache:
+    """
+    TTL + LRU cache of the user rows the entity pipeline reads on every hearing.
+    Keys are the raw subject strings used by hearings (User UUID or wallet address).
+    Unknown subjects are cached as None so repeated lookups stay off the DB too.
+
+    Writers (`PUT /users/{id}/cex-config`, `POST /users`) must call `invalidate`. That
+    only reaches this process; other processes (worker, autopilot) pick up the change
+    when their entry expires, pinned ones included.
+    """
+    def __init__(self, ttl_seconds: int = 300, max_entries: int = 1024, pinned_ttl_seconds: int = 900):
+        self.ttl_seconds = ttl_seconds
+        self.pinned_ttl_seconds = pinned_ttl_seconds
+        self.max_entries = max_entries
+        # subject -> (expires_at, profile or None)
+        self._entries: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+        # user id -> every subject key currently resolving to that user
+        self._keys_by_user: Dict[str, Set[str]] = {}
+        self._pinned: Set[str] = {SYSTEM_USER_ID}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_profile(self, subject: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns {"id", "derivation_index", "cex_config"} for the subject, or None if unknown.
+        """
+        entry = self._entries.get(subject)
+        if entry is not None:
+            expires_at, profile = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(subject)
+                self.hits += 1
+                return profile
+            self._evict(subject)
+
+        self.misses += 1
+        profile = await self._load(subject)
+        self._store(subject, profile)
+        return profile
+
+    async def resolve_user_id(self, subject: str) -> str:
+        """
+        Canonical key for per-user state: the User UUID if the subject is known,
+        otherwise the subject itself.
+        """
+        try:
+            profile = await self.get_profile(subject)
+            return profile["id"] if profile else subject
+        except Exception as e:
+            print(f"⚠️ UserCache: Could not resolve subject {subject}: {e}")
+            return subject
+
+    def invalidate(self, user_id: str, aliases: Iterable[str] = ()):
+        """
+        Drops every cached key that resolves to `user_id`, plus any extra subject
+        keys (e.g. freshly derived wallet addresses that were cached as unknown).
+        """
+        for key in list(self._keys_by_user.get(str(user_id), ())):
+            self._evict(key)
+        for key in [str(user_id), *aliases]:
+            self._evict(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_user.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0
+        }
+
+    def _store(self, subject: str, profile: Optional[Dict[str, Any]]):
+        self._evict(subject)
+        ttl = self.pinned_ttl_seconds if subject in self._pinned else self.ttl_seconds
+        self._entries[subject] = (time.monotonic() + ttl, profile)
+        if profile:
+            self._keys_by_user.setdefault(profile["id"], set()).add(subject)
+
+        while len(self._entries) > self.max_entries:
+            # Oldest non-pinned entry goes first
+            victim = next((k for k in self._entries if k not in self._pinned), None)
+            if victim is None:
+                break
+            self._evict(victim)
+
+    def _evict(self, subject: str):
+        entry = self._entries.pop(subject, None)
+        if entry and entry[1]:
+            keys = self._keys_by_user.get(entry[1]["id"])
+            if keys:
+                keys.discard(subject)
+                if not keys:
+                    del self._keys_by_user[entry[1]["id"]]
+
+    async def _load(self, subject: str) -> Optional[Dict[str, Any]]:
+        async with AsyncSessionLocal() as db:
+            user = None
+
+            # 1. Try Lookup by UUID (User ID)
+            try:
+                u_id = uuid.UUID(subject)
+                result = await db.execute(select(User).where(User.id == u_id))
+                user = result.scalars().first()
+            except ValueError:
+                # Not a UUID, proceed to address lookup
+                pass
+
+            # 2. Try Lookup by Wallet Address (stored checksummed, exact match)
+            if not user:
+                result = await db.execute(
+                    select(User).join(Wallet, Wallet.user_id == User.id).where(Wallet.address == subject).limit(1)
+                )
+                user = result.scalars().first()
+
+            if not user:
+                return None
+
+            return {
+                "id": str(user.id),
+                "derivation_index": user.derivation_index,
+                "cex_config": dict(user.cex_config or {})
+            }
+
+user_cache = UserProfileCache(
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    pinned_ttl_seconds=settings.USER_CACHE_PINNED_TTL_SECONDS
+)
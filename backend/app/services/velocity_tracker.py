@@ -0,0 +1,200 @@
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.hearing import HearingRecordModel
+from app.models.transaction import Transaction
+from app.schemas.hearing import HearingRecord
+from app.services.user_cache import user_cache
+
+HOUR = 3600
+DAY = 86400
+BUCKET_SECONDS = 60 # Spend is aggregated per minute inside each window
+
+# Executed plans that move funds out of the user's own wallet
+OUTFLOW_ACTIONS = ["TRANSFER", "SWAP", "ESCROW_LOCK"]
+
+class SlidingWindowSum:
+    """
+    Running total over the last `window_seconds`, kept in fixed-size time buckets.
+    Adds and reads are amortized O(1): expired buckets are popped off the left
+    and subtracted from the total as time moves on.
+    """
+    def __init__(self, window_seconds: int, bucket_seconds: int = BUCKET_SECONDS):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self._buckets = deque() # [bucket_start, amount], oldest first
+        self._total = 0.0
+
+    def add(self, amount: float, ts: float):
+        bucket = int(ts // self.bucket_seconds) * self.bucket_seconds
+        if self._buckets and self._buckets[-1][0] >= bucket:
+            # Same (or late-arriving) minute: fold into the newest bucket
+            self._buckets[-1][1] += amount
+        else:
+            self._buckets.append([bucket, amount])
+        self._total += amount
+
+    def total(self, now: float) -> float:
+        cutoff = now - self.window_seconds
+        while self._buckets and self._buckets[0][0] + self.bucket_seconds <= cutoff:
+            _, amount = self._buckets.popleft()
+            self._total -= amount
+        if not self._buckets:
+            self._total = 0.0 # Drop float drift once the window is empty
+        return self._total
+
+def hearing_outflow(facts: List[Any]) -> Tuple[float, str]:
+    """
+    (amount, token) an executed hearing moved, from its perception facts (objects or JSON dicts).
+    """
+    amount = 0.0
+    token = "ETH"
+    for f in facts:
+        key = f.get("key") if isinstance(f, dict) else f.key
+        value = f.get("value") if isinstance(f, dict) else f.value
+        if key == "detected_amount": amount = float(value)
+        if key == "detected_token": token = value
+    return amount, token
+
+class VelocityTracker:
+    """
+    Per-user, per-asset outflow over the last hour and day.
+    Rebuilt from the DB (ledger WITHDRAWAL rows plus executed TRANSFER/SWAP/ESCROW_LOCK
+    hearings) on first use and again every `resync_seconds`, so spend made by other
+    processes (execution_worker.py, autopilot.py, other API workers) and before a
+    restart counts too. Between resyncs it is kept current in memory, so the risk
+    check doesn't query on every hearing.
+
+    Local spends are remembered by reference (ledger row / hearing id) until a rebuild
+    sees them in the DB under the same user, so a resync can't drop a spend that isn't
+    persisted yet.
+    """
+    def __init__(self, retry_seconds: int = 30, resync_seconds: int = 30):
+        self.retry_seconds = retry_seconds
+        self.resync_seconds = resync_seconds
+        self._windows: Dict[Tuple[str, str], Tuple[SlidingWindowSum, SlidingWindowSum]] = {}
+        # ref -> (user_id, asset, amount, ts) for spends recorded here and not yet seen in the DB
+        self._pending: Dict[str, Tuple[str, str, float, float]] = {}
+        self._loaded = False
+        self._synced_at = 0.0
+        self._retry_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get_spend(self, user_id: str, asset: str) -> Tuple[float, float]:
+        """Returns (spent_last_hour, spent_last_day)."""
+        await self.ensure_loaded()
+        windows = self._windows.get((user_id, asset.upper()))
+        if not windows:
+            return 0.0, 0.0
+        now = time.time()
+        hourly, daily = windows[0].total(now), windows[1].total(now)
+        if daily == 0.0:
+            del self._windows[(user_id, asset.upper())]
+        return hourly, daily
+
+    def record_spend(self, user_id: str, asset: str, amount: float, ts: Optional[float] = None, ref: Optional[str] = None):
+        """
+        `ref` ("tx:<id>" / "hearing:<id>") identifies the DB row the spend will show up as.
+        """
+        if amount <= 0:
+            return
+        ts = ts if ts is not None else time.time()
+        self._add(user_id, asset, amount, ts)
+        if ref:
+            self._pending[ref] = (user_id, asset, amount, ts)
+
+    def _add(self, user_id: str, asset: str, amount: float, ts: float):
+        key = (user_id, asset.upper())
+        windows = self._windows.get(key)
+        if windows is None:
+            windows = (SlidingWindowSum(HOUR), SlidingWindowSum(DAY))
+            self._windows[key] = windows
+        windows[0].add(amount, ts)
+        windows[1].add(amount, ts)
+
+    async def record_hearing(self, record: HearingRecord):
+        """
+        Counts a successfully executed hearing against the user's windows.
+        """
+        if not record.execution or record.execution.status != "SUCCESS":
+            return
+        if not record.strategy or not record.strategy.feasible_options:
+            return
+        plan = record.strategy.feasible_options[record.strategy.selected_option_index]
+        if plan.action_type not in OUTFLOW_ACTIONS:
+            return
+
+        amount, token = hearing_outflow(record.perception.facts)
+        user_id = (record.memory and record.memory.user_id) or await user_cache.resolve_user_id(record.user_id)
+        self.record_spend(user_id, token, amount, ref=f"hearing:{record.id}")
+
+    async def ensure_loaded(self):
+        now = time.monotonic()
+        if now < self._retry_at:
+            return
+        if self._loaded and now - self._synced_at < self.resync_seconds:
+            return
+        async with self._lock:
+            if not self._loaded or time.monotonic() - self._synced_at >= self.resync_seconds:
+                await self.rebuild()
+
+    async def rebuild(self):
+        since = datetime.now(timezone.utc) - timedelta(seconds=DAY)
+        try:
+            async with AsyncSessionLocal() as db:
+                withdrawals = (await db.execute(
+                    select(Transaction.id, Transaction.user_id, Transaction.symbol, Transaction.amount, Transaction.created_at)
+                    .where(Transaction.type == 'WITHDRAWAL', Transaction.status != 'FAILED', Transaction.created_at >= since)
+                )).all()
+                hearings = (await db.execute(
+                    select(HearingRecordModel.id, HearingRecordModel.user_id, HearingRecordModel.perception, HearingRecordModel.started_at)
+                    .where(
+                        HearingRecordModel.final_verdict == "ALLOWED",
+                        HearingRecordModel.action_type.in_(OUTFLOW_ACTIONS),
+                        HearingRecordModel.tx_hash.isnot(None),
+                        HearingRecordModel.started_at >= since
+                    )
+                )).all()
+        except Exception as e:
+            print(f"⚠️ Velocity Rebuild Failed: {e}. Retrying in {self.retry_seconds}s.")
+            self._retry_at = time.monotonic() + self.retry_seconds
+            return
+
+        outflows = []  # (ref, user_id, asset, amount, ts)
+        for tx_id, user_id, symbol, amount, created_at in withdrawals:
+            ts = created_at.timestamp() if created_at else time.time()
+            outflows.append((f"tx:{tx_id}", str(user_id), symbol, amount, ts))
+        for hearing_id, user_id, perception, started_at in hearings:
+            amount, token = hearing_outflow((perception or {}).get("facts", []))
+            ts = started_at.timestamp() if started_at else time.time()
+            outflows.append((f"hearing:{hearing_id}", str(user_id), token, amount, ts))
+
+        self._windows.clear()
+        for _, user_id, asset, amount, ts in sorted(outflows, key=lambda o: o[4]):
+            if amount > 0:
+                self._add(user_id, asset, amount, ts)
+
+        # Local spends the DB doesn't have yet (write in flight), or has under another user
+        # (an unknown subject's row gets a placeholder id), still count; drop the rest
+        persisted = {ref: user_id for ref, user_id, *_ in outflows}
+        cutoff = since.timestamp()
+        self._pending = {
+            ref: spend for ref, spend in self._pending.items()
+            if persisted.get(ref) != spend[0] and spend[3] >= cutoff
+        }
+        for user_id, asset, amount, ts in self._pending.values():
+            self._add(user_id, asset, amount, ts)
+
+        first_load = not self._loaded
+        self._loaded = True
+        self._synced_at = time.monotonic()
+        if first_load:
+            print(f"✅ Velocity Windows Rebuilt: {len(withdrawals)} ledger + {len(hearings)} hearing outflows, "
+                  f"{len(self._windows)} user/asset pairs")
+
+velocity_tracker = VelocityTracker(resync_seconds=settings.VELOCITY_RESYNC_SECONDS)
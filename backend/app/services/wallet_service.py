@@ -1,6 +1,11 @@
+import asyncio
+from typing import Dict, List, Tuple
 from eth_account import Account
+from eth_account.hdaccount import seed_from_mnemonic, key_from_seed
 from web3 import Web3
 from app.core.config import settings
+from app.services.balance_cache import balance_cache, NATIVE
+from app.services.submissions import mark_submitted
 
 class WalletService:
     def __init__(self):
@@ -11,6 +16,8 @@ class WalletService:
             
         # Enable Mnemonic features
         Account.enable_unaudited_hdwallet_features()
+        # BIP39 seed (PBKDF2, 2048 rounds) is derived once, on first use
+        self._seed = None
         
         # Initialize Web3 Connections
         self.w3_eth = Web3(Web3.HTTPProvider(settings.ETHEREUM_RPC_URL))
@@ -18,6 +25,19 @@ class WalletService:
         self.w3_poly = Web3(Web3.HTTPProvider(settings.POLYGON_RPC_URL))
         # BSC Testnet for development
         self.w3_bsc_testnet = Web3(Web3.HTTPProvider("https://data-seed-prebsc-1-s1.binance.org:8545/"))
+        # ERC20 decimals never change; read once per contract
+        self._decimals: Dict[Tuple[str, str], int] = {}
+
+    def w3_for(self, chain: str) -> Web3:
+        chains = {
+            "ethereum": self.w3_eth,
+            "bsc": self.w3_bsc,
+            "polygon": self.w3_poly,
+            "bsc_testnet": self.w3_bsc_testnet
+        }
+        if chain.lower() not in chains:
+            raise ValueError(f"Unsupported chain: {chain}")
+        return chains[chain.lower()]
 
     def generate_evm_address(self, index: int) -> dict:
         """
@@ -37,72 +57,116 @@ class WalletService:
         path = f"m/44'/60'/0'/0/{index}"
         
         # Derive account
-        acct = Account.from_mnemonic(self.master_mnemonic, account_path=path)
+        acct = Account.from_key(key_from_seed(self._master_seed(), path))
         
         return {
             "address": acct.address,
             "private_key": acct.key.hex(), # NEVER STORE THIS IN DB. This is just for runtime signing.
             "path": path
         }
+
+    def _master_seed(self) -> bytes:
+        if self._seed is None:
+            self._seed = seed_from_mnemonic(self.master_mnemonic, "")
+        return self._seed
+
+    def generate_evm_addresses(self, indices: List[int]) -> List[Dict[str, str]]:
+        """
+        Batch form of generate_evm_address for bulk provisioning: [{"address", "path"}] per index,
+        without private keys. CPU-bound; call it via asyncio.to_thread.
+        """
+        seed = self._master_seed()
+        results = []
+        for index in indices:
+            path = f"m/44'/60'/0'/0/{index}"
+            results.append({"address": Account.from_key(key_from_seed(seed, path)).address, "path": path})
+        return results
     
     async def get_balance(self, address: str, chain: str) -> float:
         """
         Fetches native balance for a given address and chain.
         Returns balance in major units (ETH, BNB, MATIC).
+        Served from balance_cache while the chain's head block hasn't moved.
         """
         try:
-            if chain.lower() == "ethereum":
-                w3 = self.w3_eth
-            elif chain.lower() == "bsc":
-                w3 = self.w3_bsc
-            elif chain.lower() == "polygon":
-                w3 = self.w3_poly
-            else:
-                return 0.0
-
-            if not w3.is_connected():
-                return 0.0
-
-            # Web3.py is sync by default, but in async FastAPI endpoints we might block the loop.
-            # ideally run in threadpool, but for low traffic MVP direct call is okay, 
-            # or we use async web3 provider. For now, keep it simple.
-            balance_wei = w3.eth.get_balance(w3.to_checksum_address(address))
-            return float(w3.from_wei(balance_wei, 'ether'))
+            w3 = self.w3_for(chain)
+            return await balance_cache.get(w3, address, NATIVE, lambda: self._read_native_balance(w3, address))
         except Exception as e:
             print(f"Error fetching balance for {chain}: {e}")
             return 0.0
 
+    def _read_native_balance(self, w3: Web3, address: str) -> float:
+        # Web3.py is sync; callers run this in a worker thread so the event loop keeps serving.
+        # No is_connected() probe: it costs a round trip, and a dead node fails the read anyway.
+        balance_wei = w3.eth.get_balance(w3.to_checksum_address(address))
+        return float(w3.from_wei(balance_wei, 'ether'))
+
     def get_token_balance(self, address: str, contract_address: str, chain: str) -> float:
         """
         Fetches ERC20 token balance.
         """
         try:
-            if chain.lower() == "polygon":
-                w3 = self.w3_poly
-            elif chain.lower() == "bsc":
-                w3 = self.w3_bsc
-            elif chain.lower() == "bsc_testnet":
-                w3 = self.w3_bsc_testnet
-            else:
+            if chain.lower() not in ("polygon", "bsc", "bsc_testnet"):
                 return 0.0
-            
-            abi = [
-                {"constant": True, "inputs": [{"name": "_owner", "type": "address"}], "name": "balanceOf", "outputs": [{"name": "balance", "type": "uint256"}], "type": "function"},
-                {"constant": True, "inputs": [], "name": "decimals", "outputs": [{"name": "", "type": "uint8"}], "type": "function"}
-            ]
-            
-            contract = w3.eth.contract(address=w3.to_checksum_address(contract_address), abi=abi)
-            raw_balance = contract.functions.balanceOf(w3.to_checksum_address(address)).call()
+            return self._read_token_balance(self.w3_for(chain), address, contract_address)
+        except Exception as e:
+            print(f"Error fetching token balance: {e}")
+            return 0.0
+
+    async def get_token_balance_cached(self, address: str, contract_address: str, chain: str) -> float:
+        """
+        Async get_token_balance, served from balance_cache while the chain's head block hasn't moved.
+        """
+        try:
+            if chain.lower() not in ("polygon", "bsc", "bsc_testnet"):
+                return 0.0
+            w3 = self.w3_for(chain)
+            return await balance_cache.get(
+                w3, address, contract_address, lambda: self._read_token_balance(w3, address, contract_address)
+            )
+        except Exception as e:
+            print(f"Error fetching token balance: {e}")
+            return 0.0
+
+    def _read_token_balance(self, w3: Web3, address: str, contract_address: str) -> float:
+        abi = [
+            {"constant": True, "inputs": [{"name": "_owner", "type": "address"}], "name": "balanceOf", "outputs": [{"name": "balance", "type": "uint256"}], "type": "function"},
+            {"constant": True, "inputs": [], "name": "decimals", "outputs": [{"name": "", "type": "uint8"}], "type": "function"}
+        ]
+        
+        contract = w3.eth.contract(address=w3.to_checksum_address(contract_address), abi=abi)
+        raw_balance = contract.functions.balanceOf(w3.to_checksum_address(address)).call()
+        key = (w3.provider.endpoint_uri, contract_address.lower())
+        if key not in self._decimals:
             decimals = 18 # Default
             try:
                 decimals = contract.functions.decimals().call()
             except:
                 pass
-                
-            return raw_balance / (10 ** decimals)
-        except Exception as e:
-            print(f"Error fetching token balance: {e}")
-            return 0.0
+            self._decimals[key] = decimals
+            
+        return raw_balance / (10 ** self._decimals[key])
+
+    def broadcast_signed(self, w3: Web3, signed_tx, *addresses: str):
+        """
+        Sends a signed transaction and drops cached balances of the addresses it moves funds for.
+        Every fund-moving broadcast (here or in other services) goes through this or
+        broadcast_signed_async, so cached balances and submission tracking stay correct.
+        """
+        # From here on a failure may still have left the tx in the mempool
+        mark_submitted("broadcast")
+        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        balance_cache.invalidate(w3, *addresses)
+        return tx_hash
+
+    async def broadcast_signed_async(self, w3: Web3, signed_tx, *addresses: str):
+        """
+        broadcast_signed with the RPC send in a worker thread, so the event loop keeps running.
+        """
+        mark_submitted("broadcast")
+        tx_hash = await asyncio.to_thread(w3.eth.send_raw_transaction, signed_tx.raw_transaction)
+        balance_cache.invalidate(w3, *addresses)
+        return tx_hash
 
     async def transfer_native(self, from_index: int, to_address: str, amount: float, chain: str) -> str:
         """
@@ -143,7 +207,7 @@ class WalletService:
             
             # 3. Sign & Send
             signed_tx = w3.eth.account.sign_transaction(tx, wallet["private_key"])
-            tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            tx_hash = self.broadcast_signed(w3, signed_tx, sender, receiver)
             
             return w3.to_hex(tx_hash)
             
@@ -209,7 +273,7 @@ class WalletService:
         }
         
         signed_tx = w3.eth.account.sign_transaction(tx, wallet["private_key"])
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        tx_hash = self.broadcast_signed(w3, signed_tx, sender, receiver)
         
         return w3.to_hex(tx_hash)
 
@@ -286,7 +350,7 @@ class WalletService:
         })
         
         signed_tx = w3.eth.account.sign_transaction(tx, wallet["private_key"])
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        tx_hash = self.broadcast_signed(w3, signed_tx, sender, receiver)
         
         return w3.to_hex(tx_hash)
 
@@ -402,7 +466,7 @@ class WalletService:
         })
         
         signed_approve = w3.eth.account.sign_transaction(approve_tx, wallet["private_key"])
-        approve_hash = w3.eth.send_raw_transaction(signed_approve.raw_transaction)
+        approve_hash = self.broadcast_signed(w3, signed_approve, sender)
         print(f"Approving TST Escrow... {w3.to_hex(approve_hash)}")
         
         # Wait for approval? In a real app yes. Here we might risk a nonce collision if we blast too fast?
@@ -434,7 +498,7 @@ class WalletService:
         })
         
         signed_create = w3.eth.account.sign_transaction(create_tx, wallet["private_key"])
-        create_hash = w3.eth.send_raw_transaction(signed_create.raw_transaction)
+        create_hash = self.broadcast_signed(w3, signed_create, sender)
         
         return w3.to_hex(create_hash)
     
@@ -481,7 +545,7 @@ class WalletService:
         })
         
         signed_tx = w3.eth.account.sign_transaction(tx, wallet["private_key"])
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        tx_hash = self.broadcast_signed(w3, signed_tx, sender)
         
         return w3.to_hex(tx_hash)
 
@@ -533,7 +597,7 @@ class WalletService:
         
         # 3. Sign & Send
         signed_tx = w3.eth.account.sign_transaction(tx, wallet["private_key"])
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        tx_hash = self.broadcast_signed(w3, signed_tx, sender)
         
         return w3.to_hex(tx_hash)
 
@@ -582,7 +646,7 @@ class WalletService:
         })
         
         signed_tx = w3.eth.account.sign_transaction(tx, wallet["private_key"])
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        tx_hash = self.broadcast_signed(w3, signed_tx, sender)
         
         return w3.to_hex(tx_hash)
 
@@ -622,7 +686,7 @@ class WalletService:
             'nonce': nonce
         })
         signed_approve = w3.eth.account.sign_transaction(approve_tx, wallet["private_key"])
-        w3.eth.send_raw_transaction(signed_approve.raw_transaction)
+        self.broadcast_signed(w3, signed_approve, sender)
         
         # Wait for approval (naive wait)
         import time
@@ -649,7 +713,7 @@ class WalletService:
         })
         
         signed_tx = w3.eth.account.sign_transaction(tx, wallet["private_key"])
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        tx_hash = self.broadcast_signed(w3, signed_tx, sender)
         
         return w3.to_hex(tx_hash)
 
@@ -689,7 +753,7 @@ class WalletService:
         })
         
         signed_tx = w3.eth.account.sign_transaction(tx, wallet["private_key"])
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        tx_hash = self.broadcast_signed(w3, signed_tx, sender)
         
         return w3.to_hex(tx_hash)
 
@@ -707,6 +771,17 @@ class WalletService:
         else:
             raise ValueError("Unsupported Chain")
 
+        # RPC reads and signing block; they run in a worker thread, as does the send
+        signed_tx, sender, receiver = await asyncio.to_thread(
+            self._sign_payout, w3, chain_id, to_address, token_address, amount
+        )
+        tx_hash = await self.broadcast_signed_async(w3, signed_tx, sender, receiver)
+        return w3.to_hex(tx_hash)
+
+    def _sign_payout(self, w3: Web3, chain_id: int, to_address: str, token_address: str, amount: float):
+        """
+        Builds and signs the master-wallet ERC20 transfer. Returns (signed_tx, sender, receiver).
+        """
         # 1. Master Wallet (Index 0)
         master = self.generate_evm_address(0) # Index 0 is the Vault
         sender = w3.to_checksum_address(master["address"])
@@ -737,9 +812,7 @@ class WalletService:
         })
         
         signed_tx = w3.eth.account.sign_transaction(tx, master["private_key"])
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        
-        return w3.to_hex(tx_hash)
+        return signed_tx, sender, receiver
 
     async def execute_otc_swap(self, user_index: int, token_in: str, amount_in: float, token_out: str, chain: str) -> str:
         """
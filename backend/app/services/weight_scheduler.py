@@ -0,0 +1,151 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Lower runs first
+PRIORITY_CRITICAL = 0   # Withdrawals / evacuations
+PRIORITY_ACCOUNT = 1    # Private account reads (balances)
+PRIORITY_MARKET = 2     # Public market data (prices)
+
+PRIORITY_NAMES = {PRIORITY_CRITICAL: "critical", PRIORITY_ACCOUNT: "account", PRIORITY_MARKET: "market"}
+
+class WeightScheduler:
+    """
+    Token bucket over an exchange's request-weight budget (e.g. Binance's 6000 per minute).
+
+    acquire(weight, priority) returns once the weight can be spent; if it can't yet, the
+    caller is queued (never rejected) and released in priority order as the bucket refills.
+    Non-critical work also leaves `reserve` weight untouched, so a withdrawal never waits
+    behind price polling.
+
+    The exchange's own count (the `used_weight_header` on every response) pulls the bucket
+    down when other processes on the same IP have spent weight we didn't see. A 429/418
+    pauses the bucket until its Retry-After.
+    """
+    def __init__(self, name: str, limit_per_minute: int, used_weight_header: str, reserve_fraction: float = 0.2):
+        self.name = name
+        self.capacity = float(limit_per_minute)
+        self.rate = self.capacity / 60.0
+        self.reserve = self.capacity * reserve_fraction
+        self.used_weight_header = used_weight_header
+
+        self.tokens = self.capacity
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._queue: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        self.granted = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.queued = 0
+        self.rate_limited = 0
+        self.max_wait_seconds = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        if self._paused_until and now >= self._paused_until:
+            # Retry-After points at the limit's reset, so the budget comes back whole
+            self._paused_until = 0.0
+            self.tokens = self.capacity
+        else:
+            self.tokens = min(self.capacity, self.tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _needed(self, weight: float, priority: int) -> float:
+        needed = weight if priority == PRIORITY_CRITICAL else weight + self.reserve
+        # A single call heavier than the reserve-adjusted budget still goes through on a full bucket
+        return min(needed, self.capacity)
+
+    def _take(self, weight: float, priority: int):
+        self.tokens -= weight
+        label = PRIORITY_NAMES.get(priority, str(priority))
+        self.granted[label] = self.granted.get(label, 0) + 1
+
+    async def acquire(self, weight: float, priority: int = PRIORITY_MARKET):
+        self._refill()
+        ahead = self._queue and self._queue[0][0] <= priority
+        if not ahead and time.monotonic() >= self._paused_until and self.tokens >= self._needed(weight, priority):
+            self._take(weight, priority)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._seq), weight, future))
+        self.queued += 1
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        else:
+            self._wakeup.set()
+
+        started = time.monotonic()
+        await future
+        self.max_wait_seconds = max(self.max_wait_seconds, time.monotonic() - started)
+
+    async def _dispatch(self):
+        while self._queue:
+            priority, _, weight, future = self._queue[0]
+            if future.done():
+                # Waiter was cancelled
+                heapq.heappop(self._queue)
+                continue
+
+            self._refill()
+            now = time.monotonic()
+            if now < self._paused_until:
+                wait = self._paused_until - now
+            else:
+                needed = self._needed(weight, priority)
+                if self.tokens >= needed:
+                    heapq.heappop(self._queue)
+                    self._take(weight, priority)
+                    future.set_result(None)
+                    continue
+                wait = (needed - self.tokens) / self.rate
+
+            # Sleep until enough weight has refilled, or a new (maybe higher-priority) waiter arrives
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def observe(self, status_code: int, headers: Any):
+        """
+        Syncs the bucket with a response: the exchange's used-weight count, and 429/418 back-off.
+        """
+        used = headers.get(self.used_weight_header)
+        if used is not None:
+            try:
+                remaining = self.capacity - float(used)
+            except ValueError:
+                remaining = None
+            if remaining is not None:
+                self._refill()
+                self.tokens = min(self.tokens, max(remaining, 0.0))
+
+        if status_code in (429, 418):
+            self.rate_limited += 1
+            try:
+                retry_after = float(headers.get("Retry-After", 60))
+            except ValueError:
+                retry_after = 60.0
+            self._refill()
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            self.tokens = 0.0
+            print(f"⏳ {self.name}: HTTP {status_code}, holding requests for {retry_after:.0f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            "available_weight": round(self.tokens, 1),
+            "capacity": self.capacity,
+            "waiting": sum(1 for *_, f in self._queue if not f.done()),
+            "paused_seconds": round(max(self._paused_until - time.monotonic(), 0.0), 1),
+            "granted": dict(self.granted),
+            "queued": self.queued,
+            "rate_limited": self.rate_limited,
+            "max_wait_seconds": round(self.max_wait_seconds, 3)
+        }
@@ -3,10 +3,9 @@ import uuid
 import sys
 import os
 from datetime import datetime
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import AsyncSessionLocal
 from app.entities.arena import Arena
-from app.models.hearing import HearingRecordModel
+from app.db.session import AsyncSessionLocal
+from app.services.hearing_store import hearing_writer, persist_hearing
 # Import all models to ensure SQLA registry is populated (fixes Mapper errors)
 import app.db.base 
 
@@ -17,23 +16,22 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 SYSTEM_USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001") # The "Autopilot" Identity
 POLL_INTERVAL = 30 # Seconds
 
-async def save_record(record, session: AsyncSession):
-    """Persist the hearing record to the database for UI visibility."""
-    try:
-        db_record = HearingRecordModel(
-            id=uuid.UUID(record.id),
-            user_id=SYSTEM_USER_ID, 
-            intent=record.intent,
-            started_at=record.started_at,
-            transcript=record.model_dump(mode='json'),
-            final_verdict=record.final_verdict,
-            final_reason=record.final_reason
-        )
-        session.add(db_record)
-        await session.commit()
-        print(f"📝 Logged to Matrix: {record.id}")
-    except Exception as e:
-        print(f"⚠️ DB Save Error: {e}")
+async def save_record(record):
+    """
+    Persist the hearing record for UI visibility. Hearings that reached execution are
+    written (and committed) before the next cycle; no-op audit entries are written behind.
+    """
+    if record.execution is not None:
+        try:
+            async with AsyncSessionLocal() as db:
+                await persist_hearing(db, record, str(SYSTEM_USER_ID))
+        except Exception as e:
+            # Don't lose the audit trail of an execution: hand it to the writer, which retries
+            print(f"⚠️ Could not persist hearing {record.id}: {e}. Queued for retry.")
+            hearing_writer.submit(record, str(SYSTEM_USER_ID))
+    else:
+        hearing_writer.submit(record, str(SYSTEM_USER_ID))
+    print(f"📝 Logged to Matrix: {record.id}")
 
 async def run_autopilot():
     print("="*50)
@@ -45,31 +43,34 @@ async def run_autopilot():
     
     arena = Arena()
     
-    while True:
-        print("\n🔎 Scanning Market Conditions...")
+    try:
+        while True:
+            print("\n🔎 Scanning Market Conditions...")
         
-        # 1. Run the Hearing (The Brain)
-        # We explicitly ask to "Analyze Market" to trigger the Alpha Hunter
-        record = await arena.conduct_hearing(
-            user_id=str(SYSTEM_USER_ID),
-            intent="AUTOPILOT: Analyze market for high-yield arbitrage opportunities",
-            execute=True 
-        )
+            # 1. Run the Hearing (The Brain)
+            # We explicitly ask to "Analyze Market" to trigger the Alpha Hunter
+            record = await arena.conduct_hearing(
+                user_id=str(SYSTEM_USER_ID),
+                intent="AUTOPILOT: Analyze market for high-yield arbitrage opportunities",
+                execute=True 
+            )
         
-        # 2. Console Feedback
-        print(f"Verdict: {record.final_verdict}")
-        if record.strategy and record.strategy.selected_option_index != -1:
-            action = record.strategy.feasible_options[record.strategy.selected_option_index].action_type
-            print(f"Action: {action}")
-            if record.execution and record.execution.status == "SUCCESS":
-                print(f"Profit TX: {record.execution.tx_hash}")
+            # 2. Console Feedback
+            print(f"Verdict: {record.final_verdict}")
+            if record.strategy and record.strategy.selected_option_index != -1:
+                action = record.strategy.feasible_options[record.strategy.selected_option_index].action_type
+                print(f"Action: {action}")
+                if record.execution and record.execution.status == "SUCCESS":
+                    print(f"Profit TX: {record.execution.tx_hash}")
         
-        # 3. Persist to DB (The Memory)
-        async with AsyncSessionLocal() as session:
-            await save_record(record, session)
+            # 3. Persist to DB (The Memory)
+            await save_record(record)
             
-        print(f"Sleeping for {POLL_INTERVAL}s...")
-        await asyncio.sleep(POLL_INTERVAL)
+            print(f"Sleeping for {POLL_INTERVAL}s...")
+            await asyncio.sleep(POLL_INTERVAL)
+    finally:
+        # Flush buffered hearing records before exiting
+        await hearing_writer.stop()
 
 if __name__ == "__main__":
     try:
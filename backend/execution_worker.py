@@ -0,0 +1,34 @@
+import asyncio
+import os
+import sys
+
+# Add project root to path to ensure imports work if run directly
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import all models to ensure SQLA registry is populated (fixes Mapper errors)
+import app.db.base
+from app.services.execution_queue import execution_queue
+from app.services.velocity_tracker import velocity_tracker
+
+# Configuration
+WORKERS = int(os.getenv("EXECUTION_WORKER_CONCURRENCY", "4"))
+
+async def run_workers():
+    print("="*50)
+    print("⚙️  CITADEL EXECUTION WORKERS")
+    print("="*50)
+    print(f"Workers: {WORKERS}")
+    print("Draining execution_jobs (set EXECUTION_WORKERS=0 on the API to run execution only here)")
+
+    await velocity_tracker.ensure_loaded()
+    execution_queue.start(WORKERS)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await execution_queue.stop()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run_workers())
+    except KeyboardInterrupt:
+        print("\n🛑 Execution workers stopped.")
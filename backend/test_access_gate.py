@@ -17,7 +17,7 @@ async def test_gate():
     
     # 2. Test Gate (Agreement Creation)
     print("\n2. Attempting to Create P2P Agreement (Req: 100 TST)...")
-    has_access = access_control.check_access(USER_ADDR, 100)
+    has_access = await access_control.check_access(USER_ADDR, 100)
     
     if has_access:
         print("   [SUCCESS] Access Granted. User has sufficient TST.")
@@ -26,7 +26,7 @@ async def test_gate():
         
     # 3. Test High Value
     print("\n3. Attempting Institutional Action (Req: 10,000 TST)...")
-    if access_control.check_access(USER_ADDR, 10000):
+    if await access_control.check_access(USER_ADDR, 10000):
         print("   [SUCCESS] Access Granted.")
     else:
         print("   [DENIED] Access Blocked.")
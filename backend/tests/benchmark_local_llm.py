@@ -0,0 +1,56 @@
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Offline stand-in must be selected before llm_service is imported.
+# Verdict cache off so every hearing pays the committee latency.
+os.environ.setdefault("LLM_PROVIDER", "local")
+os.environ.setdefault("STRATEGY_CACHE_TTL_SECONDS", "0")
+
+from app.entities.arena import Arena
+from app.services.llm_service import llm_service
+
+# Intents that convene the AI Committee
+INTENTS = [
+    "Sweep funds to the vault",
+    "Bridge USDT to Polygon on the cheapest route",
+    "Trade my BNB at the best price",
+    "Optimize my idle ETH",
+]
+
+async def run_benchmark(hearings: int = 40, concurrency: int = 8):
+    print(f"🧪 Benchmarking Arena dry runs with {type(llm_service.providers['groq']).__name__} "
+          f"({hearings} hearings, concurrency {concurrency})...")
+
+    arena = Arena()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    verdicts = {}
+
+    async def one(i: int):
+        # Unique wording so identical in-flight debates don't coalesce (no digits: they'd parse as amounts)
+        intent = f"{INTENTS[i % len(INTENTS)]} batch {chr(65 + i // 26 % 26)}{chr(65 + i % 26)}"
+        async with semaphore:
+            started = time.perf_counter()
+            record = await arena.conduct_hearing("benchmark_user", intent, execute=False)
+            latencies.append(time.perf_counter() - started)
+            verdicts[record.final_verdict] = verdicts.get(record.final_verdict, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(hearings)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"✅ {hearings} hearings in {wall:.2f}s ({hearings / wall:.1f}/s)")
+    print(f"   p50 {statistics.median(latencies):.2f}s | p95 {latencies[int(0.95 * (len(latencies) - 1))]:.2f}s | max {latencies[-1]:.2f}s")
+    print(f"   Verdicts: {verdicts}")
+    print(f"   LLM health: {llm_service.health()}")
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
@@ -0,0 +1,41 @@
+import asyncio
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Offline stand-in feed must be selected before market_stream is imported
+os.environ.setdefault("MARKET_STREAM", "local")
+os.environ.setdefault("MARKET_STREAM_LOCAL_INTERVAL_MS", "20")
+
+from app.services.market_stream import market_stream
+from app.services.cex_service import cex_service
+
+async def run_benchmark(seconds: float = 2.0, reads: int = 100000):
+    print(f"🧪 Consuming {type(market_stream.feed).__name__} for {seconds:.0f}s...")
+    market_stream.start()
+    await asyncio.sleep(seconds)
+
+    top = market_stream.top("ETHUSDT")
+    assert top is not None, "no ETHUSDT top after warm-up"
+    print(f"✅ {market_stream.updates} updates | ETHUSDT bid {top.bid:.2f} / ask {top.ask:.2f} ({top.spread_bps:.1f} bps)")
+
+    started = time.perf_counter()
+    for _ in range(reads):
+        market_stream.top("ETHUSDT")
+    per_read = (time.perf_counter() - started) / reads
+    print(f"   top() read: {per_read * 1e6:.2f}µs")
+
+    started = time.perf_counter()
+    for _ in range(reads // 10):
+        await cex_service.get_market_quote("ETH/USDT")
+    per_quote = (time.perf_counter() - started) / (reads // 10)
+    print(f"   get_market_quote(): {per_quote * 1e6:.2f}µs (served from the stream, no HTTP)")
+
+    await market_stream.stop()
+    await cex_service.close()
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
@@ -0,0 +1,67 @@
+from app.services import circuit_breaker
+from app.services.circuit_breaker import CircuitBreaker
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+def breaker(monkeypatch, **kwargs):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock.monotonic)
+    options = dict(window=10, min_calls=4, failure_rate=0.5, slow_call_seconds=5.0, cooldown_seconds=30.0)
+    options.update(kwargs)
+    return CircuitBreaker("test", **options), clock
+
+def test_opens_once_bad_rate_reached(monkeypatch):
+    cb, _ = breaker(monkeypatch)
+    cb.record(True, 0.1)
+    cb.record(False, 0.1)
+    cb.record(True, 0.1)
+    assert cb.state == CircuitBreaker.CLOSED  # below min_calls
+    cb.record(True, 6.0)  # slow counts as bad: 2 of 4
+    assert cb.state == CircuitBreaker.OPEN
+    assert not cb.allow()
+
+def test_half_open_lets_one_probe_through(monkeypatch):
+    cb, clock = breaker(monkeypatch)
+    for _ in range(4):
+        cb.record(False, 0.1)
+    clock.now += 31
+    assert cb.allow()
+    assert cb.state == CircuitBreaker.HALF_OPEN
+    assert not cb.allow()  # probe already in flight
+
+    cb.record(True, 0.1)
+    assert cb.state == CircuitBreaker.CLOSED
+    assert cb.allow()
+
+def test_failed_probe_reopens(monkeypatch):
+    cb, clock = breaker(monkeypatch)
+    for _ in range(4):
+        cb.record(False, 0.1)
+    clock.now += 31
+    assert cb.allow()
+    cb.record(False, 0.1)
+    assert cb.state == CircuitBreaker.OPEN
+    clock.now += 10
+    assert not cb.allow()
+
+def test_released_probe_frees_the_slot(monkeypatch):
+    cb, clock = breaker(monkeypatch)
+    for _ in range(4):
+        cb.record(False, 0.1)
+    clock.now += 31
+    assert cb.allow()
+    cb.release()
+    assert cb.allow()
+
+def test_p95_needs_min_calls(monkeypatch):
+    cb, _ = breaker(monkeypatch)
+    for latency in (0.1, 0.2, 0.3):
+        cb.record(True, latency)
+    assert cb.p95() is None
+    cb.record(True, 0.4)
+    assert cb.p95() == 0.4
@@ -0,0 +1,36 @@
+from app.services.evacuation import EvacuationPlanner
+
+RULES = {"enabled": True, "multiple": "0.001", "max": 0, "min": 0.01, "fee": 0.005}
+
+def plan(assets, rules=RULES, network="BSC"):
+    return EvacuationPlanner().plan(assets, network, {asset: {"BSC": dict(rules)} for asset, _ in assets})
+
+def test_amounts_round_down_to_the_withdrawal_multiple():
+    valid, logs = plan([("USDT", 12.34567), ("ETH", 0.0109999)])
+    assert valid == [("USDT", 12.345), ("ETH", 0.01)]
+    assert logs == []
+
+def test_amounts_are_capped_at_the_network_maximum():
+    valid, logs = plan([("USDT", 250.0)], rules={**RULES, "max": 100.0})
+    assert valid == [("USDT", 100.0)]
+    assert "capped" in logs[0]
+
+def test_disabled_unsupported_and_dust_assets_are_dropped():
+    planner = EvacuationPlanner()
+    config = {
+        "USDT": {"BSC": {**RULES, "enabled": False}},
+        "ETH": {"BSC": RULES},
+        "BNB": {"BSC": {**RULES, "min": 0.0, "fee": 0.01}},
+    }
+    valid, logs = planner.plan([("USDT", 50.0), ("ETH", 0.0099), ("BNB", 0.01), ("DOGE", 100.0)], "BSC", config)
+    assert valid == []
+    assert [line.split(":")[0] for line in logs] == ["❌ SUSPENDED", "❌ MINIMUM LIMIT", "❌ MINIMUM LIMIT", "❌ NOT SUPPORTED"]
+
+def test_without_config_everything_passes_through():
+    assets = [("USDT", 12.34567)]
+    assert EvacuationPlanner().plan(assets, "BSC", {}) == (assets, [])
+
+def test_unusable_multiple_leaves_amount_untouched():
+    planner = EvacuationPlanner()
+    assert planner._round_down(1.23456, "0") == 1.23456
+    assert planner._round_down(1.23456, "n/a") == 1.23456
@@ -30,7 +30,7 @@ async def run_test():
     # 2. Memory (Mock DB fetch)
     # We patch MemoryEntity to inject our mock config
     print("Step 1: Memory")
-    with patch("app.entities.memory.AsyncSessionLocal"): 
+    with patch("app.services.user_cache.AsyncSessionLocal"): 
         # We short-circuit the DB logic by just manually setting memory
         record.memory = MemoryOutput(
             known_user=True,
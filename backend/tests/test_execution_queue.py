@@ -0,0 +1,109 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.schemas.hearing import ExecutionResult, HearingRecord
+from app.services import execution_queue as queue_module
+from app.services.execution_queue import CallbackURLError, ExecutionQueue, check_callback_url
+from app.services.submissions import mark_submitted
+
+class FakeJobsSession:
+    """
+    Captures the job UPDATE (and accepts the hearing persist) issued by ExecutionQueue._run.
+    """
+    updates = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def add(self, row):
+        pass
+
+    async def execute(self, statement):
+        FakeJobsSession.updates.append(statement.compile().params)
+
+    async def commit(self):
+        pass
+
+class FakeArena:
+    def __init__(self, behaviour):
+        self.behaviour = behaviour
+
+    async def conduct_hearing(self, user_id, intent, execute):
+        return await self.behaviour()
+
+def run_job(monkeypatch, behaviour, attempts=1, max_attempts=3):
+    FakeJobsSession.updates = []
+    monkeypatch.setattr(queue_module, "AsyncSessionLocal", FakeJobsSession)
+    queue = ExecutionQueue(retry_base_seconds=0.01)
+    queue._arena = FakeArena(behaviour)
+    job = {"id": uuid.uuid4(), "user_id": str(uuid.uuid4()), "intent": "Send 1 ETH",
+           "attempts": attempts, "max_attempts": max_attempts, "callback_url": None}
+    asyncio.run(queue._run(job))
+    (values,) = FakeJobsSession.updates
+    return values
+
+def record_with(status, submitted=False, verdict="ALLOWED"):
+    return HearingRecord(
+        user_id=str(uuid.uuid4()),
+        intent="Send 1 ETH",
+        execution=ExecutionResult(tx_hash=None, broadcast_time=None, status=status, submitted=submitted),
+        final_verdict=verdict,
+        final_reason="rpc timeout" if verdict == "ERROR" else "ok"
+    )
+
+def test_success_is_done(monkeypatch):
+    async def ok():
+        return record_with("SUCCESS", submitted=True)
+
+    assert run_job(monkeypatch, ok)["status"] == "DONE"
+
+def test_error_before_submission_is_retried(monkeypatch):
+    async def fails_early():
+        raise ConnectionError("rpc unreachable")
+
+    values = run_job(monkeypatch, fails_early)
+    assert values["status"] == "QUEUED"
+    assert "rpc unreachable" in values["last_error"]
+
+def test_error_after_submission_is_failed_not_retried(monkeypatch):
+    async def fails_after_broadcast():
+        mark_submitted("broadcast")
+        raise TimeoutError("read timeout")
+
+    values = run_job(monkeypatch, fails_after_broadcast)
+    assert values["status"] == "FAILED"
+    assert "check the ledger" in values["last_error"]
+
+def test_record_marked_submitted_is_not_retried(monkeypatch):
+    async def error_record():
+        return record_with("FAILED", submitted=True, verdict="ERROR")
+
+    assert run_job(monkeypatch, error_record)["status"] == "FAILED"
+
+def test_retries_stop_at_max_attempts(monkeypatch):
+    async def fails_early():
+        raise ConnectionError("rpc unreachable")
+
+    assert run_job(monkeypatch, fails_early, attempts=3, max_attempts=3)["status"] == "FAILED"
+
+@pytest.mark.parametrize("url", [
+    "http://example.com/hook",           # not https
+    "https://127.0.0.1/hook",            # loopback
+    "https://10.0.0.5/hook",             # private
+    "https://169.254.169.254/latest",    # cloud metadata
+    "https://[::1]/hook",
+])
+def test_callback_url_rejected(url):
+    with pytest.raises(CallbackURLError):
+        asyncio.run(check_callback_url(url))
+
+def test_callback_url_public_or_allowlisted(monkeypatch):
+    asyncio.run(check_callback_url("https://8.8.8.8/hook"))
+    monkeypatch.setattr(queue_module.settings, "EXECUTION_CALLBACK_ALLOWED_HOSTS", "hooks.internal, 10.0.0.5")
+    asyncio.run(check_callback_url("https://10.0.0.5/hook"))
+    asyncio.run(check_callback_url("https://HOOKS.internal/hook"))
@@ -0,0 +1,112 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from app.schemas.hearing import ExecutionResult, HearingRecord, MemoryOutput
+from app.services import hearing_store
+from app.services.hearing_store import HearingWriter, hearing_row
+
+class FailingSession:
+    """
+    AsyncSessionLocal during a DB outage.
+    """
+    async def __aenter__(self):
+        raise ConnectionError("db down")
+
+    async def __aexit__(self, *exc):
+        return False
+
+class RecordingSession:
+    inserted = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        # Multi-row VALUES, keyed by column
+        for row in statement._multi_values[0]:
+            RecordingSession.inserted.append({getattr(column, "key", column): value for column, value in row.items()})
+
+    async def commit(self):
+        pass
+
+def audit_row(intent: str):
+    return {"id": uuid.uuid4(), "user_id": uuid.uuid4(), "intent": intent,
+            "started_at": datetime.now(timezone.utc), "final_verdict": "ALLOWED"}
+
+def executed(intent: str) -> HearingRecord:
+    return HearingRecord(
+        user_id=str(uuid.uuid4()),
+        intent=intent,
+        execution=ExecutionResult(tx_hash="0xabc", broadcast_time=None, status="SUCCESS", submitted=True),
+        final_verdict="ALLOWED"
+    )
+
+def with_writer(monkeypatch, session, scenario, **kwargs):
+    monkeypatch.setattr(hearing_store, "AsyncSessionLocal", session)
+
+    async def main():
+        writer = HearingWriter(flush_seconds=3600, **kwargs)
+        try:
+            await scenario(writer)
+        finally:
+            if writer._task is not None:
+                writer._task.cancel()
+    asyncio.run(main())
+
+def intents(writer):
+    return [row["intent"] for row, _ in writer._buffer]
+
+def test_overflow_drops_only_audit_rows(monkeypatch):
+    async def scenario(writer):
+        writer.submit(executed("exec-1"), str(uuid.uuid4()))
+        writer.submit_row(audit_row("heartbeat-1"))
+        writer.submit_row(audit_row("gas-1"), durable=True)
+        writer.submit_row(audit_row("heartbeat-2"))
+        writer.submit(executed("exec-2"), str(uuid.uuid4()))
+        assert intents(writer) == ["exec-1", "gas-1", "heartbeat-2", "exec-2"]
+        assert writer.dropped == 1
+
+        # Nothing left to drop: durable rows stay even past the limit
+        writer.submit(executed("exec-3"), str(uuid.uuid4()))
+        writer.submit(executed("exec-4"), str(uuid.uuid4()))
+        assert intents(writer) == ["exec-1", "gas-1", "exec-2", "exec-3", "exec-4"]
+        assert writer.stats()["durable_buffered"] == 5
+
+    with_writer(monkeypatch, FailingSession, scenario, max_buffer=4)
+
+def test_failed_flush_keeps_rows_in_order(monkeypatch):
+    async def scenario(writer):
+        for i in range(3):
+            writer.submit_row(audit_row(f"row-{i}"))
+        await writer.flush()
+        assert intents(writer) == ["row-0", "row-1", "row-2"]
+        assert writer.written == 0
+
+    with_writer(monkeypatch, FailingSession, scenario)
+
+def test_flush_writes_batches(monkeypatch):
+    RecordingSession.inserted = []
+
+    async def scenario(writer):
+        for i in range(5):
+            writer.submit_row(audit_row(f"row-{i}"))
+        await writer.flush()
+        assert writer._buffer == []
+        assert writer.written == 5
+        assert [row["intent"] for row in RecordingSession.inserted] == [f"row-{i}" for i in range(5)]
+
+    with_writer(monkeypatch, RecordingSession, scenario, batch_size=2)
+
+def test_hearing_row_projects_summary_columns():
+    record = executed("Send 1 ETH")
+    record.memory = MemoryOutput(known_user=True, user_id=str(uuid.uuid4()))
+    row = hearing_row(record, "0x000000000000000000000000000000000000bEEF", final_reason="done")
+    assert str(row["user_id"]) == record.memory.user_id
+    assert row["tx_hash"] == "0xabc"
+    assert row["transcript"] is None
+    assert row["execution"]["status"] == "SUCCESS"
+    assert row["final_reason"] == "done"
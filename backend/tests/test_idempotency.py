@@ -0,0 +1,145 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import idempotency as idempotency_module
+from app.services.idempotency import IdempotencyStore
+
+class FakeKeysSession:
+    """
+    In-memory idempotency_keys table, driven by the statements IdempotencyStore issues.
+    """
+    rows = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        params = statement.compile().params
+        if statement.is_insert:
+            key = (params["scope"], params["key"])
+            if key in self.rows:
+                return SimpleNamespace(rowcount=0)
+            self.rows[key] = SimpleNamespace(response_status=None, response_body=None, **params)
+            return SimpleNamespace(rowcount=1)
+        key = (params["scope_1"], params["key_1"])
+        row = self.rows.get(key)
+        if statement.is_delete:
+            if row is not None and ("expires_at_1" not in params or row.expires_at < params["expires_at_1"]):
+                del self.rows[key]
+        elif statement.is_update and row is not None:
+            row.status = params["status"]
+            row.response_status = params["response_status"]
+            row.response_body = params["response_body"]
+        return SimpleNamespace(rowcount=1)
+
+    async def get(self, model, key):
+        return self.rows.get(key)
+
+    async def commit(self):
+        pass
+
+@pytest.fixture
+def store(monkeypatch):
+    FakeKeysSession.rows = {}
+    monkeypatch.setattr(idempotency_module, "AsyncSessionLocal", FakeKeysSession)
+    return IdempotencyStore(ttl_hours=24)
+
+def counting_handler(status=200, body=None):
+    calls = []
+
+    async def handler():
+        calls.append(1)
+        return status, body or {"ok": len(calls)}
+
+    return handler, calls
+
+def test_replay_returns_first_response_without_rerunning(store):
+    handler, calls = counting_handler()
+
+    async def scenario():
+        first = await store.run("withdraw:u1", "key-1", {"amount": 1}, handler)
+        second = await store.run("withdraw:u1", "key-1", {"amount": 1}, handler)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert calls == [1]
+    assert json.loads(second.body) == json.loads(first.body) == {"ok": 1}
+    assert second.headers["Idempotent-Replayed"] == "true"
+
+def test_same_key_different_body_is_422(store):
+    handler, _ = counting_handler()
+
+    async def scenario():
+        await store.run("withdraw:u1", "key-1", {"amount": 1}, handler)
+        await store.run("withdraw:u1", "key-1", {"amount": 2}, handler)
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(scenario())
+    assert exc.value.status_code == 422
+
+def test_retry_while_first_is_running_is_409(store):
+    async def scenario():
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await release.wait()
+            return 200, {"ok": True}
+
+        first = asyncio.create_task(store.run("s", "k", {}, slow))
+        await started.wait()
+        with pytest.raises(HTTPException) as exc:
+            await store.run("s", "k", {}, slow)
+        release.set()
+        await first
+        return exc.value.status_code
+
+    assert asyncio.run(scenario()) == 409
+
+def test_client_error_releases_key(store):
+    async def rejected():
+        raise HTTPException(status_code=400, detail="Insufficient Funds")
+
+    handler, calls = counting_handler()
+
+    async def scenario():
+        with pytest.raises(HTTPException):
+            await store.run("s", "k", {}, rejected)
+        return await store.run("s", "k", {}, handler)
+
+    assert asyncio.run(scenario()).status_code == 200
+    assert calls == [1]
+
+def test_server_error_is_replayed_with_cache_errors(store):
+    async def broke():
+        raise HTTPException(status_code=500, detail="rpc timeout after broadcast")
+
+    handler, calls = counting_handler()
+
+    async def scenario():
+        with pytest.raises(HTTPException):
+            await store.run("s", "k", {}, broke, cache_errors=True)
+        return await store.run("s", "k", {}, handler, cache_errors=True)
+
+    replay = asyncio.run(scenario())
+    assert replay.status_code == 500 and calls == []
+
+def test_expired_key_can_be_reused(store):
+    handler, calls = counting_handler()
+
+    async def scenario():
+        await store.run("s", "k", {}, handler)
+        FakeKeysSession.rows[("s", "k")].expires_at = datetime(2000, 1, 1, tzinfo=timezone.utc)
+        await store.run("s", "k", {}, handler)
+
+    asyncio.run(scenario())
+    assert calls == [1, 1]
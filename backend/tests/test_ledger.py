@@ -0,0 +1,242 @@
+import asyncio
+import importlib.util
+import os
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import case, func, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.v1.endpoints import transactions as endpoint
+from app.db.base import Base
+from app.models.balance import Balance
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.schemas.transaction import WithdrawalRequest
+from app.services.ledger import ledger
+from app.services.submissions import mark_submitted
+
+WITHDRAWAL = WithdrawalRequest(chain="bsc", symbol="USDT", amount=7.0, destination_address="0x" + "11" * 20)
+
+class FakeResult:
+    def __init__(self, user):
+        self.user = user
+
+    def scalars(self):
+        return self
+
+    def first(self):
+        return self.user
+
+class FakeSession:
+    """
+    Records the order of commits; statements (balance upserts) are accepted and ignored.
+    """
+    def __init__(self, events):
+        self.events = events
+        self.user = SimpleNamespace(id=uuid.uuid4())
+        self.added = []
+
+    async def execute(self, query):
+        return FakeResult(self.user)
+
+    def add(self, row):
+        self.added.append(row)
+
+    async def commit(self):
+        self.events.append(("commit", self.added[-1].status if self.added else None))
+
+    async def refresh(self, row):
+        pass
+
+def run_withdrawal(monkeypatch, payout):
+    events = []
+
+    async def lock_balance(db, user_id, chain, symbol):
+        events.append(("lock", None))
+        return 10.0
+
+    async def recording_payout(**kwargs):
+        events.append(("payout", None))
+        return await payout()
+
+    monkeypatch.setattr(ledger, "lock_balance", lock_balance)
+    monkeypatch.setattr(endpoint.wallet_service, "payout_from_master", recording_payout)
+    monkeypatch.setattr(endpoint.velocity_tracker, "record_spend", lambda *a, **k: None)
+    db = FakeSession(events)
+    try:
+        asyncio.run(endpoint._process_withdrawal(str(db.user.id), WITHDRAWAL, db))
+    except HTTPException as e:
+        events.append(("http", e.status_code))
+    return events, db.added[0]
+
+def test_debit_commits_before_payout(monkeypatch):
+    async def payout():
+        return "0xhash"
+
+    events, tx = run_withdrawal(monkeypatch, payout)
+    # The lock is released (PENDING debit committed) before any chain I/O
+    assert events == [("lock", None), ("commit", "PENDING"), ("payout", None), ("commit", "CONFIRMED")]
+    assert tx.tx_hash == "0xhash"
+
+def test_failure_before_broadcast_voids_debit(monkeypatch):
+    async def payout():
+        raise RuntimeError("rpc down")
+
+    events, tx = run_withdrawal(monkeypatch, payout)
+    assert events[-2:] == [("commit", "FAILED"), ("http", 500)]
+    assert tx.status == "FAILED"
+
+def test_failure_after_broadcast_stays_pending(monkeypatch):
+    async def payout():
+        mark_submitted("broadcast")
+        raise RuntimeError("timeout waiting for send_raw_transaction")
+
+    events, tx = run_withdrawal(monkeypatch, payout)
+    assert events[-1] == ("http", 500)
+    assert [e for e in events if e[0] == "commit"] == [("commit", "PENDING")]
+    assert tx.status == "PENDING"
+
+def test_insufficient_funds_never_pays_out(monkeypatch):
+    async def payout():
+        raise AssertionError("must not be called")
+
+    big = WITHDRAWAL.model_copy(update={"amount": 11.0})
+    events = []
+
+    async def lock_balance(db, user_id, chain, symbol):
+        return 10.0
+
+    monkeypatch.setattr(ledger, "lock_balance", lock_balance)
+    monkeypatch.setattr(endpoint.wallet_service, "payout_from_master", payout)
+    db = FakeSession(events)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(endpoint._process_withdrawal(str(db.user.id), big, db))
+    assert exc.value.status_code == 400
+    assert db.added == []
+
+# --------------------------------------------------------------------------
+# Against a real Postgres (TEST_DATABASE_URL=postgresql+asyncpg://...; the database is wiped)
+# --------------------------------------------------------------------------
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+needs_postgres = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+def with_database(scenario):
+    async def main():
+        engine = create_async_engine(TEST_DATABASE_URL)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            await scenario(sessions)
+        finally:
+            await engine.dispose()
+    asyncio.run(main())
+
+async def create_user(sessions) -> uuid.UUID:
+    async with sessions() as db:
+        user = User(email=f"{uuid.uuid4()}@test.local")
+        db.add(user)
+        await db.commit()
+        return user.id
+
+async def ledger_sums(db):
+    """
+    (chain, symbol) -> (materialized balance, balance recomputed from transactions)
+    """
+    balances = dict(((chain, symbol), amount) for chain, symbol, amount in
+                    (await db.execute(select(Balance.chain, Balance.symbol, Balance.amount))).all())
+    signed = func.sum(case((Transaction.type == 'DEPOSIT', Transaction.amount), else_=-Transaction.amount))
+    recomputed = dict(((chain, symbol), amount) for chain, symbol, amount in (await db.execute(
+        select(Transaction.chain, Transaction.symbol, signed)
+        .where(Transaction.status != 'FAILED')
+        .group_by(Transaction.chain, Transaction.symbol)
+    )).all())
+    return {key: (balances.get(key, 0.0), recomputed.get(key, 0.0)) for key in balances.keys() | recomputed.keys()}
+
+@needs_postgres
+def test_post_and_void_keep_balances_equal_to_transactions():
+    async def scenario(sessions):
+        user_id = await create_user(sessions)
+        async with sessions() as db:
+            for i, (kind, amount) in enumerate([("DEPOSIT", 5.0), ("DEPOSIT", 2.5), ("WITHDRAWAL", 1.5)]):
+                await ledger.post(db, Transaction(user_id=user_id, chain="bsc", symbol="USDT", amount=amount,
+                                                  type=kind, tx_hash=f"0x{i}"))
+            pending = Transaction(user_id=user_id, chain="bsc", symbol="USDT", amount=3.0, type="WITHDRAWAL", status="PENDING")
+            await ledger.post(db, pending)
+            await ledger.post(db, Transaction(user_id=user_id, chain="polygon", symbol="USDT", amount=1.0,
+                                              type="DEPOSIT", tx_hash="0xp"))
+            await db.commit()
+            await ledger.void(db, pending)
+            await db.commit()
+
+            sums = await ledger_sums(db)
+            assert sums[("bsc", "USDT")] == (6.0, 6.0)
+            assert sums[("polygon", "USDT")] == (1.0, 1.0)
+
+    with_database(scenario)
+
+@needs_postgres
+def test_concurrent_withdrawals_cannot_both_pass(monkeypatch):
+    async def payout(**kwargs):
+        # Slow payout: the second request must already be deciding while the first is in flight
+        await asyncio.sleep(0.2)
+        return f"0x{uuid.uuid4().hex}"
+
+    monkeypatch.setattr(endpoint.wallet_service, "payout_from_master", payout)
+    monkeypatch.setattr(endpoint.velocity_tracker, "record_spend", lambda *a, **k: None)
+
+    async def scenario(sessions):
+        user_id = await create_user(sessions)
+        async with sessions() as db:
+            await ledger.post(db, Transaction(user_id=user_id, chain="bsc", symbol="USDT", amount=10.0,
+                                              type="DEPOSIT", tx_hash="0xdeposit"))
+            await db.commit()
+
+        async def withdraw():
+            async with sessions() as db:
+                return await endpoint._process_withdrawal(str(user_id), WITHDRAWAL, db)
+
+        results = await asyncio.gather(withdraw(), withdraw(), return_exceptions=True)
+        passed = [r for r in results if isinstance(r, Transaction)]
+        rejected = [r for r in results if isinstance(r, HTTPException)]
+        assert len(passed) == 1 and len(rejected) == 1 and rejected[0].status_code == 400
+
+        async with sessions() as db:
+            assert (await ledger_sums(db))[("bsc", "USDT")] == (3.0, 3.0)
+
+    with_database(scenario)
+
+@needs_postgres
+def test_balances_migration_seed_matches_ledger(monkeypatch):
+    # alembic/ isn't a package (and would shadow the alembic library); load the revision by path
+    path = os.path.join(os.path.dirname(__file__), "..", "alembic", "versions", "f4a8d2b6c150_add_balances.py")
+    spec = importlib.util.spec_from_file_location("add_balances", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    statements = []
+    monkeypatch.setattr(migration, "op", SimpleNamespace(
+        create_table=lambda *a, **k: None,
+        execute=statements.append
+    ))
+    migration.upgrade()
+    (seed,) = statements
+
+    async def scenario(sessions):
+        user_id = await create_user(sessions)
+        async with sessions() as db:
+            rows = [("bsc", "USDT", 4.0, "DEPOSIT"), ("bsc", "USDT", 1.0, "WITHDRAWAL"),
+                    ("bsc", "TST", 2.0, "DEPOSIT"), ("polygon", "USDT", 9.0, "DEPOSIT")]
+            for i, (chain, symbol, amount, kind) in enumerate(rows):
+                db.add(Transaction(user_id=user_id, chain=chain, symbol=symbol, amount=amount, type=kind, tx_hash=f"0x{i}"))
+            await db.commit()
+            await db.execute(text(seed))
+            await db.commit()
+
+            sums = await ledger_sums(db)
+            assert sums == {("bsc", "USDT"): (3.0, 3.0), ("bsc", "TST"): (2.0, 2.0), ("polygon", "USDT"): (9.0, 9.0)}
+
+    with_database(scenario)
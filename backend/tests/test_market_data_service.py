@@ -0,0 +1,32 @@
+import asyncio
+
+from app.services.market_data_service import MIN_POOL_TVL_USD, MarketDataService, build_pool_index
+
+def pool(chain, symbol, project, apy, tvl=5_000_000):
+    return {"chain": chain, "symbol": symbol, "project": project, "apy": apy, "tvlUsd": tvl}
+
+def test_index_groups_filters_and_keeps_best_pool_per_project():
+    index = build_pool_index([
+        pool("BSC", "usdt", "venus", 4.0),
+        pool("BSC", "USDT", "venus", 6.0),
+        pool("BSC", "USDT", "lista-lending", 9.0),
+        pool("BSC", "USDT", "tiny", 50.0, tvl=MIN_POOL_TVL_USD),
+        pool("BSC", "USDT", "no-apy", None),
+        pool("Ethereum", "USDT", "aave-v3", 3.0),
+    ])
+    group = index[("BSC", "USDT")]
+    assert group.projects == ("lista-lending", "venus")
+    assert list(group.apy) == [9.0, 6.0]
+    assert set(index) == {("BSC", "USDT"), ("ETHEREUM", "USDT")}
+
+def test_current_yields_reads_the_index():
+    service = MarketDataService()
+    index = build_pool_index([pool("BSC", "USDT", "venus", 6.0), pool("BSC", "USDT", "lista-lending", 25.0)])
+
+    async def cached():
+        return index
+
+    service._fetch_pools_with_cache = cached
+    yields = asyncio.run(service.get_current_yields("BSC", "usdt"))
+    assert yields[0] == {"protocol": "Lista Lending", "apy": "25.00%", "risk": "High"}
+    assert yields[1] == {"protocol": "Venus", "apy": "6.00%", "risk": "Low"}
@@ -0,0 +1,43 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy.dialects import postgresql
+from sqlalchemy import select
+
+import app.db.base  # noqa: F401 (registers every model)
+from app.models.transaction import Transaction
+from app.services.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, keyset_page, next_cursor
+
+def test_cursor_round_trip():
+    ts = datetime(2026, 10, 19, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(ts, row_id)) == (ts, row_id)
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "aGVsbG8=", encode_cursor(datetime.now(), uuid.uuid4())[:-6]])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+def test_next_cursor_set_only_when_more_rows_exist():
+    rows = [SimpleNamespace(id=uuid.uuid4(), created_at=datetime(2026, 1, 1, tzinfo=timezone.utc)) for _ in range(3)]
+
+    response = Response()
+    page = next_cursor(rows, 2, "created_at", response)
+    assert page == rows[:2]
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == (rows[1].created_at, rows[1].id)
+
+    response = Response()
+    assert next_cursor(rows, 3, "created_at", response) == rows
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+def test_keyset_page_seeks_after_cursor_and_fetches_one_extra():
+    cursor = encode_cursor(datetime(2026, 1, 1, tzinfo=timezone.utc), uuid.uuid4())
+    query = keyset_page(select(Transaction), Transaction.created_at, Transaction.id, cursor, 50)
+    compiled = query.compile(dialect=postgresql.dialect())
+    assert "(transactions.created_at, transactions.id) < (" in str(compiled)
+    assert "ORDER BY transactions.created_at DESC, transactions.id DESC" in str(compiled)
+    assert 51 in compiled.params.values()
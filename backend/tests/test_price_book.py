@@ -0,0 +1,90 @@
+import asyncio
+
+from app.services import price_book as price_book_module
+from app.services.price_book import FALLBACK_CONFIDENCE, FRESH_CONFIDENCE, STALE_CONFIDENCE, PriceBook
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+def book(monkeypatch, snapshots):
+    clock = Clock()
+    monkeypatch.setattr(price_book_module.time, "monotonic", clock.monotonic)
+    fetches = []
+
+    async def fetch():
+        fetches.append(1)
+        result = snapshots[min(len(fetches), len(snapshots)) - 1]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return PriceBook(fetch, fresh_seconds=2, max_stale_seconds=30), clock, fetches
+
+def test_fresh_reads_do_not_fetch(monkeypatch):
+    prices, clock, fetches = book(monkeypatch, [{"ETHUSDT": 2500.0}])
+
+    async def scenario():
+        first = await prices.quote("ETHUSDT")
+        clock.now += 1
+        second = await prices.quote("ETHUSDT")
+        return first, second
+
+    assert asyncio.run(scenario()) == ((2500.0, 0.0), (2500.0, 1.0))
+    assert fetches == [1]
+
+def test_stale_read_answers_and_revalidates_in_background(monkeypatch):
+    prices, clock, fetches = book(monkeypatch, [{"ETHUSDT": 2500.0}, {"ETHUSDT": 2600.0}])
+
+    async def scenario():
+        await prices.quote("ETHUSDT")
+        clock.now += 5
+        stale = await prices.quote("ETHUSDT")
+        await prices._revalidating
+        fresh = await prices.quote("ETHUSDT")
+        return stale, fresh
+
+    stale, fresh = asyncio.run(scenario())
+    assert stale == (2500.0, 5.0)
+    assert fresh == (2600.0, 0.0)
+    assert prices.stale_hits == 1
+
+def test_past_max_stale_read_waits_for_refresh(monkeypatch):
+    prices, clock, fetches = book(monkeypatch, [{"ETHUSDT": 2500.0}, {"ETHUSDT": 2700.0}])
+
+    async def scenario():
+        await prices.quote("ETHUSDT")
+        clock.now += 31
+        return await prices.quote("ETHUSDT")
+
+    assert asyncio.run(scenario()) == (2700.0, 0.0)
+
+def test_failed_refresh_keeps_previous_snapshot(monkeypatch):
+    prices, clock, fetches = book(monkeypatch, [{"ETHUSDT": 2500.0}, RuntimeError("418")])
+
+    async def scenario():
+        await prices.quote("ETHUSDT")
+        clock.now += 31
+        return await prices.quote("ETHUSDT"), await prices.quote("DOGEUSDT")
+
+    assert asyncio.run(scenario()) == ((2500.0, 31.0), None)
+    assert prices.refresh_errors >= 1
+
+def test_concurrent_cold_reads_share_one_fetch(monkeypatch):
+    prices, _, fetches = book(monkeypatch, [{"ETHUSDT": 2500.0, "BTCUSDT": 60000.0}])
+
+    async def scenario():
+        return await asyncio.gather(*(prices.quote(s) for s in ("ETHUSDT", "BTCUSDT", "ETHUSDT")))
+
+    assert [q[0] for q in asyncio.run(scenario())] == [2500.0, 60000.0, 2500.0]
+    assert fetches == [1]
+
+def test_confidence_decays_with_age():
+    prices = PriceBook(None, fresh_seconds=2, max_stale_seconds=30)
+    assert prices.confidence(None) == FALLBACK_CONFIDENCE
+    assert prices.confidence(1.0) == FRESH_CONFIDENCE
+    assert prices.confidence(16.0) == round((FRESH_CONFIDENCE + STALE_CONFIDENCE) / 2, 3)
+    assert prices.confidence(100.0) == STALE_CONFIDENCE
@@ -0,0 +1,94 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.services import risk_rules as risk_module
+from app.services.risk_rules import DEFAULT_ASSET_MAX, RiskRuleEngine, compile_default_rules
+
+def limit(kind, max_amount, asset=None):
+    return SimpleNamespace(kind=kind, max_amount=max_amount, asset=asset)
+
+def allow(address, user_id=None):
+    return SimpleNamespace(address=address, user_id=user_id)
+
+def test_defaults_cover_known_and_unknown_assets():
+    rules = compile_default_rules()
+    assert rules.limit_for("ETH") == 5.0
+    assert rules.limit_for("DOGE") == DEFAULT_ASSET_MAX
+    assert rules.hourly_limit_for("ETH") == 10.0
+    assert rules.daily_limit_for("DOGE") == 500.0  # falls back to the None (any asset) cap
+    assert rules.is_trusted("0x571e52efc50055d760ceae2446ae3b469a806279")
+
+def test_compile_shapes_db_rows():
+    engine = RiskRuleEngine()
+    rules = engine._compile(
+        [
+            limit("GLOBAL_MAX", 50.0),
+            limit("DEFAULT_ASSET_MAX", 7.0),
+            limit("ASSET_MAX", 2.0, "eth"),
+            limit("HOURLY_MAX", 3.0, "eth"),
+            limit("DAILY_MAX", 9.0),
+        ],
+        [allow("0xAbC"), allow("0xDeF", user_id="user-1")],
+        version=(5, None, 2, None)
+    )
+    assert rules.source == "db" and rules.version == (5, None, 2, None)
+    assert rules.global_max == 50.0
+    assert rules.limit_for("ETH") == 2.0 and rules.limit_for("BNB") == 7.0
+    assert rules.hourly_limit_for("ETH") == 3.0 and rules.hourly_limit_for("BNB") is None
+    assert rules.daily_limit_for("ETH") == 9.0
+    assert rules.is_trusted("0xabc")
+    assert rules.is_trusted("0xDEF", "user-1") and not rules.is_trusted("0xdef", "user-2")
+
+class FakeRulesSession:
+    """
+    Serves a version probe, then (if asked) the limit and allowlist rows.
+    """
+    version = (1, None, 0, None)
+    limits = []
+    reads = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query):
+        sql = str(query)
+        if "count" in sql:
+            return SimpleNamespace(one=lambda: self.version)
+        FakeRulesSession.reads += 1
+        rows = self.limits if "FROM risk_limits" in sql else []
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: rows))
+
+def test_reload_only_rereads_when_version_changes(monkeypatch):
+    monkeypatch.setattr(risk_module, "AsyncSessionLocal", FakeRulesSession)
+    FakeRulesSession.reads = 0
+    FakeRulesSession.version = (1, None, 0, None)
+    FakeRulesSession.limits = [limit("ASSET_MAX", 1.0, "ETH")]
+    engine = RiskRuleEngine(refresh_seconds=0)
+
+    async def scenario():
+        assert (await engine.get_rules()).limit_for("ETH") == 1.0
+        reads = FakeRulesSession.reads
+        await engine.get_rules()
+        assert FakeRulesSession.reads == reads  # same version: probe only
+
+        FakeRulesSession.version = (2, None, 0, None)
+        FakeRulesSession.limits = [limit("ASSET_MAX", 3.0, "ETH")]
+        assert (await engine.get_rules()).limit_for("ETH") == 3.0
+
+    asyncio.run(scenario())
+
+def test_failed_load_keeps_previous_rules(monkeypatch):
+    class DownSession:
+        async def __aenter__(self):
+            raise ConnectionError("db down")
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(risk_module, "AsyncSessionLocal", DownSession)
+    engine = RiskRuleEngine()
+    rules = asyncio.run(engine.get_rules())
+    assert rules.source == "defaults" and rules.limit_for("ETH") == 5.0
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from app.services.singleflight import SingleFlight
+
+def test_concurrent_identical_calls_share_one_upstream_call():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return f"value-{key}"
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("k", fetch, "k") for _ in range(5)), flight.do("j", fetch, "j"))
+
+    results = asyncio.run(scenario())
+    assert results == ["value-k"] * 5 + ["value-j"]
+    assert calls == ["k", "j"]
+    assert flight.stats() == {"in_flight": 0, "upstream_calls": 2, "coalesced": 4}
+
+def test_nothing_is_cached_after_completion():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return len(calls)
+
+    async def scenario():
+        return [await flight.do("k", fetch), await flight.do("k", fetch)]
+
+    assert asyncio.run(scenario()) == [1, 2]
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        return await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+    assert flight.calls == 1
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    flight = SingleFlight("test")
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        first = asyncio.create_task(flight.do("k", fetch))
+        second = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
@@ -0,0 +1,40 @@
+from app.services import ttl_cache
+from app.services.ttl_cache import TTLCache
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ttl_cache.time, "monotonic", clock.monotonic)
+    cache = TTLCache(ttl_seconds=10)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=30)
+
+    clock.now += 9
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+
+def test_pop_and_keys():
+    cache = TTLCache(ttl_seconds=60)
+    cache.set(("x", 1), "v")
+    assert cache.keys() == [("x", 1)]
+    assert cache.pop(("x", 1)) == "v"
+    assert cache.pop(("x", 1), "gone") == "gone"
@@ -0,0 +1,80 @@
+import asyncio
+
+from app.services import user_cache as user_cache_module
+from app.services.user_cache import SYSTEM_USER_ID, UserProfileCache
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+def cache_with_loader(**kwargs):
+    cache = UserProfileCache(**kwargs)
+    loads = []
+
+    async def load(subject):
+        loads.append(subject)
+        if subject.startswith("unknown"):
+            return None
+        return {"id": "user-1", "derivation_index": 1, "cex_config": {}}
+
+    cache._load = load
+    return cache, loads
+
+def test_hits_misses_and_negative_caching():
+    cache, loads = cache_with_loader()
+
+    async def scenario():
+        assert (await cache.get_profile("user-1"))["id"] == "user-1"
+        assert (await cache.get_profile("user-1"))["id"] == "user-1"
+        assert await cache.get_profile("unknown-0xabc") is None
+        assert await cache.get_profile("unknown-0xabc") is None
+
+    asyncio.run(scenario())
+    assert loads == ["user-1", "unknown-0xabc"]
+    assert cache.stats()["hits"] == 2
+
+def test_invalidate_drops_every_alias_of_a_user():
+    cache, loads = cache_with_loader()
+
+    async def scenario():
+        await cache.get_profile("user-1")
+        await cache.get_profile("0xWallet")  # resolves to user-1 as well
+        cache.invalidate("user-1")
+        await cache.get_profile("user-1")
+        await cache.get_profile("0xWallet")
+
+    asyncio.run(scenario())
+    assert loads == ["user-1", "0xWallet", "user-1", "0xWallet"]
+
+def test_entries_expire_and_pinned_entry_has_its_own_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(user_cache_module.time, "monotonic", clock.monotonic)
+    cache, loads = cache_with_loader(ttl_seconds=10, pinned_ttl_seconds=100)
+
+    async def scenario():
+        await cache.get_profile("user-1")
+        await cache.get_profile(SYSTEM_USER_ID)
+        clock.now += 11
+        await cache.get_profile("user-1")
+        await cache.get_profile(SYSTEM_USER_ID)
+        clock.now += 90
+        await cache.get_profile(SYSTEM_USER_ID)
+
+    asyncio.run(scenario())
+    assert loads == ["user-1", SYSTEM_USER_ID, "user-1", SYSTEM_USER_ID]
+
+def test_pinned_entry_survives_lru_eviction():
+    cache, loads = cache_with_loader(max_entries=2)
+
+    async def scenario():
+        await cache.get_profile(SYSTEM_USER_ID)
+        for subject in ("a", "b", "c"):
+            await cache.get_profile(subject)
+        await cache.get_profile(SYSTEM_USER_ID)
+
+    asyncio.run(scenario())
+    assert loads.count(SYSTEM_USER_ID) == 1
+    assert len(cache._entries) == 2
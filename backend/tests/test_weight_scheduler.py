@@ -0,0 +1,76 @@
+import asyncio
+
+from app.services import weight_scheduler as weight_scheduler_module
+from app.services.weight_scheduler import PRIORITY_CRITICAL, PRIORITY_MARKET, WeightScheduler
+
+HEADER = "x-mbx-used-weight-1m"
+
+def scheduler(limit=60_000):
+    # 1000 weight/s refill keeps the queued cases in the tens of milliseconds
+    return WeightScheduler("test", limit, HEADER, reserve_fraction=0.2)
+
+def test_acquire_spends_immediately_when_weight_is_available():
+    bucket = scheduler()
+    asyncio.run(bucket.acquire(100, PRIORITY_MARKET))
+    assert bucket.stats()["granted"]["market"] == 1
+    assert bucket.queued == 0
+
+def test_critical_waiter_is_released_before_earlier_market_waiter():
+    bucket = scheduler()
+    order = []
+
+    async def call(name, priority):
+        await bucket.acquire(10, priority)
+        order.append(name)
+
+    async def scenario():
+        bucket.tokens = 0.0
+        market = asyncio.create_task(call("market", PRIORITY_MARKET))
+        await asyncio.sleep(0)
+        critical = asyncio.create_task(call("critical", PRIORITY_CRITICAL))
+        await asyncio.wait_for(critical, timeout=2)
+        # Market work also has to leave the 12000-weight reserve, so it is still queued
+        assert not market.done()
+        market.cancel()
+
+    asyncio.run(scenario())
+    assert order == ["critical"]
+    assert bucket.queued == 2
+
+def test_reserve_is_only_spendable_by_critical_work():
+    # 10 weight/s, so the 50ms wait below refills well under the 10 weight asked for
+    bucket = scheduler(limit=600)
+    bucket.tokens = bucket.reserve
+
+    async def scenario():
+        await asyncio.wait_for(bucket.acquire(bucket.reserve, PRIORITY_CRITICAL), timeout=1)
+        bucket.tokens = bucket.reserve
+        try:
+            await asyncio.wait_for(bucket.acquire(10, PRIORITY_MARKET), timeout=0.05)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    assert asyncio.run(scenario()) is False
+    assert bucket.granted["critical"] == 1
+    assert bucket.granted["market"] == 0
+
+def test_used_weight_header_pulls_the_bucket_down():
+    bucket = scheduler()
+    bucket.observe(200, {HEADER: "59000"})
+    assert bucket.tokens <= 1_100
+    bucket.observe(200, {HEADER: "garbage"})
+    assert bucket.tokens <= 1_100
+
+def test_rate_limit_response_pauses_the_bucket(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(weight_scheduler_module.time, "monotonic", lambda: now[0])
+    bucket = scheduler()
+    bucket.observe(429, {"Retry-After": "30"})
+    stats = bucket.stats()
+    assert stats["rate_limited"] == 1
+    assert stats["paused_seconds"] == 30
+    assert stats["available_weight"] == 0.0
+
+    now[0] += 31
+    assert bucket.stats()["available_weight"] == bucket.capacity
@@ -630,17 +630,8 @@ export default function Dashboard() {
                             <div className="text-white/20 text-xs italic">No info in the cortex.</div>
                         )}
                         {agentStatus.recent_actions.map((act: any) => {
-                            // Extract Strategy/Profit Info if available
-                            let strategyInfo = null;
-                            const steps = act.transcript?.strategy?.feasible_options?.[0]?.steps;
-                            if (steps) {
-                                const spread = steps.find((s: string) => s.includes("Spread:"));
-                                const profit = steps.find((s: string) => s.includes("Profit"));
-                                if (spread || profit) strategyInfo = spread || profit;
-                            }
-                            if (!strategyInfo && act.transcript?.execution?.tx_hash?.includes("Arb Profit")) {
-                                strategyInfo = act.transcript.execution.tx_hash;
-                            }
+                            // Strategy/Profit line, extracted server-side when the hearing was recorded
+                            const strategyInfo = act.highlight;
 
                             return (
                                 <div key={act.id} className="flex flex-col gap-1 text-sm group cursor-pointer p-2 rounded hover:bg-white/5 transition-colors" onClick={() => router.push(`/hearing?id=${act.id}`)}>
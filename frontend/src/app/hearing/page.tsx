@@ -3,7 +3,7 @@
 import { useState, Suspense } from "react";
 import axios from "axios";
 import { ArrowRight, ShieldAlert, CheckCircle, XCircle, BrainCircuit, Activity, Eye, Zap } from "lucide-react";
-import { HearingRecord } from "@/lib/hearing";
+import { HearingRecord, HearingSummary } from "@/lib/hearing";
 import { useSearchParams } from "next/navigation";
 import { useEffect } from "react";
 
@@ -14,11 +14,11 @@ function HearingContent() {
   const [intent, setIntent] = useState("");
   const [loading, setLoading] = useState(false);
   const [record, setRecord] = useState<HearingRecord | null>(null);
-  const [history, setHistory] = useState<HearingRecord[]>([]);
+  const [history, setHistory] = useState<HearingSummary[]>([]);
 
   const fetchHistory = async () => {
     try {
-      const res = await axios.get<HearingRecord[]>(`${API_URL}/hearing/`);
+      const res = await axios.get<HearingSummary[]>(`${API_URL}/hearing/`);
       setHistory(res.data);
     } catch (err) {
       console.error("Failed to fetch history", err);
@@ -32,6 +32,16 @@ function HearingContent() {
     return () => clearInterval(interval);
   }, []);
 
+  // The list only carries summaries; load the full transcript on demand
+  const openHearing = async (id: string) => {
+    try {
+      const res = await axios.get<HearingRecord>(`${API_URL}/hearing/${id}`);
+      setRecord(res.data);
+    } catch (err) {
+      console.error("Failed to load hearing", err);
+    }
+  };
+
   useEffect(() => {
     const presetIntent = searchParams.get('intent');
     const presetId = searchParams.get('id');
@@ -40,13 +50,20 @@ function HearingContent() {
         setIntent(presetIntent);
     }
     
-    if (presetId && history.length > 0) {
-        const target = history.find(h => h.id === presetId);
-        if (target) setRecord(target);
+    if (presetId) {
+        openHearing(presetId);
     }
-    
-    fetchHistory();
-  }, [searchParams, history.length]); // Re-run when history loads to find the ID
+  }, [searchParams]);
+
+  const waitForJob = async (jobId: string): Promise<HearingRecord | null> => {
+    while (true) {
+      await new Promise(resolve => setTimeout(resolve, 1000));
+      const res = await axios.get(`${API_URL}/hearing/jobs/${jobId}`);
+      if (res.data.status === "DONE" || res.data.status === "FAILED") {
+        return res.data.hearing;
+      }
+    }
+  };
 
   const runHearing = async (execute: boolean) => {
     if (!intent) return;
@@ -60,12 +77,13 @@ function HearingContent() {
     setRecord(null);
 
     try {
-      const res = await axios.post<HearingRecord>(`${API_URL}/hearing/gate`, {
+      const res = await axios.post(`${API_URL}/hearing/gate`, {
         user_id: userId,
         intent: intent,
         execute: execute
       });
-      setRecord(res.data);
+      // execute=true is queued (202 + job); poll until the worker finishes it
+      setRecord(res.status === 202 ? await waitForJob(res.data.id) : res.data);
       fetchHistory(); // Refresh sidebar
     } catch (err) {
       console.error(err);
@@ -96,7 +114,7 @@ function HearingContent() {
                 {history.map((h) => (
                     <div 
                         key={h.id}
-                        onClick={() => setRecord(h)}
+                        onClick={() => openHearing(h.id)}
                         className={`p-3 rounded-lg border cursor-pointer hover:bg-white/5 transition-all group ${record?.id === h.id ? 'bg-white/5 border-indigo-500/50' : 'border-white/5 bg-[#151923]'}`}
                     >
                         <div className="flex items-center justify-between mb-1">
@@ -62,3 +62,16 @@ export interface HearingRecord {
   final_verdict: "ALLOWED" | "BLOCKED" | "ERROR";
   final_reason: string;
 }
+
+// List row from GET /hearing/ (full record: GET /hearing/{id})
+export interface HearingSummary {
+  id: string;
+  user_id: string;
+  intent: string;
+  started_at: string;
+  final_verdict: string;
+  final_reason?: string;
+  action_type?: string;
+  tx_hash?: string;
+  highlight?: string;
+}